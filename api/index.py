@@ -9,16 +9,22 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, Any
 import os
-from datetime import datetime
+import uuid
+import asyncio
+from datetime import datetime, date
 import logging
 
-# Import our workflows
-from src.workflows.video_generator import video_generator
+# The video workflow (Anthropic, Google, ElevenLabs SDKs...) is imported
+# lazily by the endpoints that run it, so cold starts for /health stay cheap
+from src.utils.cache import response_cache
+from src.utils.ffmpeg_runner import progress_callback
+from src.config import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,6 +46,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cron runs inline, so keep it under Vercel's 300s maxDuration
+CRON_TIMEOUT_SECONDS = 290
+
+# Jobs are stored in the response cache (Redis when REDIS_URL is set), so a
+# poll that lands on another serverless instance still finds them, and they
+# expire after this long
+JOB_TTL_SECONDS = 24 * 3600
+
+# Jobs running on this instance, keyed by job_id. Live ffmpeg progress is only
+# tracked here; the shared copy is updated when the job changes status
+jobs: Dict[str, Dict[str, Any]] = {}
+
 # Request/Response Models
 class GenerateVideoRequest(BaseModel):
     topic: Optional[str] = None
@@ -53,6 +71,19 @@ class GenerateVideoResponse(BaseModel):
     social_media_urls: Optional[dict] = None
     message: str
 
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    message: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: str
+    finished_at: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[GenerateVideoResponse] = None
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
@@ -69,22 +100,43 @@ async def health_check():
         environment=os.getenv("ENVIRONMENT", "development")
     )
 
-# Generate video endpoint
-@app.post("/generate-video", response_model=GenerateVideoResponse)
-async def generate_video(request: GenerateVideoRequest):
+def _job_key(job_id: str) -> str:
+    """Cache key of a generation job."""
+    return response_cache.make_key("job", job_id)
+
+async def _save_job(job_id: str, job: Dict[str, Any]) -> None:
+    """Store a job's current state in the shared cache."""
+    await response_cache.set(_job_key(job_id), job, JOB_TTL_SECONDS)
+
+def _workflow_cache_key(request: GenerateVideoRequest) -> str:
+    """Cache key for a generation request, bucketed by day."""
+    return response_cache.make_key(
+        "workflow",
+        request.topic,
+        request.category,
+        str(request.publish_immediately),
+        date.today().isoformat()
+    )
+
+async def _run_generation_job(job_id: str, request: GenerateVideoRequest):
     """
-    Generate a viral video using AI.
+    Run the video workflow for a queued job and record its outcome.
 
-    This endpoint:
-    1. Researches trending topics (if no topic provided)
-    2. Generates cinematic video prompts using Claude AI
-    3. Creates 3 video clips using Google Veo 3
-    4. Generates title card using Google Imagen 4
-    5. Composes final video
-    6. Uploads to social media platforms (YouTube, Instagram, TikTok, X)
+    Args:
+        job_id: Key of the job in the local registry
+        request: Original generation request
     """
+    from src.workflows.video_generator import video_generator
+
+    job = jobs[job_id]
+    job["status"] = "running"
+    await _save_job(job_id, job)
+
+    # Report the current ffmpeg stage's progress on the job
+    progress_callback.set(lambda progress: job.__setitem__("progress", progress))
+
     try:
-        logger.info(f"Starting video generation - Topic: {request.topic}, Category: {request.category}")
+        logger.info(f"[{job_id}] Starting video generation - Topic: {request.topic}, Category: {request.category}")
 
         # Run the complete workflow
         result = await video_generator.generate_and_publish(
@@ -94,31 +146,116 @@ async def generate_video(request: GenerateVideoRequest):
         )
 
         if result["success"]:
-            return GenerateVideoResponse(
+            job["result"] = GenerateVideoResponse(
                 success=True,
                 topic=result.get("topic"),
                 final_video_path=result.get("final_video_path"),
                 social_media_urls=result.get("social_media_urls"),
                 message=f"Video generated successfully! Uploaded to {len(result.get('social_media_urls', {}))} platforms"
+            ).model_dump()
+            job["status"] = "completed"
+            await response_cache.set(
+                _workflow_cache_key(request),
+                job["result"],
+                settings.workflow_cache_ttl
             )
         else:
-            return GenerateVideoResponse(
+            job["result"] = GenerateVideoResponse(
                 success=False,
                 message=f"Video generation failed: {', '.join(result.get('errors', ['Unknown error']))}"
-            )
+            ).model_dump()
+            job["status"] = "failed"
 
     except Exception as e:
-        logger.error(f"Error in generate_video endpoint: {e}", exc_info=True)
-        return GenerateVideoResponse(
+        logger.error(f"[{job_id}] Error in video generation job: {e}", exc_info=True)
+        job["result"] = GenerateVideoResponse(
             success=False,
             message=f"Error: {str(e)}"
+        ).model_dump()
+        job["status"] = "failed"
+
+    finally:
+        job["finished_at"] = datetime.utcnow().isoformat()
+        job["progress"] = None
+        await _save_job(job_id, job)
+        # Finished jobs are served from the shared cache (and expire there)
+        jobs.pop(job_id, None)
+
+# Generate video endpoint
+@app.post("/generate-video", response_model=JobResponse, status_code=202)
+async def generate_video(request: GenerateVideoRequest, background_tasks: BackgroundTasks, response: Response):
+    """
+    Queue generation of a viral video using AI.
+
+    Returns immediately with a job_id; poll GET /jobs/{job_id} for the result.
+    Identical requests made the same day reuse the cached result
+    (reported via the X-Cache header).
+
+    The background job:
+    1. Researches trending topics (if no topic provided)
+    2. Generates cinematic video prompts using Claude AI
+    3. Creates 3 video clips using Google Veo 3
+    4. Renders the title card (locally, or with Google Imagen 4 if enabled)
+    5. Composes final video
+    6. Uploads to social media platforms (YouTube, Instagram, TikTok, X)
+    """
+    job_id = uuid.uuid4().hex
+    now = datetime.utcnow().isoformat()
+
+    cached_result = await response_cache.get(_workflow_cache_key(request))
+    if cached_result is not None:
+        response.headers["X-Cache"] = "HIT"
+        await _save_job(job_id, {
+            "status": "completed",
+            "created_at": now,
+            "finished_at": now,
+            "progress": None,
+            "result": cached_result
+        })
+        logger.info(f"Served video generation job {job_id} from cache")
+        return JobResponse(
+            job_id=job_id,
+            status="completed",
+            message=f"Video already generated today. Fetch /jobs/{job_id} for the result."
         )
 
+    response.headers["X-Cache"] = "MISS"
+    jobs[job_id] = {
+        "status": "pending",
+        "created_at": now,
+        "finished_at": None,
+        "progress": None,
+        "result": None
+    }
+    await _save_job(job_id, jobs[job_id])
+    background_tasks.add_task(_run_generation_job, job_id, request)
+
+    logger.info(f"Queued video generation job {job_id}")
+    return JobResponse(
+        job_id=job_id,
+        status="pending",
+        message=f"Video generation started. Poll /jobs/{job_id} for status."
+    )
+
 # Manual trigger endpoint (same as generate-video but with simpler name)
-@app.post("/generate-now")
-async def generate_now(request: GenerateVideoRequest):
+@app.post("/generate-now", response_model=JobResponse, status_code=202)
+async def generate_now(request: GenerateVideoRequest, background_tasks: BackgroundTasks, response: Response):
     """Manually trigger video generation."""
-    return await generate_video(request)
+    return await generate_video(request, background_tasks, response)
+
+# Job status endpoint
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """Get the status and, once finished, the result of a generation job."""
+    # A job running on this instance has live progress; otherwise use the shared copy
+    job = jobs.get(job_id) or await response_cache.get(_job_key(job_id))
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Not Found", "message": f"Job {job_id} not found (or expired)"}
+        )
+
+    return JobStatusResponse(job_id=job_id, **job)
 
 # Cron endpoint - Daily video generation
 @app.get("/cron/daily-video")
@@ -128,16 +265,21 @@ async def daily_video_cron():
     Daily video cron job.
     Researches trending topics and generates a viral video for social media.
     """
+    from src.workflows.video_generator import video_generator
+
     try:
         logger.info("=" * 80)
         logger.info("DAILY VIDEO CRON JOB TRIGGERED")
         logger.info("=" * 80)
 
         # Generate and publish video
-        result = await video_generator.generate_and_publish(
-            topic=None,  # Will research trending topics
-            category=None,  # Will use all categories
-            publish_immediately=True
+        result = await asyncio.wait_for(
+            video_generator.generate_and_publish(
+                topic=None,  # Will research trending topics
+                category=None,  # Will use all categories
+                publish_immediately=True
+            ),
+            timeout=CRON_TIMEOUT_SECONDS
         )
 
         logger.info("=" * 80)
@@ -155,6 +297,14 @@ async def daily_video_cron():
             "timestamp": result.get("timestamp")
         }
 
+    except asyncio.TimeoutError:
+        logger.error(f"Daily video cron job timed out after {CRON_TIMEOUT_SECONDS}s")
+        return {
+            "success": False,
+            "error": f"Timed out after {CRON_TIMEOUT_SECONDS} seconds",
+            "message": "Failed to generate daily video"
+        }
+
     except Exception as e:
         logger.error(f"Error in daily video cron job: {str(e)}", exc_info=True)
         return {
@@ -166,14 +316,20 @@ async def daily_video_cron():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return {
-        "error": "Not Found",
-        "message": "The requested endpoint does not exist"
-    }
+    return JSONResponse(
+        status_code=404,
+        content={
+            "error": "Not Found",
+            "message": "The requested endpoint does not exist"
+        }
+    )
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return {
-        "error": "Internal Server Error",
-        "message": "An unexpected error occurred"
-    }
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal Server Error",
+            "message": "An unexpected error occurred"
+        }
+    )
@@ -0,0 +1,38 @@
+"""
+Assemble a finished video from one of the preset specs.
+
+Usage:
+    python assemble.py portrait
+    python assemble.py demo
+    python assemble.py modern
+    python assemble.py modern --software   # force libx264
+    python assemble.py demo --verify --preview
+"""
+import argparse
+import asyncio
+import importlib
+from src.utils.assembler import assemble, open_preview, print_specs
+
+PRESETS = {
+    "portrait": "assemble_complete_portrait_video",
+    "demo": "assemble_demo_complete",
+    "modern": "assemble_with_modern_cards",
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assemble a video in a single ffmpeg pass")
+    parser.add_argument("preset", choices=sorted(PRESETS), help="Which assembly spec to render")
+    parser.add_argument("--software", action="store_true", help="Encode with libx264 even if a hardware encoder is available")
+    parser.add_argument("--verify", action="store_true", help="Print the rendered video's specs with ffprobe")
+    parser.add_argument("--preview", action="store_true", help="Open the rendered video (macOS)")
+    args = parser.parse_args()
+
+    spec = importlib.import_module(PRESETS[args.preset]).build_spec()
+    spec.hw_encode = not args.software
+    final_output = asyncio.run(assemble(spec))
+    print(f"📁 Final video: {final_output}")
+
+    if args.verify:
+        print_specs(final_output)
+    if args.preview:
+        open_preview(final_output)
@@ -2,10 +2,11 @@
 Complete video generation using the 2 existing clips.
 """
 
+import os
+import argparse
 import asyncio
 import logging
 from datetime import datetime
-from pathlib import Path
 
 # Set up detailed logging
 logging.basicConfig(
@@ -14,13 +15,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def complete_video_with_2clips():
-    """Complete the video workflow using 2 existing clips."""
+# System prompts are module constants (byte-identical on every run, with the
+# topic only in the user message) so Anthropic's prompt cache can match them
+SCRIPT_SYSTEM_PROMPT = "You are a professional voiceover scriptwriter specializing in compelling promotional video scripts."
+
+CAPTION_SYSTEM_PROMPT = """You are a social media expert specializing in viral content optimization.
+Create platform-specific captions that maximize engagement for a short (20 second),
+professional, cinematic video about Hawaii business.
+
+Every caption must:
+- Hook viewers immediately
+- Include relevant hashtags
+- Have a clear CTA to the company website
+- Mention the company by name"""
+
+# Per-platform guidance lives in the tool schema, so it is part of the static
+# (cacheable) prefix rather than repeated in every user prompt
+CAPTION_PLATFORMS = {
+    "youtube": "YouTube: detailed description with timestamps, keywords, CTAs",
+    "instagram": "Instagram: engaging hook, hashtags, emoji-rich",
+    "tiktok": "TikTok: trendy, short, hashtag-heavy",
+    "linkedin": "LinkedIn: professional, business-focused, thought leadership",
+    "twitter": "Twitter/X: concise, engaging, hashtags",
+}
+
+CAPTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        platform: {"type": "string", "description": guidance}
+        for platform, guidance in CAPTION_PLATFORMS.items()
+    },
+    "required": list(CAPTION_PLATFORMS)
+}
+
+# Section headings of the Drive description, in order
+DESCRIPTION_HEADINGS = {
+    "youtube": "YOUTUBE",
+    "instagram": "INSTAGRAM",
+    "tiktok": "TIKTOK",
+    "linkedin": "LINKEDIN",
+    "twitter": "TWITTER/X",
+}
+RULE = "=" * 80
+
+async def complete_video_with_2clips(upload: bool = True):
+    """
+    Complete the video workflow using 2 existing clips.
+
+    Args:
+        upload: Copy the finished video to Google Drive
+    """
     from src.services.claude_client import claude_service
-    from src.services.google_image_client import google_image_service
     from src.services.elevenlabs_client import elevenlabs_service
     from src.utils.video_composer import video_composer
-    from src.services.google_drive_uploader import google_drive_uploader
+    from src.utils.title_card import render_title_card
+    from src.utils.ffmpeg_runner import probe_duration
     from src.config import settings
 
     print("\n" + "="*80)
@@ -33,17 +82,27 @@ async def complete_video_with_2clips():
     # Use existing clips
     clip_paths = ["/tmp/clip_1.mp4", "/tmp/clip_2.mp4"]
 
+    # File sizes and durations are read in worker threads, all at once, so
+    # the filesystem and ffprobe never block the event loop
+    sizes, durations = await asyncio.gather(
+        asyncio.gather(*(asyncio.to_thread(os.path.getsize, clip) for clip in clip_paths)),
+        asyncio.gather(*(asyncio.to_thread(probe_duration, clip) for clip in clip_paths))
+    )
+
     print(f"Using existing clips:")
-    for i, clip in enumerate(clip_paths, 1):
-        size = Path(clip).stat().st_size / 1024 / 1024
-        print(f"  Clip {i}: {clip} ({size:.2f} MB)")
+    for i, (clip, size) in enumerate(zip(clip_paths, sizes), 1):
+        print(f"  Clip {i}: {clip} ({size / 1024 / 1024:.2f} MB)")
+
+    title_card_duration = 3.0
+    video_duration = title_card_duration + sum(duration or 8.0 for duration in durations)
 
     output_dir = "/tmp"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     try:
-        # Step 1: Generate title card
-        print("\n1. Generating title card with Imagen 4...")
+        # Steps 1, 2 and 4a don't depend on each other, so the title card,
+        # voiceover script and music prompt are requested concurrently
+        print("\n1. Generating title card, voiceover script and music prompt in parallel...")
         title_card_path = f"{output_dir}/title_card_{timestamp}.png"
 
         title_card_prompt = f"""Create a professional, modern title card image for a business video about {topic}.
@@ -55,21 +114,17 @@ Text placement: Leave space for text overlay
 Aspect ratio: 9:16 (vertical/portrait for social media)
 Mood: Professional, inspiring, tropical-tech fusion"""
 
-        title_card_result = await google_image_service.generate_image(
-            prompt=title_card_prompt,
-            output_path=title_card_path
-        )
-
-        if title_card_result.get("success"):
-            print(f"  ✅ Title card saved: {title_card_path}")
-        else:
-            print(f"  ⚠️  Title card failed: {title_card_result.get('error')}")
-            title_card_path = None
-
-        # Step 2: Generate voiceover script
-        print("\n2. Generating voiceover script...")
-
-        system_prompt = "You are a professional voiceover scriptwriter specializing in compelling promotional video scripts."
+        async def make_title_card():
+            # Imagen only when a photographic background is wanted; the local
+            # FFmpeg render is near-instant and costs no API credits
+            if settings.use_generative_title_card:
+                from src.services.google_image_client import google_image_service
+                return await google_image_service.generate_image(
+                    prompt=title_card_prompt,
+                    output_path=title_card_path
+                )
+            await asyncio.to_thread(render_title_card, topic, service_focus, title_card_path)
+            return {"success": True, "output_path": title_card_path}
 
         user_prompt = f"""Write a compelling 20-second voiceover script for a promotional video about: {topic}
 
@@ -88,183 +143,199 @@ Script requirements:
 
 Return ONLY the script text, no formatting or labels."""
 
-        script = await claude_service.generate_content(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt
-        )
-
-        print(f"  ✅ Script generated ({len(script)} chars)")
-        print(f"\n  Script preview: {script[:100]}...")
-
-        # Step 3: Generate voiceover audio
-        print("\n3. Generating voiceover with ElevenLabs...")
-        voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
-
-        voiceover_result = await elevenlabs_service.generate_voiceover(
-            script=script,
-            output_path=voiceover_path
+        title_card_result, script, music_prompt_text = await asyncio.gather(
+            make_title_card(),
+            claude_service.generate_content(
+                system_prompt=SCRIPT_SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                cache_system=True
+            ),
+            elevenlabs_service.generate_music_prompt(
+                topic=topic,
+                mood="uplifting",
+                style="corporate tech with Hawaiian elements"
+            ),
+            return_exceptions=True
         )
 
-        if voiceover_result.get("success"):
-            size = Path(voiceover_path).stat().st_size / 1024
-            print(f"  ✅ Voiceover generated: {voiceover_path} ({size:.0f} KB)")
+        # Step 1: Title card (optional - composition works without it)
+        if isinstance(title_card_result, Exception):
+            title_card_result = {"success": False, "error": str(title_card_result)}
+        if title_card_result.get("success"):
+            print(f"  ✅ Title card saved: {title_card_path}")
         else:
-            print(f"  ⚠️  Voiceover failed: {voiceover_result.get('error')}")
-            voiceover_path = None
-
-        # Step 4: Generate background music
-        print("\n4. Generating background music...")
-        music_path = f"{output_dir}/music_{timestamp}.mp3"
+            print(f"  ⚠️  Title card failed: {title_card_result.get('error')}")
+            title_card_path = None
 
-        music_prompt_text = await elevenlabs_service.generate_music_prompt(
-            topic=topic,
-            mood="uplifting",
-            style="corporate tech with Hawaiian elements"
-        )
+        # Step 2: Voiceover script (required)
+        if isinstance(script, Exception):
+            raise script
+        print(f"  ✅ Script generated ({len(script)} chars)")
+        print(f"\n  Script preview: {script[:100]}...")
 
-        music_result = await elevenlabs_service.generate_background_music(
-            prompt=music_prompt_text,
-            duration=20,  # 20 seconds for 2 clips
-            output_path=music_path
+        # Step 4a: Music prompt (required for music)
+        if isinstance(music_prompt_text, Exception):
+            print(f"  ⚠️  Music prompt failed: {music_prompt_text}")
+            music_prompt_text = None
+
+        # Steps 3 and 4b: voiceover audio and background music, also concurrently.
+        # They run as a task (alongside the captions request) that the composer
+        # awaits before rendering video and audio in one ffmpeg pass
+        print("\n2. Generating voiceover and music...")
+
+        async def generate_audio():
+            voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
+            music_path = f"{output_dir}/music_{timestamp}.mp3"
+
+            async def no_music():
+                return {"success": False, "error": "No music prompt"}
+
+            # Music covers whichever is longer, the video or the voiceover
+            # (estimated from the script, so both requests still run at once)
+            music_duration = max(video_duration, len(script) * 0.05)
+
+            voiceover_result, music_result = await asyncio.gather(
+                elevenlabs_service.generate_voiceover(
+                    script=script,
+                    output_path=voiceover_path
+                ),
+                elevenlabs_service.generate_background_music(
+                    prompt=music_prompt_text,
+                    duration=music_duration,
+                    output_path=music_path
+                ) if music_prompt_text else no_music(),
+                return_exceptions=True
+            )
+
+            if isinstance(voiceover_result, Exception):
+                voiceover_result = {"success": False, "error": str(voiceover_result)}
+            if voiceover_result.get("success"):
+                size = await asyncio.to_thread(os.path.getsize, voiceover_path) / 1024
+                print(f"  ✅ Voiceover generated: {voiceover_path} ({size:.0f} KB)")
+            else:
+                print(f"  ⚠️  Voiceover failed: {voiceover_result.get('error')}")
+                voiceover_path = None
+
+            if isinstance(music_result, Exception):
+                music_result = {"success": False, "error": str(music_result)}
+            if music_result.get("success"):
+                size = await asyncio.to_thread(os.path.getsize, music_path) / 1024
+                print(f"  ✅ Music generated: {music_path} ({size:.0f} KB)")
+            else:
+                print(f"  ⚠️  Music failed: {music_result.get('error')}")
+                music_path = None
+
+            return voiceover_path, music_path
+
+        audio_task = asyncio.create_task(generate_audio())
+
+        # Step 6 only needs the topic, so the captions request is in flight
+        # while FFmpeg composes and its latency hides behind the encode
+        caption_user_prompt = (
+            f"Topic: {topic}\n"
+            f"Service focus: {service_focus}\n"
+            f"Website: {settings.company_website}\n"
+            f"Company: {settings.company_name}"
         )
 
-        if music_result.get("success"):
-            size = Path(music_path).stat().st_size / 1024
-            print(f"  ✅ Music generated: {music_path} ({size:.0f} KB)")
-        else:
-            print(f"  ⚠️  Music failed: {music_result.get('error')}")
-            music_path = None
+        # Forced tool use returns the captions as parsed JSON - no extraction/repair step
+        captions_task = asyncio.create_task(claude_service.generate_structured(
+            system_prompt=CAPTION_SYSTEM_PROMPT,
+            user_prompt=caption_user_prompt,
+            tool_name="emit_captions",
+            input_schema=CAPTIONS_SCHEMA,
+            cache_system=True
+        ))
 
         # Step 5: Compose final video
-        print("\n5. Composing final video...")
         final_video_path = f"{output_dir}/final_video_{timestamp}.mp4"
 
-        composition_result = await video_composer.compose_final_video(
-            clip_paths=clip_paths,
-            title_card_image_path=title_card_path,
-            output_path=final_video_path,
-            title_card_duration=3.0,
-            voiceover_audio_path=voiceover_path,
-            music_audio_path=music_path
-        )
-
-        if composition_result.get("success"):
-            size = Path(final_video_path).stat().st_size / 1024 / 1024
-            print(f"  ✅ Final video composed: {final_video_path} ({size:.2f} MB)")
-        else:
-            print(f"  ❌ Composition failed: {composition_result.get('error')}")
-            return {"success": False, "error": "Video composition failed"}
-
-        # Step 6: Generate social media captions
-        print("\n6. Generating social media captions...")
-
-        caption_system_prompt = """You are a social media expert specializing in viral content optimization.
-Create platform-specific captions that maximize engagement."""
-
-        caption_user_prompt = f"""Create engaging social media captions for a video about: {topic}
-
-Video details:
-- Focus: {service_focus}
-- Duration: 20 seconds
-- Style: Professional, cinematic, Hawaii business
-
-Generate captions for:
-1. YouTube (detailed description with timestamps, keywords, CTAs)
-2. Instagram (engaging hook, hashtags, emoji-rich)
-3. TikTok (trendy, short, hashtag-heavy)
-4. LinkedIn (professional, business-focused, thought leadership)
-5. Twitter/X (concise, engaging, hashtags)
-
-Each caption should:
-- Hook viewers immediately
-- Include relevant hashtags
-- Have clear CTA to {settings.company_website}
-- Mention {settings.company_name}
-
-Return as JSON with keys: youtube, instagram, tiktok, linkedin, twitter"""
-
-        captions_response = await claude_service.generate_content(
-            system_prompt=caption_system_prompt,
-            user_prompt=caption_user_prompt
-        )
-
-        # Parse captions from response using the proper extraction function
-        from src.services.claude_client import extract_json_from_response
         try:
-            captions = extract_json_from_response(captions_response)
-        except Exception as e:
-            logger.error(f"Failed to parse captions JSON: {e}")
-            # If JSON parsing fails, create a basic caption
-            captions = {
-                "youtube": f"{topic}\n\nVisit: {settings.company_website}",
-                "instagram": f"{topic}\n\n{settings.company_website}",
-                "tiktok": f"{topic} #{settings.company_name.replace(' ', '')}",
-                "linkedin": f"{topic}\n\n{settings.company_website}",
-                "twitter": f"{topic}\n\n{settings.company_website}"
-            }
+            composition_result = await video_composer.compose_final_video(
+                clip_paths=clip_paths,
+                title_card_image_path=title_card_path,
+                output_path=final_video_path,
+                title_card_duration=title_card_duration,
+                pending_audio=audio_task
+            )
+            voiceover_path, music_path = await audio_task
+
+            if composition_result.get("success"):
+                size = await asyncio.to_thread(os.path.getsize, final_video_path) / 1024 / 1024
+                print(f"  ✅ Final video composed: {final_video_path} ({size:.2f} MB)")
+            else:
+                print(f"  ❌ Composition failed: {composition_result.get('error')}")
+                return {"success": False, "error": "Video composition failed"}
+
+            # Step 6: Social media captions (requested before composing)
+            print("\n3. Collecting social media captions...")
+            try:
+                captions = await captions_task
+            except Exception as e:
+                logger.error(f"Failed to generate captions: {e}")
+                # The video is already composed: fall back to basic captions
+                captions = {
+                    "youtube": f"{topic}\n\nVisit: {settings.company_website}",
+                    "instagram": f"{topic}\n\n{settings.company_website}",
+                    "tiktok": f"{topic} #{settings.company_name.replace(' ', '')}",
+                    "linkedin": f"{topic}\n\n{settings.company_website}",
+                    "twitter": f"{topic}\n\n{settings.company_website}"
+                }
+        finally:
+            # Don't leave the background requests running (or their errors
+            # unretrieved) when composition fails or raises
+            for task in (audio_task, captions_task):
+                task.cancel()
+            await asyncio.gather(audio_task, captions_task, return_exceptions=True)
 
         print(f"  ✅ Social media captions generated for 5 platforms")
 
-        # Step 7: Upload to Google Drive
-        print("\n7. Uploading to Google Drive...")
-
-        video_title = f"AI_Customer_Service_Hawaii_{timestamp}"
-
-        # Create comprehensive description with all captions
-        description = f"""TOPIC: {topic}
-SERVICE FOCUS: {service_focus}
-COMPANY: {settings.company_name}
-WEBSITE: {settings.company_website}
-
-================================================================================
-YOUTUBE
-================================================================================
-{captions.get('youtube', '')}
-
-================================================================================
-INSTAGRAM
-================================================================================
-{captions.get('instagram', '')}
-
-================================================================================
-TIKTOK
-================================================================================
-{captions.get('tiktok', '')}
-
-================================================================================
-LINKEDIN
-================================================================================
-{captions.get('linkedin', '')}
-
-================================================================================
-TWITTER/X
-================================================================================
-{captions.get('twitter', '')}
-
-================================================================================
-VIDEO SPECS
-================================================================================
-Duration: ~20 seconds
-Format: 9:16 vertical (1080x1920)
-Generated: {timestamp}
-Title Card: Yes
-Voiceover: Yes
-Background Music: Yes
-"""
-
-        upload_result = await google_drive_uploader.upload_video(
-            video_path=final_video_path,
-            title=video_title,
-            description=description
-        )
-
-        if upload_result.get("success"):
-            drive_url = upload_result.get("url", "")
-            print(f"  ✅ Uploaded to Google Drive!")
-            print(f"  🔗 URL: {drive_url}")
+        # Step 7: Upload to Google Drive (skipped with --no-upload)
+        drive_url = None
+        if upload:
+            # Imported here so --no-upload runs never load the uploader
+            from src.services.google_drive_uploader import google_drive_uploader
+
+            print("\n4. Uploading to Google Drive...")
+
+            video_title = f"AI_Customer_Service_Hawaii_{timestamp}"
+
+            # Create comprehensive description with all captions
+            parts = [
+                f"TOPIC: {topic}",
+                f"SERVICE FOCUS: {service_focus}",
+                f"COMPANY: {settings.company_name}",
+                f"WEBSITE: {settings.company_website}",
+                "",
+            ]
+            for platform, heading in DESCRIPTION_HEADINGS.items():
+                parts += [RULE, heading, RULE, captions.get(platform, ""), ""]
+            parts += [
+                RULE, "VIDEO SPECS", RULE,
+                "Duration: ~20 seconds",
+                "Format: 9:16 vertical (1080x1920)",
+                f"Generated: {timestamp}",
+                "Title Card: Yes",
+                "Voiceover: Yes",
+                "Background Music: Yes",
+                "",
+            ]
+            description = "\n".join(parts)
+
+            upload_result = await google_drive_uploader.upload_video(
+                video_path=final_video_path,
+                title=video_title,
+                description=description
+            )
+
+            if upload_result.get("success"):
+                drive_url = upload_result.get("url", "")
+                print(f"  ✅ Uploaded to Google Drive!")
+                print(f"  🔗 URL: {drive_url}")
+            else:
+                print(f"  ⚠️  Upload failed: {upload_result.get('error')}")
         else:
-            print(f"  ⚠️  Upload failed: {upload_result.get('error')}")
-            drive_url = None
+            print("\n4. Skipping Google Drive upload (--no-upload)")
 
         print("\n" + "="*80)
         print("✅ VIDEO GENERATION COMPLETE!")
@@ -299,7 +370,12 @@ Background Music: Yes
         return {"success": False, "error": str(e)}
 
 if __name__ == "__main__":
-    result = asyncio.run(complete_video_with_2clips())
+    parser = argparse.ArgumentParser(description="Complete a video from the 2 existing clips")
+    parser.add_argument("--no-upload", action="store_true", help="Skip the Google Drive upload")
+    args = parser.parse_args()
+
+    from src.utils import event_loop
+    result = event_loop.run(complete_video_with_2clips(upload=not args.no_upload))
 
     if result.get("success"):
         print("🎬 Your broadcast-quality video is ready!")
@@ -1,13 +1,17 @@
 """
-Persistent video generation with automatic hourly retry.
+Persistent video generation with automatic, rate-limit-aware retry.
 Keeps trying until successful, then notifies when ready.
 """
 
-import asyncio
+import sys
 import logging
-import time
-from datetime import datetime
-from pathlib import Path
+
+from src.utils import event_loop
+from src.utils.console import BAR, FEATURES_BANNER
+
+# Imported once at startup: the service clients (and their HTTP connection
+# pools) are created before the first attempt and reused by every retry
+from src.workflows.retry import DEADLINE_SECONDS, MAX_ATTEMPTS, retry_until_success
 
 # Set up detailed logging
 logging.basicConfig(
@@ -18,151 +22,77 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
-logger = logging.getLogger(__name__)
-
-async def attempt_video_generation():
-    """Attempt to generate video. Returns (success, result)."""
-    from src.workflows.video_generator import video_generator
-
-    topic = "AI-Powered Customer Service Transforms Hawaii Tourism Industry"
-
-    try:
-        logger.info(f"Attempting video generation for topic: {topic}")
-
-        result = await video_generator.generate_and_publish(
-            topic=topic,
-            category="AI",
-            publish_immediately=True
-        )
-
-        return result.get("success", False), result
-
-    except Exception as e:
-        logger.error(f"Video generation attempt failed: {e}", exc_info=True)
-        return False, {"success": False, "error": str(e)}
-
-def is_rate_limit_error(result):
-    """Check if the error is a rate limit that we should retry."""
-    # Convert entire result to string for comprehensive checking
-    result_str = str(result).lower()
-
-    # Check for rate limit indicators
-    rate_limit_keywords = ["429", "resource_exhausted", "quota", "rate limit", "too many requests"]
 
-    for keyword in rate_limit_keywords:
-        if keyword in result_str:
-            return True
+TOPIC = "AI-Powered Customer Service Transforms Hawaii Tourism Industry"
 
-    return False
+# Artifacts from earlier attempts of this run (prompts, clips, title card,
+# voiceover, music) are reused, so a retry only redoes what failed. Each run
+# gets its own directory under this root, removed when the run ends
+ARTIFACT_CACHE_DIR = "/tmp/lenilani_cache"
 
 def print_success_summary(result):
-    """Print a beautiful success message."""
-    print("\n" + "=" * 80)
-    print("🎉 VIDEO GENERATION COMPLETE!")
-    print("=" * 80)
-    print(f"\n✅ Topic: {result.get('topic')}")
-    print(f"✅ Service Focus: {result.get('service_focus')}")
-    print(f"\n📁 Final Video: {result.get('final_video_path')}")
+    """Print a beautiful success message (one write to stdout)."""
+    lines = [
+        "", BAR,
+        "🎉 VIDEO GENERATION COMPLETE!",
+        BAR,
+        f"\n✅ Topic: {result.get('topic')}",
+        f"✅ Service Focus: {result.get('service_focus')}",
+        f"\n📁 Final Video: {result.get('final_video_path')}",
+    ]
 
     if result.get('google_drive_url'):
-        print(f"\n🔗 GOOGLE DRIVE LINK:")
-        print(f"   {result.get('google_drive_url')}")
-        print(f"\n   ⭐ Your video is ready for review!")
-
-    print(f"\n📊 Details:")
-    print(f"   - Clips Generated: {len(result.get('clip_paths', []))}")
-    print(f"   - Title Card: {'✅' if result.get('title_card_path') else '❌'}")
-    print(f"   - Voiceover: {'✅' if result.get('voiceover_path') else '❌'}")
-    print(f"   - Background Music: {'✅' if result.get('music_path') else '❌'}")
-
-    print(f"\n✨ Professional Features Applied:")
-    print(f"   ✅ Cinematic video generation (Veo 3)")
-    print(f"   ✅ AI-generated voiceover (ElevenLabs)")
-    print(f"   ✅ Custom background music (ElevenLabs)")
-    print(f"   ✅ Audio ducking (music lowers during speech)")
-    print(f"   ✅ Loudness normalization (-16 LUFS)")
-    print(f"   ✅ Music fade in/out")
-    print(f"   ✅ Dynamic compression")
-    print(f"   ✅ Peak limiting (broadcast-safe)")
-    print(f"   ✅ 256kbps AAC @ 48kHz")
+        lines += [
+            f"\n🔗 GOOGLE DRIVE LINK:",
+            f"   {result.get('google_drive_url')}",
+            f"\n   ⭐ Your video is ready for review!",
+        ]
+
+    lines += [
+        f"\n📊 Details:",
+        f"   - Clips Generated: {len(result.get('clip_paths', []))}",
+        f"   - Title Card: {'✅' if result.get('title_card_path') else '❌'}",
+        f"   - Voiceover: {'✅' if result.get('voiceover_path') else '❌'}",
+        f"   - Background Music: {'✅' if result.get('music_path') else '❌'}",
+        FEATURES_BANNER,
+    ]
 
     if result.get('errors'):
-        print(f"\n⚠️  Warnings ({len(result['errors'])}):")
-        for error in result['errors']:
-            print(f"   - {error}")
-
-    print("\n" + "=" * 80 + "\n")
+        lines.append(f"\n⚠️  Warnings ({len(result['errors'])}):")
+        lines += [f"   - {error}" for error in result['errors']]
 
-async def retry_until_success():
-    """Keep trying to generate video every hour until successful."""
+    lines += ["", BAR, "", ""]
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
-    retry_count = 0
-    retry_interval = 3600  # 1 hour in seconds
-
-    print("\n" + "=" * 80)
+async def main():
+    """Generate the video, retrying until it succeeds or retries run out."""
+    print("\n" + BAR)
     print("AUTOMATED VIDEO GENERATION WITH PERSISTENT RETRY")
-    print("=" * 80)
-    print(f"\nTopic: AI-Powered Customer Service Transforms Hawaii Tourism Industry")
-    print(f"Retry Interval: Every {retry_interval // 60} minutes")
-    print(f"Strategy: Keep trying until successful")
-    print("\n" + "=" * 80 + "\n")
-
-    while True:
-        retry_count += 1
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        print(f"\n{'=' * 80}")
-        print(f"ATTEMPT #{retry_count} - {timestamp}")
-        print(f"{'=' * 80}\n")
+    print(BAR)
+    print(f"\nTopic: {TOPIC}")
+    print(f"Retry Interval: up to 30s, doubling to 60 minutes (jittered)")
+    print(f"Strategy: Up to {MAX_ATTEMPTS} attempts within {DEADLINE_SECONDS // 3600} hours")
+    print("\n" + BAR + "\n")
 
-        success, result = await attempt_video_generation()
-
-        if success:
-            # SUCCESS! Print summary and exit
-            print_success_summary(result)
-
-            # Log success to file
-            logger.info("=" * 80)
-            logger.info("VIDEO GENERATION SUCCESSFUL!")
-            logger.info(f"Google Drive URL: {result.get('google_drive_url')}")
-            logger.info("=" * 80)
-
-            return result
-
-        else:
-            # Check if it's a rate limit error worth retrying
-            if is_rate_limit_error(result):
-                logger.warning(f"Attempt #{retry_count} failed due to rate limit")
-                print(f"\n⏳ Rate limit encountered. Will retry in {retry_interval // 60} minutes...")
-                print(f"   Next attempt at: {datetime.fromtimestamp(time.time() + retry_interval).strftime('%Y-%m-%d %H:%M:%S')}")
-                print(f"   (Check /tmp/video_generation.log for details)")
-
-                # Wait for retry interval
-                await asyncio.sleep(retry_interval)
-
-            else:
-                # Non-rate-limit error - something else went wrong
-                logger.error(f"Attempt #{retry_count} failed with non-rate-limit error")
-                print(f"\n❌ Unexpected error occurred:")
-                print(f"   Error: {result.get('error', 'Unknown error')}")
-                print(f"   Errors: {result.get('errors', [])}")
-                print(f"\n⏳ Will retry in {retry_interval // 60} minutes anyway...")
-                print(f"   Next attempt at: {datetime.fromtimestamp(time.time() + retry_interval).strftime('%Y-%m-%d %H:%M:%S')}")
-
-                # Wait for retry interval
-                await asyncio.sleep(retry_interval)
+    result = await retry_until_success(TOPIC, "AI", cache_dir=ARTIFACT_CACHE_DIR)
+    if result.get("success"):
+        print_success_summary(result)
+    return result
 
 if __name__ == "__main__":
     print(f"\n🎬 Starting persistent video generation...")
     print(f"📝 Logs: /tmp/video_generation.log")
-    print(f"🔄 Will retry every hour until successful\n")
+    print(f"🔄 Will retry with backoff (up to {MAX_ATTEMPTS} attempts) until successful\n")
 
     try:
-        result = asyncio.run(retry_until_success())
+        result = event_loop.run(main())
 
         if result.get("success"):
             print("\n✅ DONE! Your broadcast-quality video is ready for review in Google Drive!")
             print(f"🔗 {result.get('google_drive_url')}\n")
+        else:
+            print("\n⚠️  Retries exhausted. Run this script again to keep trying.\n")
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Retry loop interrupted by user (Ctrl+C)")
@@ -1,18 +1,27 @@
 """
 Fix existing 16:9 clips and regenerate video with proper 9:16 aspect ratio.
 """
+import shutil
 import asyncio
 from pathlib import Path
 
+def print_progress(progress):
+    """Show ffmpeg's progress on a single console line."""
+    if progress["percent"] is not None:
+        print(f"\r  ⏳ {progress['output']}: {progress['percent']:.0f}%", end="", flush=True)
+    else:
+        print(f"\r  ⏳ {progress['output']}: {progress['out_time_s']:.1f}s", end="", flush=True)
+
 async def main():
     from src.services.claude_client import claude_service
     from src.services.google_image_client import google_image_service
     from src.services.elevenlabs_client import elevenlabs_service
     from src.utils.video_composer import video_composer
     from src.services.google_drive_uploader import google_drive_uploader
+    from src.utils.ffmpeg_runner import progress_callback
+    from src.utils.tempfiles import FilePool
     from src.config import settings
     from datetime import datetime
-    import subprocess
     
     print("\n" + "="*80)
     print("FIXING ASPECT RATIO AND REGENERATING VIDEO")
@@ -21,39 +30,27 @@ async def main():
     topic = "AI-Powered Customer Service Transforms Hawaii Tourism Industry"
     service_focus = "AI Integration & Automation"
     
-    # Convert existing 1280x720 clips to 1080x1920 (crop and scale to fill)
-    print("Converting clips to 9:16 aspect ratio...")
-    
-    for i in [1, 2]:
-        input_clip = f"/tmp/clip_{i}.mp4"
-        output_clip = f"/tmp/clip_{i}_9x16.mp4"
-        
-        # Scale and crop to fill 9:16 - zoom in to avoid letterboxing
-        cmd = [
-            "ffmpeg",
-            "-i", input_clip,
-            "-vf", "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920",
-            "-c:a", "copy",
-            "-y",
-            output_clip
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"  ✅ Converted clip {i} to 9:16")
-        else:
-            print(f"  ❌ Failed to convert clip {i}: {result.stderr}")
-            return
+    # The existing 1280x720 clips are scaled/cropped to 1080x1920 inside the
+    # single-pass composition below - no intermediate 9:16 files
+    clip_paths = ["/tmp/clip_1.mp4", "/tmp/clip_2.mp4"]
     
-    # Use the converted clips
-    clip_paths = ["/tmp/clip_1_9x16.mp4", "/tmp/clip_2_9x16.mp4"]
+    # Fail before paying for any API calls if a source clip is missing
+    clips_exist = await asyncio.gather(*(asyncio.to_thread(Path(path).exists) for path in clip_paths))
+    missing = [path for path, exists in zip(clip_paths, clips_exist) if not exists]
+    if missing:
+        print(f"❌ Missing clips: {', '.join(missing)}")
+        return
     
     output_dir = "/tmp"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Generate title card
-    print("\n1. Generating title card...")
-    title_card_path = f"{output_dir}/title_card_{timestamp}.png"
+    # Working files go to fixed pool slots that the next run overwrites,
+    # instead of a new set of timestamped files in /tmp per run
+    pool = FilePool()
+    title_card_path, voiceover_path, music_path, final_video_path = await asyncio.gather(*(
+        asyncio.to_thread(pool.acquire, name)
+        for name in ("title_card.png", "voiceover.mp3", "music.mp3", "final_video.mp4")
+    ))
     title_card_prompt = f"""Create a professional, modern title card image for a business video about {topic}.
 
 Style: Clean, corporate, Hawaiian-themed
@@ -63,22 +60,10 @@ Text placement: Leave space for text overlay
 Aspect ratio: 9:16 (vertical/portrait for social media)
 Mood: Professional, inspiring, tropical-tech fusion"""
     
-    title_card_result = await google_image_service.generate_image(
-        prompt=title_card_prompt,
-        output_path=title_card_path
-    )
-    
-    if title_card_result.get("success"):
-        print(f"  ✅ Title card saved")
-    else:
-        print(f"  ⚠️  Title card failed")
-        title_card_path = None
-    
-    # Generate voiceover
-    print("\n2. Generating voiceover...")
-    script = await claude_service.generate_content(
-        system_prompt="You are a professional voiceover scriptwriter.",
-        user_prompt=f"""Write a compelling 20-second voiceover script for: {topic}
+    async def generate_voiceover():
+        script = await claude_service.generate_content(
+            system_prompt="You are a professional voiceover scriptwriter.",
+            user_prompt=f"""Write a compelling 20-second voiceover script for: {topic}
         
 The video has 2 clips. Requirements:
 - Hook viewers immediately
@@ -87,56 +72,72 @@ The video has 2 clips. Requirements:
 - Service focus: {service_focus}
 
 Return ONLY the script text."""
+        )
+        print(f"  ✅ Script generated")
+        return await elevenlabs_service.generate_voiceover(
+            script=script,
+            output_path=voiceover_path
+        )
+    
+    async def generate_music():
+        music_prompt_text = await elevenlabs_service.generate_music_prompt(
+            topic=topic,
+            mood="uplifting",
+            style="corporate tech with Hawaiian elements"
+        )
+        return await elevenlabs_service.generate_background_music(
+            prompt=music_prompt_text,
+            duration=20,
+            output_path=music_path
+        )
+    
+    # Title card, voiceover and music don't depend on each other, so all
+    # three chains of API calls run at once
+    print("\n1-3. Generating title card, voiceover and background music in parallel...")
+    title_card_result, voiceover_result, music_result = await asyncio.gather(
+        google_image_service.generate_image(
+            prompt=title_card_prompt,
+            output_path=title_card_path
+        ),
+        generate_voiceover(),
+        generate_music(),
+        return_exceptions=True
     )
     
-    print(f"  ✅ Script generated")
-    
-    voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
-    voiceover_result = await elevenlabs_service.generate_voiceover(
-        script=script,
-        output_path=voiceover_path
-    )
+    # A failed step (error result or exception) just leaves its part out
+    if not isinstance(title_card_result, Exception) and title_card_result.get("success"):
+        print(f"  ✅ Title card saved")
+    else:
+        print(f"  ⚠️  Title card failed")
+        title_card_path = None
     
-    if voiceover_result.get("success"):
+    if not isinstance(voiceover_result, Exception) and voiceover_result.get("success"):
         print(f"  ✅ Voiceover generated")
     else:
         print(f"  ⚠️  Voiceover failed")
         voiceover_path = None
     
-    # Generate music
-    print("\n3. Generating background music...")
-    music_path = f"{output_dir}/music_{timestamp}.mp3"
-    music_prompt_text = await elevenlabs_service.generate_music_prompt(
-        topic=topic,
-        mood="uplifting",
-        style="corporate tech with Hawaiian elements"
-    )
-    
-    music_result = await elevenlabs_service.generate_background_music(
-        prompt=music_prompt_text,
-        duration=20,
-        output_path=music_path
-    )
-    
-    if music_result.get("success"):
+    if not isinstance(music_result, Exception) and music_result.get("success"):
         print(f"  ✅ Music generated")
     else:
         print(f"  ⚠️  Music failed")
         music_path = None
     
-    # Compose video
+    # Compose video, streaming ffmpeg's -progress updates to the console
     print("\n4. Composing final video...")
-    final_video_path = f"{output_dir}/final_video_{timestamp}.mp4"
+    progress_callback.set(print_progress)
     
-    composition_result = await video_composer.compose_final_video(
+    composition_result = await video_composer.compose_single_pass(
         clip_paths=clip_paths,
         title_card_image_path=title_card_path,
         output_path=final_video_path,
         title_card_duration=3.0,
         voiceover_audio_path=voiceover_path,
-        music_audio_path=music_path
+        music_audio_path=music_path,
+        size=(1080, 1920)
     )
     
+    print()  # End the progress line
     if composition_result.get("success"):
         print(f"  ✅ Final video composed: {final_video_path}")
     else:
@@ -192,10 +193,16 @@ Generated: {timestamp}"""
     if upload_result.get("success"):
         print(f"  ✅ Uploaded to Google Drive!")
         print(f"  🔗 URL: {upload_result.get('url', '')}")
+    else:
+        # Not on Drive, so keep a copy the next run won't overwrite
+        kept_path = f"{output_dir}/final_video_{timestamp}.mp4"
+        await asyncio.to_thread(shutil.copyfile, final_video_path, kept_path)
+        print(f"  ⚠️  Upload failed, video kept at {kept_path}")
     
     print("\n" + "="*80)
     print("✅ VIDEO COMPLETE WITH PROPER 9:16 ASPECT RATIO!")
     print("="*80 + "\n")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    from src.utils import event_loop
+    event_loop.run(main())
@@ -32,7 +32,8 @@ async def generate_complete_video():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = "/tmp"
 
-    # STEP 1: Generate 3 video clips with Veo 3 in 9:16 aspect ratio
+    # Steps 1-5 and 7 are independent API calls (only the voiceover needs the
+    # script), so they all run concurrently and are awaited at the compose step
     print("\n1. Generating 3 video clips with Veo 3 (9:16 vertical)...")
 
     clip_prompts = [
@@ -41,51 +42,16 @@ async def generate_complete_video():
         "Cinematic shot: Happy hotel manager reviewing positive guest reviews on tablet, Hawaii beach resort background with palm trees, golden hour lighting, 9:16 vertical professional composition"
     ]
 
-    clip_results = await veo3_service.generate_multi_clip_video(
+    veo_task = asyncio.create_task(veo3_service.generate_multi_clip_video(
         clip_prompts=clip_prompts,
         output_dir=output_dir
-    )
-
-    if not clip_results.get("success"):
-        print(f"  ❌ Video generation failed: {clip_results.get('error')}")
-        return {"success": False}
-
-    clip_paths = clip_results["clip_paths"]
-    print(f"  ✅ Generated {len(clip_paths)} clips")
-
-    # Convert clips from 16:9 to 9:16
-    print("\n  Converting clips to 9:16 aspect ratio...")
-    import subprocess
-    converted_clip_paths = []
-
-    for i, clip_path in enumerate(clip_paths, 1):
-        output_clip = f"{output_dir}/clip_{i}_9x16.mp4"
-
-        # Scale and crop to fill 9:16 - zoom in to avoid letterboxing
-        cmd = [
-            "ffmpeg",
-            "-i", clip_path,
-            "-vf", "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920",
-            "-c:a", "copy",
-            "-y",
-            output_clip
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            converted_clip_paths.append(output_clip)
-            print(f"    ✅ Converted clip {i} to 9:16")
-        else:
-            print(f"    ❌ Failed to convert clip {i}")
-            return {"success": False}
-
-    clip_paths = converted_clip_paths
+    ))
 
     # STEP 2: Generate title card
-    print("\n2. Generating title card...")
+    print("2. Generating title card...")
     title_card_path = f"{output_dir}/title_card_{timestamp}.png"
 
-    title_card_result = await google_image_service.generate_image(
+    title_task = asyncio.create_task(google_image_service.generate_image(
         prompt=f"""Professional title card for business video about {topic}
 
 Style: Clean, modern, corporate Hawaiian theme
@@ -95,18 +61,12 @@ Elements: Subtle palm tree silhouettes, gradient background, space for text over
 Mood: Professional, innovative, welcoming
 Quality: High-end business presentation""",
         output_path=title_card_path
-    )
-
-    if title_card_result.get("success"):
-        print(f"  ✅ Title card generated")
-    else:
-        print(f"  ⚠️  Title card failed, continuing without")
-        title_card_path = None
+    ))
 
     # STEP 3: Generate voiceover script (timed for 27 seconds: 3s title + 24s clips)
-    print("\n3. Generating voiceover script...")
+    print("3. Generating voiceover script...")
 
-    script = await claude_service.generate_content(
+    script_task = asyncio.create_task(claude_service.generate_content(
         system_prompt="You are a professional voiceover scriptwriter for promotional videos.",
         user_prompt=f"""Write a compelling 25-second voiceover script for a video about: {topic}
 
@@ -124,70 +84,30 @@ Script requirements:
 - Service focus: {service_focus}
 
 Return ONLY the script text, no labels or formatting."""
-    )
-
-    print(f"  ✅ Script: {script[:100]}...")
-
-    # STEP 4: Generate voiceover audio
-    print("\n4. Generating voiceover...")
-    voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
-
-    voiceover_result = await elevenlabs_service.generate_voiceover(
-        script=script,
-        output_path=voiceover_path
-    )
-
-    if not voiceover_result.get("success"):
-        print(f"  ❌ Voiceover failed")
-        return {"success": False}
-
-    print(f"  ✅ Voiceover generated")
+    ))
 
     # STEP 5: Generate background music (27 seconds to match video)
-    print("\n5. Generating background music...")
+    print("5. Generating background music...")
     music_path = f"{output_dir}/music_{timestamp}.mp3"
 
-    music_prompt = await elevenlabs_service.generate_music_prompt(
-        topic=topic,
-        mood="uplifting and energetic",
-        style="modern corporate tech with Hawaiian ukulele"
-    )
-
-    music_result = await elevenlabs_service.generate_background_music(
-        prompt=music_prompt,
-        duration=27,  # Match total video length
-        output_path=music_path
-    )
-
-    if not music_result.get("success"):
-        print(f"  ⚠️  Music generation failed, continuing without")
-        music_path = None
-    else:
-        print(f"  ✅ Background music generated")
-
-    # STEP 6: Compose final video
-    print("\n6. Composing final video...")
-    final_video_path = f"{output_dir}/final_video_{timestamp}.mp4"
+    async def generate_music():
+        music_prompt = await elevenlabs_service.generate_music_prompt(
+            topic=topic,
+            mood="uplifting and energetic",
+            style="modern corporate tech with Hawaiian ukulele"
+        )
+        return await elevenlabs_service.generate_background_music(
+            prompt=music_prompt,
+            duration=27,  # Match total video length
+            output_path=music_path
+        )
 
-    composition_result = await video_composer.compose_final_video(
-        clip_paths=clip_paths,
-        title_card_image_path=title_card_path,
-        output_path=final_video_path,
-        title_card_duration=3.0,
-        voiceover_audio_path=voiceover_path,
-        music_audio_path=music_path
-    )
-
-    if not composition_result.get("success"):
-        print(f"  ❌ Video composition failed: {composition_result.get('error')}")
-        return {"success": False}
-
-    print(f"  ✅ Final video composed")
+    music_task = asyncio.create_task(generate_music())
 
     # STEP 7: Generate social media captions
-    print("\n7. Generating social media captions...")
+    print("7. Generating social media captions...")
 
-    captions_response = await claude_service.generate_content(
+    captions_task = asyncio.create_task(claude_service.generate_content(
         system_prompt="You are a social media expert for B2B tech companies.",
         user_prompt=f"""Create platform-specific captions for a video about: {topic}
 
@@ -206,105 +126,184 @@ Each caption MUST:
 Generate for: YouTube, Instagram, TikTok, LinkedIn, Twitter/X
 
 Return as JSON: {{"youtube": "...", "instagram": "...", "tiktok": "...", "linkedin": "...", "twitter": "..."}}"""
-    )
+    ))
 
+    # Whatever fails below (or returns early), no API call is left running or
+    # its error unretrieved - including the Drive upload if the captions fail
+    tasks = [veo_task, title_task, script_task, music_task, captions_task]
     try:
-        captions = extract_json_from_response(captions_response)
-    except:
-        captions = {
-            "youtube": f"{topic}\n\n{settings.company_name}\n{settings.company_website}\n{settings.company_phone}",
-            "instagram": f"{topic}\n\nVisit: {settings.company_website}\n\n#AIinHawaii #HawaiiBusiness",
-            "tiktok": f"{topic} #{settings.company_name.replace(' ', '')}",
-            "linkedin": f"{topic}\n\n{settings.company_name} - {settings.company_website}",
-            "twitter": f"{topic}\n\n{settings.company_website}"
-        }
+        script = await script_task
+        print(f"\n  ✅ Script: {script[:100]}...")
 
-    print(f"  ✅ Social media captions generated")
-
-    # STEP 8: Create comprehensive description
-    description = f"""TOPIC: {topic}
-SERVICE FOCUS: {service_focus}
-
-COMPANY: {settings.company_name}
-WEBSITE: {settings.company_website}
-PHONE: {settings.company_phone}
-EMAIL: {settings.company_email}
-TAGLINE: {settings.company_tagline}
-
-================================================================================
-YOUTUBE
-================================================================================
-{captions.get('youtube', '')}
-
-================================================================================
-INSTAGRAM
-================================================================================
-{captions.get('instagram', '')}
-
-================================================================================
-TIKTOK
-================================================================================
-{captions.get('tiktok', '')}
-
-================================================================================
-LINKEDIN
-================================================================================
-{captions.get('linkedin', '')}
-
-================================================================================
-TWITTER/X
-================================================================================
-{captions.get('twitter', '')}
-
-================================================================================
-VIDEO SPECS
-================================================================================
-Duration: ~27 seconds (3s title card + 24s video clips)
-Format: 9:16 vertical (1080x1920)
-Generated: {timestamp}
-Clips: 3 cinematic AI-generated clips
-Title Card: Yes
-Voiceover: Professional AI voice with script
-Background Music: Custom AI-generated music
-Audio: Broadcast quality with professional ducking"""
-
-    # STEP 9: Upload to Google Drive
-    print("\n8. Uploading to Google Drive...")
-
-    video_title = f"AI_Customer_Service_Hawaii_{timestamp}"
-
-    upload_result = await google_drive_uploader.upload_video(
-        video_path=final_video_path,
-        title=video_title,
-        description=description
-    )
-
-    if upload_result.get("success"):
-        print(f"  ✅ Uploaded to Google Drive!")
-        print(f"  🔗 {upload_result.get('url', '')}")
+        # STEP 4: Generate voiceover audio
+        print("\n4. Generating voiceover...")
+        voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
 
-    print("\n" + "="*80)
-    print("✅ COMPLETE PROFESSIONAL VIDEO GENERATED!")
-    print("="*80)
-    print(f"\n📁 Local: {final_video_path}")
-    print(f"🔗 Google Drive: {upload_result.get('url', '')}")
-    print(f"\n✨ Features:")
-    print(f"  ✅ 3 cinematic video clips (24 seconds)")
-    print(f"  ✅ Professional title card (3 seconds)")
-    print(f"  ✅ Voiceover with strong CTA")
-    print(f"  ✅ Background music with ducking")
-    print(f"  ✅ Full contact information in CTA")
-    print(f"  ✅ Platform-specific social media captions")
-    print("\n" + "="*80 + "\n")
-
-    return {
-        "success": True,
-        "video_path": final_video_path,
-        "google_drive_url": upload_result.get("url")
-    }
+        vo_task = asyncio.create_task(elevenlabs_service.generate_voiceover(
+            script=script,
+            output_path=voiceover_path
+        ))
+        tasks.append(vo_task)
+
+        clip_results, title_card_result, voiceover_result, music_result = await asyncio.gather(
+            veo_task, title_task, vo_task, music_task
+        )
+
+        if not clip_results.get("success"):
+            print(f"  ❌ Video generation failed: {clip_results.get('error')}")
+            return {"success": False}
+
+        clip_paths = clip_results["clip_paths"]
+        print(f"  ✅ Generated {len(clip_paths)} clips")
+
+        if title_card_result.get("success"):
+            print(f"  ✅ Title card generated")
+        else:
+            print(f"  ⚠️  Title card failed, continuing without")
+            title_card_path = None
+
+        if not voiceover_result.get("success"):
+            print(f"  ❌ Voiceover failed")
+            return {"success": False}
+
+        print(f"  ✅ Voiceover generated")
+
+        if not music_result.get("success"):
+            print(f"  ⚠️  Music generation failed, continuing without")
+            music_path = None
+        else:
+            print(f"  ✅ Background music generated")
+
+        # STEP 6: Compose final video
+        print("\n6. Composing final video...")
+        final_video_path = f"{output_dir}/final_video_{timestamp}.mp4"
+
+        # The 16:9 clips are scaled/cropped to fill 9:16 inside the same ffmpeg
+        # run that composes and mixes - each frame is decoded and encoded once
+        composition_result = await video_composer.compose_single_pass(
+            clip_paths=clip_paths,
+            title_card_image_path=title_card_path,
+            output_path=final_video_path,
+            title_card_duration=3.0,
+            voiceover_audio_path=voiceover_path,
+            music_audio_path=music_path,
+            size=(1080, 1920)
+        )
+
+        if not composition_result.get("success"):
+            print(f"  ❌ Video composition failed: {composition_result.get('error')}")
+            return {"success": False}
+
+        print(f"  ✅ Final video composed")
+
+        # Start copying the video to Drive now; the description (which needs the
+        # captions) is attached once it is ready
+        video_title = f"AI_Customer_Service_Hawaii_{timestamp}"
+        upload_task = asyncio.create_task(google_drive_uploader.upload_video(
+            video_path=final_video_path,
+            title=video_title
+        ))
+        tasks.append(upload_task)
+
+        captions_response = await captions_task
+
+        try:
+            captions = extract_json_from_response(captions_response)
+        except:
+            captions = {
+                "youtube": f"{topic}\n\n{settings.company_name}\n{settings.company_website}\n{settings.company_phone}",
+                "instagram": f"{topic}\n\nVisit: {settings.company_website}\n\n#AIinHawaii #HawaiiBusiness",
+                "tiktok": f"{topic} #{settings.company_name.replace(' ', '')}",
+                "linkedin": f"{topic}\n\n{settings.company_name} - {settings.company_website}",
+                "twitter": f"{topic}\n\n{settings.company_website}"
+            }
+
+        print(f"  ✅ Social media captions generated")
+
+        # STEP 8: Create comprehensive description
+        description = f"""TOPIC: {topic}
+    SERVICE FOCUS: {service_focus}
+
+    COMPANY: {settings.company_name}
+    WEBSITE: {settings.company_website}
+    PHONE: {settings.company_phone}
+    EMAIL: {settings.company_email}
+    TAGLINE: {settings.company_tagline}
+
+    ================================================================================
+    YOUTUBE
+    ================================================================================
+    {captions.get('youtube', '')}
+
+    ================================================================================
+    INSTAGRAM
+    ================================================================================
+    {captions.get('instagram', '')}
+
+    ================================================================================
+    TIKTOK
+    ================================================================================
+    {captions.get('tiktok', '')}
+
+    ================================================================================
+    LINKEDIN
+    ================================================================================
+    {captions.get('linkedin', '')}
+
+    ================================================================================
+    TWITTER/X
+    ================================================================================
+    {captions.get('twitter', '')}
+
+    ================================================================================
+    VIDEO SPECS
+    ================================================================================
+    Duration: ~27 seconds (3s title card + 24s video clips)
+    Format: 9:16 vertical (1080x1920)
+    Generated: {timestamp}
+    Clips: 3 cinematic AI-generated clips
+    Title Card: Yes
+    Voiceover: Professional AI voice with script
+    Background Music: Custom AI-generated music
+    Audio: Broadcast quality with professional ducking"""
+
+        # STEP 9: Upload to Google Drive
+        print("\n8. Uploading to Google Drive...")
+
+        upload_result = await upload_task
+
+        if upload_result.get("success"):
+            await google_drive_uploader.write_description(upload_result["path"], description)
+            print(f"  ✅ Uploaded to Google Drive!")
+            print(f"  🔗 {upload_result.get('url', '')}")
+
+        print("\n" + "="*80)
+        print("✅ COMPLETE PROFESSIONAL VIDEO GENERATED!")
+        print("="*80)
+        print(f"\n📁 Local: {final_video_path}")
+        print(f"🔗 Google Drive: {upload_result.get('url', '')}")
+        print(f"\n✨ Features:")
+        print(f"  ✅ 3 cinematic video clips (24 seconds)")
+        print(f"  ✅ Professional title card (3 seconds)")
+        print(f"  ✅ Voiceover with strong CTA")
+        print(f"  ✅ Background music with ducking")
+        print(f"  ✅ Full contact information in CTA")
+        print(f"  ✅ Platform-specific social media captions")
+        print("\n" + "="*80 + "\n")
+
+        return {
+            "success": True,
+            "video_path": final_video_path,
+            "google_drive_url": upload_result.get("url")
+        }
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 if __name__ == "__main__":
-    result = asyncio.run(generate_complete_video())
+    from src.utils import event_loop
+    result = event_loop.run(generate_complete_video())
 
     if result.get("success"):
         print("🎬 Your professional promotional video is ready!")
@@ -1,22 +1,41 @@
 """
 Generate a complete video with diverse topics and proper Problem → Solution → CTA structure.
 """
+import os
 import asyncio
-import subprocess
 from datetime import datetime
 from src.utils.topic_generator import topic_generator
 from src.services.veo_client import veo3_service
-from src.config import settings
-import os
-from elevenlabs.client import ElevenLabs
+from src.services.elevenlabs_client import elevenlabs_service
+from src.utils.tempfiles import TempFiles
+from src.utils.assembler import (
+    ARIAL, ARIAL_BOLD, AssembleSpec, AudioSpec, BoxLayer, CardSpec, ClipSpec, TextLayer,
+    assemble, missing_fonts, open_preview, print_specs, render_card_still
+)
+from src.utils.ffmpeg_runner import FFmpegError
+from src.utils import event_loop
+
 
 async def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    # Intermediates live in a scratch directory that is removed afterwards;
+    # only the final video is kept in /tmp
+    with TempFiles(prefix="diverse_") as tmp:
+        return await build_video(tmp, timestamp)
+
+
+async def build_video(tmp, timestamp):
     print("\n" + "="*80)
     print("GENERATING DIVERSE VIDEO WITH PROBLEM → SOLUTION → CTA")
     print("="*80 + "\n")
 
+    # Fail before any Veo/TTS spend if the render is bound to fail
+    fonts = missing_fonts()
+    if fonts:
+        print(f"❌ Missing fonts: {', '.join(fonts)}")
+        return False
+
     # Step 1: Generate unique concept
     print("1. Generating unique video concept...")
     concept = topic_generator.generate_video_concept()
@@ -30,243 +49,146 @@ async def main():
     # Step 2: Generate 3 portrait video clips
     print("2. Generating 3 portrait video clips (this takes ~5-10 minutes)...\n")
 
-    clip_paths = []
-    for i, prompt_key in enumerate(['clip_1_prompt', 'clip_2_prompt', 'clip_3_prompt'], 1):
-        print(f"   Generating Clip {i}/3...")
-        prompt = concept[prompt_key]
-        output_path = f"/tmp/clip_{i}_diverse_{timestamp}.mp4"
-
-        result = await veo3_service.generate_video_clip(
-            prompt=prompt,
+    # The three Veo jobs are independent, so run them concurrently
+    prompt_keys = ['clip_1_prompt', 'clip_2_prompt', 'clip_3_prompt']
+    clip_paths = [tmp.path(f"clip_{i}.mp4") for i in range(1, len(prompt_keys) + 1)]
+    results = await asyncio.gather(*(
+        veo3_service.generate_video_clip(
+            prompt=concept[prompt_key],
             duration=8,
             output_path=output_path,
             aspect_ratio="9:16"
         )
+        for prompt_key, output_path in zip(prompt_keys, clip_paths)
+    ), return_exceptions=True)
 
+    failed = False
+    for i, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            result = {"success": False, "error": str(result)}
         if result.get("success"):
-            # Convert to portrait if needed
-            converted_path = f"/tmp/clip_{i}_portrait_diverse_{timestamp}.mp4"
-            subprocess.run([
-                "ffmpeg", "-i", output_path,
-                "-vf", "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920",
-                "-c:a", "copy", "-y", converted_path
-            ], capture_output=True)
-            clip_paths.append(converted_path)
-            print(f"   ✅ Clip {i} generated\n")
+            print(f"   ✅ Clip {i} generated")
         else:
             print(f"   ❌ Clip {i} failed: {result.get('error')}")
-            return False
-
-    # Step 3: Generate voiceover
-    print("3. Generating custom voiceover...")
-    client = ElevenLabs(api_key=settings.elevenlabs_api_key)
-
-    voiceover_path = f"/tmp/voiceover_{timestamp}.mp3"
-    audio = client.text_to_speech.convert(
-        text=concept['voiceover_script'],
+            failed = True
+    if failed:
+        return False
+    print()
+
+    # Step 3: Stream the voiceover to disk in the background; music selection
+    # and layout (steps 4-5) proceed while the audio is still arriving
+    print("3. Streaming custom voiceover...")
+    # Raw 48 kHz PCM: the mix reads lossless samples, with no MP3 decode or resample
+    voiceover_path = tmp.path("voiceover.pcm")
+
+    # Shares the content-addressed TTS cache with the other scripts, so a
+    # repeated script skips the API call entirely
+    voiceover_task = asyncio.create_task(elevenlabs_service.text_to_speech_file(
+        concept['voiceover_script'],
+        voiceover_path,
         voice_id="21m00Tcm4TlvDq8ikWAM",  # Rachel voice ID
-        model_id="eleven_multilingual_v2"
-    )
-
-    with open(voiceover_path, 'wb') as f:
-        for chunk in audio:
-            f.write(chunk)
-    print(f"   ✅ Voiceover generated\n")
+        model_id="eleven_turbo_v2_5",  # Low-latency model
+        stream=True,
+        optimize_streaming_latency=3,
+        output_format="pcm_48000"
+    ))
 
     # Step 4: Select random Hawaiian music from library
     print("4. Selecting random Hawaiian music from library...")
     from src.services.music_library import music_library
 
-    music_result = music_library.select_random_segment(
-        output_path=f"/tmp/music_segment_{timestamp}.mp3",
-        segment_duration=35
-    )
-
-    if music_result["success"]:
-        music_path = music_result["path"]
-        print(f"   ✅ Selected: {music_result['source_file']}")
-        print(f"   ✅ Segment: {music_result['start_time']:.1f}s - {music_result['start_time'] + 35:.1f}s\n")
-    else:
-        raise Exception(f"Failed to select music: {music_result.get('error')}")
-
-    # Step 5: Add text overlays to clips
-    print("5. Adding Instagram-style text overlays...")
-    clips_with_text = []
+    # Only a start time is picked here; the render seeks into the library file
+    # itself instead of extracting (and re-encoding) a segment to disk first.
+    # Runs in a thread (it probes the file) alongside the voiceover and cards
+    music_task = asyncio.create_task(asyncio.to_thread(music_library.select_random_start, segment_duration=35))
 
+    # Step 5: Describe the overlays and cards, and render the card stills
+    # while the voiceover and music are still in progress
+    print("5. Laying out text overlays and title cards...")
     text_overlays = [
         (concept['clip_1_text'], "white", "#FF6B35"),
         (concept['clip_2_text'], "#FFD700", "white"),
         (concept['clip_3_text'], "#00D9FF", "white")
     ]
 
-    for i, (clip_path, (text, color1, color2)) in enumerate(zip(clip_paths, text_overlays), 1):
-        output_path = f"/tmp/clip_{i}_with_text_{timestamp}.mp4"
+    clips = []
+    for clip_path, (text, color1, color2) in zip(clip_paths, text_overlays):
         words = text.split()
         line1 = ' '.join(words[:len(words)//2])
         line2 = ' '.join(words[len(words)//2:])
-
-        subprocess.run([
-            "ffmpeg", "-i", clip_path,
-            "-vf", f"drawtext=fontfile=/System/Library/Fonts/Supplemental/Impact.ttf:text='{line1}':fontcolor={color1}:fontsize=90:x=(w-text_w)/2:y=200:borderw=5:bordercolor=black:box=1:boxcolor=black@0.6:boxborderw=20,drawtext=fontfile=/System/Library/Fonts/Supplemental/Impact.ttf:text='{line2}':fontcolor={color2}:fontsize=90:x=(w-text_w)/2:y=320:borderw=5:bordercolor=black:box=1:boxcolor=black@0.6:boxborderw=20",
-            "-c:a", "copy", "-y", output_path
-        ], capture_output=True)
-        clips_with_text.append(output_path)
-    print(f"   ✅ Text overlays added\n")
-
-    # Step 6: Create modern intro title card
-    print("6. Creating modern intro title card...")
-    intro_card_path = f"/tmp/intro_card_{timestamp}.mp4"
-    subprocess.run([
-        "ffmpeg", "-f", "lavfi", "-i", "color=c=#0A2E4D:s=1080x1920:d=3",
-        "-vf",
-        # Smooth gradient background
-        "drawbox=x=0:y=0:w=1080:h=640:color=#0A2E4D@1.0:t=fill,"
-        "drawbox=x=0:y=640:w=1080:h=640:color=#1B5E8C@0.9:t=fill,"
-        "drawbox=x=0:y=1280:w=1080:h=640:color=#2A9D8F@0.8:t=fill,"
-        # White accent line (centered vertically)
-        "drawbox=x=90:y=1030:w=900:h=8:color=white@0.8:t=fill,"
-        # Main title - Bold and clean (centered around y=960)
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Impact.ttf:"
-        "text='LENILANI':"
-        "fontcolor=white:"
-        "fontsize=140:"
-        "x=(w-text_w)/2:"
-        "y=770:"
-        "borderw=0,"
-        # Subtitle
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:"
-        "text='CONSULTING':"
-        "fontcolor=#FFD700:"
-        "fontsize=70:"
-        "x=(w-text_w)/2:"
-        "y=930:"
-        "borderw=0,"
-        # Tagline
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:"
-        "text='AI Solutions for Hawaii Business':"
-        "fontcolor=white@0.9:"
-        "fontsize=48:"
-        "x=(w-text_w)/2:"
-        "y=1080:"
-        "borderw=0",
-        "-c:v", "libx264", "-t", "3", "-pix_fmt", "yuv420p", "-y", intro_card_path
-    ], capture_output=True)
-    print(f"   ✅ Modern intro card created\n")
-
-    # Step 7: Create modern CTA outro card
-    print("7. Creating modern CTA outro card...")
-    outro_card_path = f"/tmp/outro_cta_{timestamp}.mp4"
+        clips.append(ClipSpec(path=clip_path, lines=[(line1, color1), (line2, color2)]))
+
+    # Modern intro title card: gradient background, accent line, centered title
+    intro = CardSpec(duration=3, color="#0A2E4D", layers=[
+        BoxLayer(0, 0, 1080, 640, "#0A2E4D@1.0"),
+        BoxLayer(0, 640, 1080, 640, "#1B5E8C@0.9"),
+        BoxLayer(0, 1280, 1080, 640, "#2A9D8F@0.8"),
+        BoxLayer(90, 1030, 900, 8, "white@0.8"),
+        TextLayer("LENILANI", y=770, size=140),
+        TextLayer("CONSULTING", y=930, color="#FFD700", size=70, font=ARIAL_BOLD),
+        TextLayer("AI Solutions for Hawaii Business", y=1080, color="white@0.9", size=48, font=ARIAL),
+    ])
 
     # Split hook into lines if needed
     hook_words = concept['cta']['hook'].split()
     hook_line1 = ' '.join(hook_words[:2]) if len(hook_words) > 2 else concept['cta']['hook']
     hook_line2 = ' '.join(hook_words[2:]) if len(hook_words) > 2 else ''
 
-    subprocess.run([
-        "ffmpeg", "-f", "lavfi", "-i", "color=c=#0A2E4D:s=1080x1920:d=6",
-        "-vf",
-        # Gradient background
-        "drawbox=x=0:y=0:w=1080:h=960:color=#0A2E4D@1.0:t=fill,"
-        "drawbox=x=0:y=960:w=1080:h=960:color=#1B5E8C@0.95:t=fill,"
-        # Accent bars (centered around y=960)
-        "drawbox=x=0:y=680:w=1080:h=6:color=#2A9D8F@0.9:t=fill,"
-        "drawbox=x=0:y=1240:w=1080:h=6:color=#2A9D8F@0.9:t=fill,"
-        # CTA Hook - Bold (centered vertically around y=960)
-        f"drawtext=fontfile=/System/Library/Fonts/Supplemental/Impact.ttf:"
-        f"text='{hook_line1}':"
-        f"fontcolor=white:"
-        f"fontsize=95:"
-        f"x=(w-text_w)/2:"
-        f"y=710:"
-        f"borderw=0,"
-        f"drawtext=fontfile=/System/Library/Fonts/Supplemental/Impact.ttf:"
-        f"text='{hook_line2 if hook_line2 else concept['cta']['action'].split()[0]}':"
-        f"fontcolor=#FFD700:"
-        f"fontsize=110:"
-        f"x=(w-text_w)/2:"
-        f"y=820:"
-        f"borderw=0,"
-        # Primary action
-        f"drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:"
-        f"text='{concept['cta_main']}':"
-        f"fontcolor=white:"
-        f"fontsize=58:"
-        f"x=(w-text_w)/2:"
-        f"y=960:"
-        f"borderw=0,"
-        # Website - Prominent
-        "drawbox=x=240:y=1050:w=600:h=100:color=#2A9D8F@0.2:t=fill,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:"
-        "text='LeniLani.com':"
-        "fontcolor=#00D9FF:"
-        "fontsize=80:"
-        "x=(w-text_w)/2:"
-        "y=1070:"
-        "borderw=0,"
-        # Phone
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:"
-        "text='808-766-1164':"
-        "fontcolor=white:"
-        "fontsize=60:"
-        "x=(w-text_w)/2:"
-        "y=1180:"
-        "borderw=0,"
-        # Urgency
-        f"drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:"
-        f"text='{concept['cta_urgency']}':"
-        f"fontcolor=#FF6B35:"
-        f"fontsize=48:"
-        f"x=(w-text_w)/2:"
-        f"y=1300:"
-        f"borderw=0",
-        "-c:v", "libx264", "-t", "6", "-pix_fmt", "yuv420p", "-y", outro_card_path
-    ], capture_output=True)
-    print(f"   ✅ Modern CTA outro created\n")
-
-    # Step 8: Concatenate all parts
-    print("8. Assembling complete video...")
-    concat_file = f"/tmp/concat_{timestamp}.txt"
-    with open(concat_file, 'w') as f:
-        f.write(f"file '{intro_card_path}'\n")
-        for clip in clips_with_text:
-            f.write(f"file '{clip}'\n")
-        f.write(f"file '{outro_card_path}'\n")
-
-    video_parts_path = f"/tmp/video_parts_{timestamp}.mp4"
-    subprocess.run([
-        "ffmpeg", "-f", "concat", "-safe", "0", "-i", concat_file,
-        "-c", "copy", "-y", video_parts_path
-    ], capture_output=True)
-    print(f"   ✅ Video parts assembled\n")
-
-    # Step 9: Mix audio (voiceover + Hawaiian music) - music continues after voiceover
-    print("9. Mixing audio...")
-    audio_final_path = f"/tmp/audio_final_{timestamp}.m4a"
-    subprocess.run([
-        "ffmpeg",
-        "-i", voiceover_path,
-        "-i", music_path,
-        "-filter_complex", "[0:a]volume=1.5[vo];[1:a]volume=0.2[music];[vo][music]amix=inputs=2:duration=longest[out]",
-        "-map", "[out]", "-c:a", "aac", "-b:a", "256k", "-ar", "48000",
-        "-t", "35", "-y", audio_final_path
-    ], capture_output=True)
-    print(f"   ✅ Audio mixed\n")
+    # Modern CTA outro card
+    outro = CardSpec(duration=6, color="#0A2E4D", layers=[
+        BoxLayer(0, 0, 1080, 960, "#0A2E4D@1.0"),
+        BoxLayer(0, 960, 1080, 960, "#1B5E8C@0.95"),
+        BoxLayer(0, 680, 1080, 6, "#2A9D8F@0.9"),
+        BoxLayer(0, 1240, 1080, 6, "#2A9D8F@0.9"),
+        TextLayer(hook_line1, y=710, size=95),
+        TextLayer(hook_line2 if hook_line2 else concept['cta']['action'].split()[0], y=820, color="#FFD700", size=110),
+        TextLayer(concept['cta_main'], y=960, size=58, font=ARIAL_BOLD),
+        BoxLayer(240, 1050, 600, 100, "#2A9D8F@0.2"),
+        TextLayer("LeniLani.com", y=1070, color="#00D9FF", size=80, font=ARIAL_BOLD),
+        TextLayer("808-766-1164", y=1180, size=60, font=ARIAL_BOLD),
+        TextLayer(concept['cta_urgency'], y=1300, color="#FF6B35", size=48, font=ARIAL),
+    ])
+    cards_task = asyncio.gather(render_card_still(intro), render_card_still(outro))
+
+    # Wait only for what the render consumes
+    try:
+        music_result, _, _ = await asyncio.gather(music_task, voiceover_task, cards_task)
+    except FFmpegError as e:
+        print(f"   ❌ Title card render failed: {e.stderr[-500:]}")
+        return False
+    if music_result["success"]:
+        music_path = music_result["path"]
+        print(f"   ✅ Music: {music_result['source_file']}")
+        print(f"   ✅ Segment: {music_result['start_time']:.1f}s - {music_result['start_time'] + 35:.1f}s")
+    else:
+        raise Exception(f"Failed to select music: {music_result.get('error')}")
+    print(f"   ✅ Voiceover streamed")
+    print(f"   ✅ Title cards rendered\n")
 
-    # Step 10: Final video with audio and fade (both video AND audio)
-    print("10. Creating final video with smooth fade out...")
+    # Step 6: Overlays, cards, concat, audio mix and fade in ONE ffmpeg graph,
+    # streamed straight into the final encode - no intermediate MP4s
+    print("6. Rendering final video with smooth fade out...")
     final_output = f"/tmp/DIVERSE_VIDEO_{timestamp}.mp4"
-    subprocess.run([
-        "ffmpeg",
-        "-stream_loop", "-1", "-i", video_parts_path,
-        "-i", audio_final_path,
-        "-t", "35",
-        "-filter_complex",
-        "[0:v]fade=t=out:st=33:d=2[vfade];"
-        "[1:a]afade=t=out:st=33:d=2[afade]",
-        "-map", "[vfade]", "-map", "[afade]",
-        "-c:v", "libx264", "-preset", "medium", "-crf", "23",
-        "-c:a", "aac", "-b:a", "256k", "-y", final_output
-    ], capture_output=True)
+    spec = AssembleSpec(
+        intro=intro,
+        clips=clips,
+        outro=outro,
+        output_path=final_output,
+        audio=AudioSpec(
+            voiceover_path=voiceover_path,
+            music_path=music_path,
+            music_start=music_result["start_time"],
+            fade_out=True
+        ),
+        duration=35,
+        fade_out_s=2,
+        hw_bitrate="8M"  # VideoToolbox/NVENC when available, libx264 otherwise
+    )
+    try:
+        await assemble(spec)
+    except FFmpegError as e:
+        print(f"   ❌ Render failed: {e.stderr[-500:]}")
+        return False
 
     print(f"\n{'='*80}")
     print("✅ COMPLETE!")
@@ -277,17 +199,13 @@ async def main():
     print(f"   Problem: {concept['problem']['title']}")
     print(f"   CTA: {concept['cta_main']}")
 
-    # Get specs
-    probe = subprocess.run(
-        ["ffprobe", "-v", "error", "-show_entries",
-         "stream=width,height:format=duration", "-of", "default=noprint_wrappers=1", final_output],
-        capture_output=True, text=True
-    )
-    print(f"\n📐 Specs:\n{probe.stdout}")
+    # Spawning ffprobe / a player is opt-in: ASSEMBLE_VERIFY=1, ASSEMBLE_PREVIEW=1
+    if os.environ.get("ASSEMBLE_VERIFY"):
+        print_specs(final_output)
 
     return final_output
 
 if __name__ == "__main__":
-    final_video = asyncio.run(main())
-    if final_video:
-        subprocess.run(["open", final_video])
+    final_video = event_loop.run(main())
+    if final_video and os.environ.get("ASSEMBLE_PREVIEW"):
+        open_preview(final_video)
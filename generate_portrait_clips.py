@@ -3,6 +3,7 @@ Generate 3 portrait video clips using updated Veo 3 client.
 """
 import asyncio
 from src.services.veo_client import veo3_service
+from src.utils import event_loop
 from datetime import datetime
 
 async def main():
@@ -24,20 +25,28 @@ async def main():
         """Cinematic portrait video (9:16 vertical): Same Hawaiian business owner now relaxed and confident, working efficiently on a sleek laptop with a modern AI dashboard visible on screen. Bright, clean office with organized workspace. Camera pans to show satisfied customers in background. Professional commercial quality, vibrant colors, success story aesthetic, 8 seconds."""
     ]
 
-    for i, prompt in enumerate(clip_prompts, 1):
-        print(f"\n{'='*80}")
-        print(f"GENERATING CLIP {i}/3")
-        print(f"{'='*80}\n")
-        print(f"Prompt: {prompt[:150]}...\n")
-
-        output_path = f"/tmp/clip_{i}_portrait_{timestamp}.mp4"
-
-        result = await veo3_service.generate_video_clip(
+    # The three Veo jobs are independent, so run them concurrently
+    print(f"Generating {len(clip_prompts)} clips concurrently...\n")
+    output_paths = [f"/tmp/clip_{i}_portrait_{timestamp}.mp4" for i in range(1, len(clip_prompts) + 1)]
+    results = await asyncio.gather(*(
+        veo3_service.generate_video_clip(
             prompt=prompt,
             duration=8,
             output_path=output_path,
             aspect_ratio="9:16"  # PORTRAIT MODE
         )
+        for prompt, output_path in zip(clip_prompts, output_paths)
+    ), return_exceptions=True)
+
+    failed = False
+    for i, (prompt, output_path, result) in enumerate(zip(clip_prompts, output_paths, results), 1):
+        print(f"\n{'='*80}")
+        print(f"CLIP {i}/3")
+        print(f"{'='*80}\n")
+        print(f"Prompt: {prompt[:150]}...\n")
+
+        if isinstance(result, Exception):
+            result = {"success": False, "error": str(result)}
 
         if result.get("success"):
             print(f"\n✅ Clip {i} generated successfully!")
@@ -45,7 +54,10 @@ async def main():
         else:
             print(f"\n❌ Clip {i} failed: {result.get('error')}")
             print(f"Message: {result.get('message')}\n")
-            return False
+            failed = True
+
+    if failed:
+        return False
 
     print("\n" + "="*80)
     print("✅ ALL PORTRAIT CLIPS GENERATED SUCCESSFULLY!")
@@ -53,5 +65,5 @@ async def main():
     return True
 
 if __name__ == "__main__":
-    success = asyncio.run(main())
+    success = event_loop.run(main())
     exit(0 if success else 1)
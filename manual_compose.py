@@ -1,8 +1,11 @@
 """
 Manually compose a complete video with all components working correctly.
 """
+import asyncio
 import subprocess
 from datetime import datetime
+from src.utils.ffmpeg_runner import FFmpegError, h264_encoder_args, hw_decode_args, run_ff
+from src.utils.loudness import two_pass_loudnorm
 
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -10,183 +13,122 @@ print("\n" + "="*80)
 print("MANUALLY COMPOSING COMPLETE VIDEO")
 print("="*80 + "\n")
 
-# Step 1: Create title card video (3 seconds) with text overlay
-print("1. Creating title card video with company info...")
-title_card_cmd = [
-    "ffmpeg",
-    "-loop", "1",
-    "-i", "/tmp/title_card_20251026_164000.png",
-    "-vf", (
-        "scale=1080:1920:force_original_aspect_ratio=decrease,"
-        "pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:text='AI-Powered Customer Service':"
-        "fontcolor=white:fontsize=60:x=(w-text_w)/2:y=400:borderw=3:bordercolor=black,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:text='Transforms Hawaii Tourism':"
-        "fontcolor=white:fontsize=60:x=(w-text_w)/2:y=500:borderw=3:bordercolor=black,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='LeniLani Consulting':"
-        "fontcolor=#FF6B35:fontsize=48:x=(w-text_w)/2:y=1200:borderw=2:bordercolor=black,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='LeniLani.com':"
-        "fontcolor=white:fontsize=42:x=(w-text_w)/2:y=1300:borderw=2:bordercolor=black,"
-        "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='(808) 555-0123':"
-        "fontcolor=white:fontsize=38:x=(w-text_w)/2:y=1380:borderw=2:bordercolor=black"
-    ),
-    "-c:v", "libx264",
-    "-t", "3",
-    "-pix_fmt", "yuv420p",
-    "-r", "30",
-    "-y",
-    "/tmp/title_card_video.mp4"
-]
-
-result = subprocess.run(title_card_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Title card video created")
-else:
-    print(f"  ❌ Title card failed: {result.stderr[-500:]}")
-    exit(1)
-
-# Step 2: Concatenate title card + 2 clips
-print("\n2. Concatenating title card and clips...")
-
-# Create concat file
-concat_content = """file '/tmp/title_card_video.mp4'
-file '/tmp/clip_1_9x16.mp4'
-file '/tmp/clip_2_9x16.mp4'
-"""
-
-with open("/tmp/concat_list.txt", "w") as f:
-    f.write(concat_content)
-
-concat_cmd = [
-    "ffmpeg",
-    "-f", "concat",
-    "-safe", "0",
-    "-i", "/tmp/concat_list.txt",
-    "-c", "copy",
-    "-y",
-    "/tmp/video_concat.mp4"
-]
+TOTAL_DURATION = 27  # Matches the voiceover
+TITLE_CARD_DURATION = 3
+
+TITLE_CARD = "/tmp/title_card_20251026_164000.png"
+CLIPS = ["/tmp/clip_1_9x16.mp4", "/tmp/clip_2_9x16.mp4"]
+VOICEOVER = "/tmp/voiceover_20251026_164000.mp3"
+MUSIC = "/tmp/music_20251026_164000.mp3"
+
+# Everything below is ONE ffmpeg invocation: the title card, clips, ducked
+# audio mix and final encode share a single filter graph, with no
+# intermediate files
+print("1. Building single-pass filter graph...")
+
+# Title card with company info
+title_card_filter = (
+    "scale=1080:1920:force_original_aspect_ratio=decrease,"
+    "pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,"
+    "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:text='AI-Powered Customer Service':"
+    "fontcolor=white:fontsize=60:x=(w-text_w)/2:y=400:borderw=3:bordercolor=black,"
+    "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial Bold.ttf:text='Transforms Hawaii Tourism':"
+    "fontcolor=white:fontsize=60:x=(w-text_w)/2:y=500:borderw=3:bordercolor=black,"
+    "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='LeniLani Consulting':"
+    "fontcolor=#FF6B35:fontsize=48:x=(w-text_w)/2:y=1200:borderw=2:bordercolor=black,"
+    "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='LeniLani.com':"
+    "fontcolor=white:fontsize=42:x=(w-text_w)/2:y=1300:borderw=2:bordercolor=black,"
+    "drawtext=fontfile=/System/Library/Fonts/Supplemental/Arial.ttf:text='(808) 555-0123':"
+    "fontcolor=white:fontsize=38:x=(w-text_w)/2:y=1380:borderw=2:bordercolor=black,"
+    "setsar=1"
+)
+
+# The card is static: the PNG is decoded and its text drawn on ONE frame,
+# which is then repeated for the card's duration
+title_card_frames = TITLE_CARD_DURATION * 30
+title_card_hold = f"loop=loop={title_card_frames - 1}:size=1:start=0,setpts=N/30/TB,fps=30"
+
+# The title card + clips sequence repeats until the voiceover ends (-t trims
+# the excess). Each pass is its own set of inputs, so nothing is buffered.
+# The clips are decoded on the encoder's hardware (VideoToolbox/CUDA) when
+# there is one
+clip_decode = hw_decode_args()
+video_inputs = []
+video_parts = []
+for repeat in range(2):
+    base = len(video_parts)
+    video_inputs += ["-i", TITLE_CARD]
+    video_parts.append(f"[{base}:v]{title_card_filter},{title_card_hold}[v{base}]")
+    for i, clip in enumerate(CLIPS, start=1):
+        video_inputs += [*clip_decode, "-i", clip]
+        video_parts.append(f"[{base + i}:v]setsar=1,fps=30[v{base + i}]")
+
+n = len(video_parts)
+video_parts.append(f"{''.join(f'[v{i}]' for i in range(n))}concat=n={n}:v=1:a=0[vout]")
+
+# Music is looped once to cover the voiceover
+audio_inputs = ["-i", VOICEOVER, "-stream_loop", "1", "-i", MUSIC]
+
+
+def audio_mix(vo: int, music: int) -> str:
+    """Voiceover ducks the music (unlabeled output, ready for loudnorm)."""
+    return (
+        f"[{vo}:a]asplit=2[vo1][vo2];"
+        f"[{music}:a]volume=0.4[music_raw];"
+        "[vo1][music_raw]sidechaincompress=threshold=0.03:ratio=4:attack=20:release=250:level_sc=1[music_ducked];"
+        "[vo2][music_ducked]amix=inputs=2:duration=first:dropout_transition=2:normalize=0"
+    )
 
-result = subprocess.run(concat_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Video clips concatenated")
-else:
-    print(f"  ❌ Concat failed: {result.stderr[-500:]}")
-    exit(1)
 
-# Step 3: Extend/loop music to match voiceover duration (27 seconds)
-print("\n3. Extending background music to 27 seconds...")
+# Two-pass loudnorm: measure the mix (audio only, fast), then apply the
+# measured values linearly in the real render - no acompressor needed
+print("  Measuring mix loudness...")
+loudnorm = asyncio.run(two_pass_loudnorm(audio_inputs, audio_mix(0, 1)))
 
-music_extend_cmd = [
-    "ffmpeg",
-    "-stream_loop", "1",  # Loop once
-    "-i", "/tmp/music_20251026_164000.mp3",
-    "-t", "27",
-    "-y",
-    "/tmp/music_extended.mp3"
-]
+filter_complex = ";".join(video_parts) + f";{audio_mix(n, n + 1)},{loudnorm}[aout]"
+print("  ✅ Title card + clips + ducked audio mix")
 
-result = subprocess.run(music_extend_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Music extended to 27 seconds")
-else:
-    print(f"  ❌ Music extend failed: {result.stderr[-500:]}")
-    exit(1)
+print("\n2. Rendering final video...")
 
-# Step 4: Mix voiceover and music with professional ducking
-print("\n4. Mixing audio with ducking...")
+final_output = f"/tmp/final_complete_video_{timestamp}.mp4"
 
-audio_mix_cmd = [
+render_cmd = [
     "ffmpeg",
-    "-i", "/tmp/voiceover_20251026_164000.mp3",
-    "-i", "/tmp/music_extended.mp3",
-    "-filter_complex",
-    (
-        # Split voiceover for sidechain and mix
-        "[0:a]asplit=2[vo1][vo2];"
-
-        # Prepare music with volume
-        "[1:a]volume=0.4[music_raw];"
-
-        # Duck music when voiceover speaks
-        "[vo1][music_raw]sidechaincompress=threshold=0.03:ratio=4:attack=20:release=250:level_sc=1[music_ducked];"
-
-        # Mix voiceover and ducked music
-        "[vo2][music_ducked]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[mixed];"
-
-        # Final polish
-        "[mixed]loudnorm=I=-16:TP=-1.5:LRA=11,acompressor=threshold=-20dB:ratio=3:attack=5:release=50:makeup=2dB[out]"
-    ),
-    "-map", "[out]",
+    *video_inputs,
+    *audio_inputs,
+    "-filter_complex", filter_complex,
+    "-map", "[vout]",
+    "-map", "[aout]",
+    "-t", str(TOTAL_DURATION),
+    # Hardware encoder (VideoToolbox/NVENC/QSV) when one works on this machine;
+    # otherwise libx264 veryfast - the title card repeats and the clips are
+    # short, so medium's extra motion search buys little
+    *h264_encoder_args(preset="veryfast", crf=23, hw_bitrate="8M"),
+    "-pix_fmt", "yuv420p",
+    "-movflags", "+faststart",  # moov atom up front, so the file plays while downloading
     "-c:a", "aac",
     "-b:a", "256k",
     "-ar", "48000",
     "-y",
-    "/tmp/audio_final.m4a"
-]
-
-result = subprocess.run(audio_mix_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Audio mixed with ducking")
-else:
-    print(f"  ❌ Audio mix failed: {result.stderr[-500:]}")
-    exit(1)
-
-# Step 5: Loop video to match audio duration (27 seconds)
-print("\n5. Extending video to match audio duration...")
-
-video_extend_cmd = [
-    "ffmpeg",
-    "-stream_loop", "-1",  # Loop indefinitely
-    "-i", "/tmp/video_concat.mp4",
-    "-t", "27",
-    "-c:v", "libx264",
-    "-preset", "medium",
-    "-crf", "23",
-    "-pix_fmt", "yuv420p",
-    "-y",
-    "/tmp/video_extended.mp4"
-]
-
-result = subprocess.run(video_extend_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Video extended to 27 seconds")
-else:
-    print(f"  ❌ Video extend failed: {result.stderr[-500:]}")
-    exit(1)
-
-# Step 6: Combine video and audio
-print("\n6. Combining video and audio...")
-
-final_output = f"/tmp/final_complete_video_{timestamp}.mp4"
-
-combine_cmd = [
-    "ffmpeg",
-    "-i", "/tmp/video_extended.mp4",
-    "-i", "/tmp/audio_final.m4a",
-    "-c:v", "copy",
-    "-c:a", "copy",
-    "-map", "0:v:0",
-    "-map", "1:a:0",
-    "-y",
     final_output
 ]
 
-result = subprocess.run(combine_cmd, capture_output=True, text=True)
-if result.returncode == 0:
-    print("  ✅ Final video created!")
-    print(f"\n📁 Output: {final_output}")
+try:
+    run_ff(render_cmd)
+except FFmpegError as e:
+    print(f"  ❌ Render failed: {e.stderr[-500:]}")
+    exit(1)
 
-    # Get final specs
-    probe_cmd = ["ffprobe", "-v", "error", "-show_entries",
-                 "format=duration:stream=width,height", "-of", "default=noprint_wrappers=1",
-                 final_output]
-    probe_result = subprocess.run(probe_cmd, capture_output=True, text=True)
-    print(f"\n✅ Video specs:\n{probe_result.stdout}")
+print("  ✅ Final video created!")
+print(f"\n📁 Output: {final_output}")
 
-else:
-    print(f"  ❌ Combine failed: {result.stderr[-500:]}")
-    exit(1)
+# Get final specs
+probe_cmd = ["ffprobe", "-v", "error", "-show_entries",
+             "format=duration:stream=width,height", "-of", "default=noprint_wrappers=1",
+             final_output]
+# Only stdout is captured; with -v error, stderr just passes any error through
+probe_result = subprocess.run(probe_cmd, stdout=subprocess.PIPE, text=True)
+print(f"\n✅ Video specs:\n{probe_result.stdout}")
 
 print("\n" + "="*80)
 print("✅ COMPLETE VIDEO READY!")
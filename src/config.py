@@ -3,9 +3,10 @@ Configuration settings for the video generation system.
 Loads and validates all environment variables.
 """
 
-from pydantic import field_validator
+from functools import lru_cache
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Any, Optional
 
 
 class Settings(BaseSettings):
@@ -63,6 +64,21 @@ class Settings(BaseSettings):
     claude_model: str = "claude-sonnet-4-5-20250929"
     claude_temperature: float = 0.9  # High creativity for video prompts
     claude_max_tokens: int = 4000
+    use_generative_title_card: bool = False  # Imagen 4 title card instead of the local FFmpeg render
+
+    # Cache Settings
+    redis_url: Optional[str] = None  # Falls back to an in-process cache when unset
+    workflow_cache_ttl: int = 3600   # Same-day re-triggers reuse the generated video
+    trending_topics_cache_ttl: int = 60
+    llm_cache_enabled: bool = False  # Reuse identical Claude/Imagen responses from ~/.lenilani/llm_cache.db (dev re-runs)
+    llm_cache_ttl_days: int = 7
+    tts_cache_enabled: bool = False  # Reuse identical voiceovers from ~/.lenilani/tts_cache
+
+    # API Throttling (proactive, per provider - stays under the plan's limits instead of hitting 429s)
+    anthropic_rpm: int = 50          # Requests per minute
+    elevenlabs_rpm: int = 60
+    elevenlabs_max_concurrency: int = 2  # Concurrent requests allowed by the ElevenLabs plan
+    google_rpm: int = 10             # Veo + Imagen
 
     # Company Info
     company_name: str = "LeniLani Consulting"
@@ -71,18 +87,24 @@ class Settings(BaseSettings):
     company_phone: str = "(808) 555-0123"  # Update with real number
     company_email: str = "hello@lenilani.com"
 
-    @field_validator('*', mode='before')
+    @model_validator(mode='before')
     @classmethod
-    def strip_strings(cls, v):
-        """Strip whitespace from all string values."""
-        if isinstance(v, str):
-            return v.strip()
-        return v
+    def strip_strings(cls, data: Any) -> Any:
+        """Strip whitespace from all string values (one pass over the raw input)."""
+        if isinstance(data, dict):
+            return {k: v.strip() if isinstance(v, str) else v for k, v in data.items()}
+        return data
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the settings, loading them from the environment on first use only."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -3,15 +3,146 @@ Claude AI client service using Anthropic API.
 Handles all AI-powered content generation.
 """
 
-from anthropic import Anthropic
-from typing import Dict, Any, Optional, List
+from anthropic import AsyncAnthropic
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple
+import ast
 import logging
 import json
 import re
 from ..config import settings
+from ..utils.cache import response_cache
+from ..utils.rate_limit import api_limiters
+from .llm_cache import llm_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used without it
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Strict JSON parser for well-formed responses (orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so callers catch the same exception)
+_loads_strict = orjson.loads if orjson is not None else json.loads
+
+# Compiled once: runs over every Claude response
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*\n?(.*?)\n?```', re.DOTALL)
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def _find_json_span(text: str) -> Optional[str]:
+    """
+    Find the first balanced {...} or [...] in text with one linear scan.
+
+    Brackets inside JSON strings (and escaped quotes) are ignored.
+
+    Args:
+        text: Text that may contain a JSON object or array
+
+    Returns:
+        The balanced span, or None if there is none
+    """
+    start = min((i for i in (text.find('{'), text.find('[')) if i != -1), default=-1)
+    if start == -1:
+        return None
+
+    expected = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            expected.append(_CLOSERS[char])
+        elif char in '}]':
+            if char != expected.pop():
+                return None
+            if not expected:
+                return text[start:i + 1]
+    return None
+
+
+class _JsonFieldScanner:
+    """
+    Incremental scanner over a streamed JSON object.
+
+    Reports each top-level string field as soon as its closing quote
+    arrives, so callers can act on it before the rest of the object has
+    been generated. Text outside the object (e.g. a ```json fence) is
+    skipped.
+    """
+
+    def __init__(self):
+        """Initialize the scanner."""
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._after_colon = False
+        self._started = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Scan the next chunk of the stream.
+
+        Args:
+            chunk: Text delta
+
+        Returns:
+            (key, value) pairs of the top-level string fields completed by this chunk
+        """
+        self.text += chunk
+        text = self.text
+        fields = []
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        try:
+                            value = json.loads(text[self._string_start:i + 1], strict=False)
+                        except json.JSONDecodeError:
+                            continue
+                        if self._after_colon:
+                            fields.append((self._key, value))
+                            self._after_colon = False
+                        else:
+                            self._key = value
+            elif self._depth == 0:
+                if char == '{' and not self._started:
+                    self._depth = 1
+                    self._started = True
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+            elif self._depth == 1 and char == ':':
+                self._after_colon = True
+            elif self._depth == 1 and char == ',':
+                self._after_colon = False
+        self._pos = len(text)
+        return fields
+
 
 def extract_json_from_response(response_text: str) -> Any:
     """
@@ -23,25 +154,18 @@ def extract_json_from_response(response_text: str) -> Any:
     Returns:
         Parsed JSON object
     """
-    import ast
-
     # Try to find JSON in markdown code blocks
-    json_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', response_text, re.DOTALL)
+    json_match = _JSON_BLOCK_RE.search(response_text)
     if json_match:
         json_str = json_match.group(1).strip()
     else:
-        # If no code block, try to find JSON object/array
-        json_match = re.search(r'(\{.*\}|\[.*\])', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1).strip()
-        else:
-            # Last resort: use the whole response
-            json_str = response_text.strip()
+        # If no code block, find the first JSON object/array (last resort: the whole response)
+        json_str = _find_json_span(response_text) or response_text.strip()
 
     # Try multiple parsing strategies
-    # 1. Direct json.loads
+    # 1. Direct strict parse (orjson when installed)
     try:
-        return json.loads(json_str)
+        return _loads_strict(json_str)
     except json.JSONDecodeError as e:
         logger.warning(f"Direct JSON parsing failed: {e}")
 
@@ -60,12 +184,67 @@ def extract_json_from_response(response_text: str) -> Any:
         raise ValueError(f"Could not parse JSON from Claude response: {str(e)}")
 
 
+# System prompts are module constants so every call sends byte-identical text,
+# which Anthropic's prompt cache can reuse (cache_system=True)
+TRENDING_TOPICS_SYSTEM_PROMPT = """You are a viral video content researcher and strategist. Your task is to identify
+current trending topics in technology and business that would make compelling, viral-worthy short-form video
+content (30 seconds). Focus on topics that:
+1. Are visually interesting and cinematic
+2. Have emotional appeal or wow-factor
+3. Are relevant for Hawaii businesses
+4. Can be explained quickly with strong storytelling
+5. Relate to practical business applications"""
+
+
+SELECT_TOPIC_SYSTEM_PROMPT = """You are a viral video content strategist for LeniLani Consulting, a Hawaii-based
+technology consulting firm. Select the most compelling video topic that:
+1. Has strong visual storytelling potential
+2. Aligns with LeniLani's services
+3. Will resonate with Hawaii businesses
+4. Can create emotional impact in 30 seconds"""
+
+
+VIDEO_PROMPTS_SYSTEM_PROMPT = f"""You are a Hollywood cinematographer and viral video creator specializing in
+cinematic short-form content. Create HIGHLY DETAILED, CINEMATIC prompts for Google Veo 3 video generation.
+
+CRITICAL REQUIREMENTS FOR CINEMATIC QUALITY:
+- Every prompt must specify camera movements (dolly, tracking, crane, orbit, etc.)
+- Include lighting details (golden hour, rim lighting, volumetric, etc.)
+- Specify exact camera angles and framing (wide establishing, close-up, over-shoulder, etc.)
+- Add atmospheric elements (lens flares, depth of field, motion blur, etc.)
+- Use Hollywood terminology and cinematic language
+- Each shot should build tension and emotional engagement
+- Think in terms of visual storytelling, not just description
+
+For Hawaii/tropical settings:
+- Leverage natural beauty (ocean, palm trees, mountains, beaches)
+- Use local business settings authentically
+- Incorporate island lifestyle and culture
+- Golden hour lighting over the Pacific
+- Vibrant tropical colors
+
+STORY STRUCTURE for 3 clips (24 seconds total):
+Clip 1 (8 sec): THE HOOK - Establish the problem/opportunity with stunning visuals
+Clip 2 (8 sec): THE SOLUTION - Show the transformation/possibility in action
+Clip 3 (8 sec): THE PAYOFF - Deliver emotional impact and hint at CTA
+
+Format: 16:9 widescreen landscape video for YouTube (high quality cinematic production)
+
+Company: {settings.company_name}
+Website: {settings.company_website}
+Tagline: {settings.company_tagline}"""
+
+
+TITLE_CARD_SYSTEM_PROMPT = """You are a professional graphic designer specializing in social media title cards.
+Create detailed prompts for Google Imagen 4 to generate beautiful, professional title cards for video endings."""
+
+
 class ClaudeService:
     """Service for interacting with Claude AI for video generation."""
 
     def __init__(self):
         """Initialize Claude client."""
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
         self.model = settings.claude_model
         self.temperature = settings.claude_temperature
         self.max_tokens = settings.claude_max_tokens
@@ -75,7 +254,8 @@ class ClaudeService:
         system_prompt: str,
         user_prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        cache_system: bool = False
     ) -> str:
         """
         Generate content using Claude.
@@ -85,33 +265,222 @@ class ClaudeService:
             user_prompt: User message/prompt
             temperature: Temperature override (default from settings)
             max_tokens: Max tokens override (default from settings)
+            cache_system: Mark the system prompt for Anthropic prompt caching.
+                Only useful for a static system prompt (no topic, dates etc.)
+                that is reused across calls.
 
         Returns:
             Generated text content
         """
-        try:
-            response = self.client.messages.create(
+        temperature = temperature or self.temperature
+        max_tokens = max_tokens or self.max_tokens
+
+        cache_key = None
+        if settings.llm_cache_enabled:
+            cache_key = llm_cache.make_key(
                 model=self.model,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature or self.temperature,
-                system=system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
             )
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached Claude response ({len(cached)} chars)")
+                return cached
+
+        system = system_prompt
+        if cache_system:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+        try:
+            # Async client: concurrent calls (asyncio.gather) overlap on the event loop
+            async with api_limiters["anthropic"]:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ]
+                )
 
             # Extract text from response
             content = response.content[0].text if response.content else ""
 
             logger.info(f"Generated content ({len(content)} chars)")
+            if cache_system:
+                logger.info(
+                    f"Prompt cache: {getattr(response.usage, 'cache_read_input_tokens', 0) or 0} tokens read, "
+                    f"{getattr(response.usage, 'cache_creation_input_tokens', 0) or 0} tokens written"
+                )
+            if cache_key and content:
+                llm_cache.set(cache_key, content)
             return content
         except Exception as e:
             logger.error(f"Error generating content with Claude: {e}")
             raise
 
+    async def stream_content(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache_system: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Generate content using Claude, yielding the text as it is produced.
+
+        Same arguments (and llm_cache entries) as generate_content; a cached
+        response is yielded as a single chunk.
+
+        Args:
+            system_prompt: System instructions for Claude
+            user_prompt: User message/prompt
+            temperature: Temperature override (default from settings)
+            max_tokens: Max tokens override (default from settings)
+            cache_system: Mark the system prompt for Anthropic prompt caching
+
+        Yields:
+            Text deltas
+        """
+        temperature = temperature or self.temperature
+        max_tokens = max_tokens or self.max_tokens
+
+        cache_key = None
+        if settings.llm_cache_enabled:
+            cache_key = llm_cache.make_key(
+                model=self.model,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached Claude response ({len(cached)} chars)")
+                yield cached
+                return
+
+        system = system_prompt
+        if cache_system:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+        parts = []
+        try:
+            async with api_limiters["anthropic"]:
+                async with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ]
+                ) as stream:
+                    async for text in stream.text_stream:
+                        parts.append(text)
+                        yield text
+        except Exception as e:
+            logger.error(f"Error streaming content from Claude: {e}")
+            raise
+
+        content = "".join(parts)
+        logger.info(f"Streamed content ({len(content)} chars)")
+        if cache_key and content:
+            llm_cache.set(cache_key, content)
+
+    async def generate_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tool_name: str,
+        input_schema: Dict[str, Any],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache_system: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON object matching a schema, using forced tool use.
+
+        Claude must "call" the given tool, so the result is the tool input:
+        already-parsed JSON, with no extract_json_from_response round-trip.
+
+        Args:
+            system_prompt: System instructions for Claude
+            user_prompt: User message/prompt
+            tool_name: Name of the (virtual) tool, e.g. "emit_captions"
+            input_schema: JSON schema of the object to produce
+            temperature: Temperature override (default from settings)
+            max_tokens: Max tokens override (default from settings)
+            cache_system: Mark the system prompt for Anthropic prompt caching
+
+        Returns:
+            The generated object
+        """
+        temperature = temperature or self.temperature
+        max_tokens = max_tokens or self.max_tokens
+
+        cache_key = None
+        if settings.llm_cache_enabled:
+            cache_key = llm_cache.make_key(
+                model=self.model,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                tool_name=tool_name,
+                input_schema=input_schema,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached Claude {tool_name} output")
+                return json.loads(cached)
+
+        system = system_prompt
+        if cache_system:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+        try:
+            async with api_limiters["anthropic"]:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system,
+                    tools=[{"name": tool_name, "input_schema": input_schema}],
+                    tool_choice={"type": "tool", "name": tool_name},
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ]
+                )
+
+            result = next((block.input for block in response.content if block.type == "tool_use"), None)
+            if result is None:
+                # e.g. truncated at max_tokens before the tool call was emitted
+                raise ValueError(
+                    f"Claude returned no {tool_name} tool call (stop_reason: {response.stop_reason})"
+                )
+
+            logger.info(f"Generated {tool_name} output ({len(result)} fields)")
+            if cache_key:
+                llm_cache.set(cache_key, json.dumps(result))
+            return result
+        except Exception as e:
+            logger.error(f"Error generating structured content with Claude: {e}")
+            raise
+
     async def research_trending_topics(self, focus_area: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Research current trending topics suitable for viral video content.
@@ -122,16 +491,13 @@ class ClaudeService:
         Returns:
             List of trending topics with video potential
         """
-        try:
-            system_prompt = """You are a viral video content researcher and strategist. Your task is to identify
-current trending topics in technology and business that would make compelling, viral-worthy short-form video
-content (30 seconds). Focus on topics that:
-1. Are visually interesting and cinematic
-2. Have emotional appeal or wow-factor
-3. Are relevant for Hawaii businesses
-4. Can be explained quickly with strong storytelling
-5. Relate to practical business applications"""
+        cache_key = response_cache.make_key("trending_topics", focus_area)
+        cached_topics = await response_cache.get(cache_key)
+        if cached_topics is not None:
+            logger.info(f"Using {len(cached_topics)} cached trending video topics")
+            return cached_topics
 
+        try:
             focus_text = f" with a focus on {focus_area}" if focus_area else ""
             user_prompt = f"""Research and list 5-10 trending topics{focus_text} that would make excellent
 30-second viral video content for Hawaii businesses. For each topic, provide:
@@ -143,14 +509,16 @@ content (30 seconds). Focus on topics that:
 Return as a JSON array of objects with keys: title, description, visual_appeal, hawaii_relevance"""
 
             response_text = await self.generate_content(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt
+                system_prompt=TRENDING_TOPICS_SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                cache_system=True
             )
 
             # Parse JSON response
             topics = extract_json_from_response(response_text)
 
             logger.info(f"Researched {len(topics)} trending video topics")
+            await response_cache.set(cache_key, topics, settings.trending_topics_cache_ttl)
             return topics
         except Exception as e:
             logger.error(f"Error researching trending topics: {e}")
@@ -179,13 +547,6 @@ Return as a JSON array of objects with keys: title, description, visual_appeal,
 
             services_text = "\n".join([f"- {service}" for service in services])
 
-            system_prompt = """You are a viral video content strategist for LeniLani Consulting, a Hawaii-based
-technology consulting firm. Select the most compelling video topic that:
-1. Has strong visual storytelling potential
-2. Aligns with LeniLani's services
-3. Will resonate with Hawaii businesses
-4. Can create emotional impact in 30 seconds"""
-
             user_prompt = f"""Given these LeniLani services:
 {services_text}
 
@@ -201,8 +562,9 @@ Select the best topic for a 30-second viral video and explain:
 Return as JSON with keys: selected_topic, service_alignment, storytelling_approach, emotional_beats, cta"""
 
             response_text = await self.generate_content(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt
+                system_prompt=SELECT_TOPIC_SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                cache_system=True
             )
 
             # Parse JSON response
@@ -214,61 +576,18 @@ Return as JSON with keys: selected_topic, service_alignment, storytelling_approa
             logger.error(f"Error selecting video topic: {e}")
             raise
 
-    async def generate_video_prompts(
-        self,
+    @staticmethod
+    def _video_prompts_user_prompt(
         topic: str,
         service_focus: str,
         storytelling_approach: str,
         emotional_beats: List[str],
         cta: str
-    ) -> Dict[str, Any]:
-        """
-        Generate cinematic, Hollywood-style prompts for 3 video clips that tell a cohesive story.
-
-        Args:
-            topic: The video topic
-            service_focus: LeniLani service to focus on
-            storytelling_approach: How to tell the story
-            emotional_beats: Emotional moments to hit
-            cta: Call to action
-
-        Returns:
-            Dict with 3 clip prompts, title card text, and viral captions
-        """
-        try:
-            beats_text = "\n".join([f"- {beat}" for beat in emotional_beats])
-
-            system_prompt = f"""You are a Hollywood cinematographer and viral video creator specializing in
-cinematic short-form content. Create HIGHLY DETAILED, CINEMATIC prompts for Google Veo 3 video generation.
-
-CRITICAL REQUIREMENTS FOR CINEMATIC QUALITY:
-- Every prompt must specify camera movements (dolly, tracking, crane, orbit, etc.)
-- Include lighting details (golden hour, rim lighting, volumetric, etc.)
-- Specify exact camera angles and framing (wide establishing, close-up, over-shoulder, etc.)
-- Add atmospheric elements (lens flares, depth of field, motion blur, etc.)
-- Use Hollywood terminology and cinematic language
-- Each shot should build tension and emotional engagement
-- Think in terms of visual storytelling, not just description
-
-For Hawaii/tropical settings:
-- Leverage natural beauty (ocean, palm trees, mountains, beaches)
-- Use local business settings authentically
-- Incorporate island lifestyle and culture
-- Golden hour lighting over the Pacific
-- Vibrant tropical colors
-
-STORY STRUCTURE for 3 clips (24 seconds total):
-Clip 1 (8 sec): THE HOOK - Establish the problem/opportunity with stunning visuals
-Clip 2 (8 sec): THE SOLUTION - Show the transformation/possibility in action
-Clip 3 (8 sec): THE PAYOFF - Deliver emotional impact and hint at CTA
-
-Format: 16:9 widescreen landscape video for YouTube (high quality cinematic production)
-
-Company: {settings.company_name}
-Website: {settings.company_website}
-Tagline: {settings.company_tagline}"""
+    ) -> str:
+        """Build the generate_video_prompts user prompt."""
+        beats_text = "\n".join([f"- {beat}" for beat in emotional_beats])
 
-            user_prompt = f"""Create a 3-clip cinematic video about: {topic}
+        return f"""Create a 3-clip cinematic video about: {topic}
 
 Service Focus: {service_focus}
 Storytelling Approach: {storytelling_approach}
@@ -307,11 +626,38 @@ Return as JSON with keys:
 - title_card_design (visual description and text content with company info: {settings.company_name}, {settings.company_website}, {settings.company_phone}, {settings.company_email})
 - captions (object with keys: instagram, tiktok, youtube, twitter - each optimized for viral potential with hooks, hashtags, emojis)"""
 
+    async def generate_video_prompts(
+        self,
+        topic: str,
+        service_focus: str,
+        storytelling_approach: str,
+        emotional_beats: List[str],
+        cta: str
+    ) -> Dict[str, Any]:
+        """
+        Generate cinematic, Hollywood-style prompts for 3 video clips that tell a cohesive story.
+
+        Args:
+            topic: The video topic
+            service_focus: LeniLani service to focus on
+            storytelling_approach: How to tell the story
+            emotional_beats: Emotional moments to hit
+            cta: Call to action
+
+        Returns:
+            Dict with 3 clip prompts, title card text, and viral captions
+        """
+        try:
+            user_prompt = self._video_prompts_user_prompt(
+                topic, service_focus, storytelling_approach, emotional_beats, cta
+            )
+
             response_text = await self.generate_content(
-                system_prompt=system_prompt,
+                system_prompt=VIDEO_PROMPTS_SYSTEM_PROMPT,
                 user_prompt=user_prompt,
                 temperature=0.9,  # High creativity for cinematic prompts
-                max_tokens=6000
+                max_tokens=6000,
+                cache_system=True
             )
 
             # Parse JSON response
@@ -322,6 +668,61 @@ Return as JSON with keys:
             logger.error(f"Error generating video prompts: {e}")
             raise
 
+    async def generate_video_prompts_streaming(
+        self,
+        topic: str,
+        service_focus: str,
+        storytelling_approach: str,
+        emotional_beats: List[str],
+        cta: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of generate_video_prompts.
+
+        Each top-level string field (clip_1_prompt, ...) is yielded as soon
+        as Claude has finished writing it, so the caller can start a Veo
+        clip while the remaining clips and the captions are still being
+        generated. Once the reply is complete, the fields not yielded yet
+        (e.g. the captions object) follow.
+
+        Args:
+            topic: The video topic
+            service_focus: LeniLani service to focus on
+            storytelling_approach: How to tell the story
+            emotional_beats: Emotional moments to hit
+            cta: Call to action
+
+        Yields:
+            (key, value) pairs that together make up the generate_video_prompts dict
+        """
+        user_prompt = self._video_prompts_user_prompt(
+            topic, service_focus, storytelling_approach, emotional_beats, cta
+        )
+
+        scanner = _JsonFieldScanner()
+        yielded = set()
+        async for chunk in self.stream_content(
+            system_prompt=VIDEO_PROMPTS_SYSTEM_PROMPT,
+            user_prompt=user_prompt,
+            temperature=0.9,  # High creativity for cinematic prompts
+            max_tokens=6000,
+            cache_system=True
+        ):
+            for key, value in scanner.feed(chunk):
+                if key not in yielded:
+                    yielded.add(key)
+                    yield key, value
+
+        try:
+            prompts = extract_json_from_response(scanner.text)
+        except Exception as e:
+            logger.error(f"Error generating video prompts: {e}")
+            raise
+        for key, value in prompts.items():
+            if key not in yielded:
+                yield key, value
+        logger.info("Generated cinematic video prompts for 3 clips")
+
     async def generate_title_card_prompt(self, topic: str, cta: str) -> str:
         """
         Generate an Imagen prompt for the title card with company info and CTA.
@@ -334,9 +735,6 @@ Return as JSON with keys:
             Image generation prompt for the title card
         """
         try:
-            system_prompt = """You are a professional graphic designer specializing in social media title cards.
-Create detailed prompts for Google Imagen 4 to generate beautiful, professional title cards for video endings."""
-
             user_prompt = f"""Create a title card image prompt for a video about: {topic}
 
 The title card should include space for:
@@ -356,9 +754,10 @@ Design requirements:
 Return ONLY the detailed image generation prompt (no explanations, just the prompt text)."""
 
             prompt = await self.generate_content(
-                system_prompt=system_prompt,
+                system_prompt=TITLE_CARD_SYSTEM_PROMPT,
                 user_prompt=user_prompt,
-                temperature=0.8
+                temperature=0.8,
+                cache_system=True
             )
 
             logger.info("Generated title card prompt")
@@ -4,13 +4,26 @@ Handles AI voiceover creation using ElevenLabs API.
 """
 
 from typing import Optional, Dict, Any
+from pathlib import Path
+import os
+import json
+import shutil
+import asyncio
+import hashlib
 import logging
 from elevenlabs import VoiceSettings
 from elevenlabs.client import ElevenLabs
 from ..config import settings
+from ..utils.rate_limit import api_limiters
 
 logger = logging.getLogger(__name__)
 
+# Longest clip the text-to-sound-effects endpoint will generate
+MAX_SOUND_EFFECT_SECONDS = 22.0
+
+# Synthesized speech, keyed by a hash of everything that determines it
+TTS_CACHE_DIR = Path.home() / ".lenilani" / "tts_cache"
+
 
 class ElevenLabsService:
     """Service for generating professional voiceovers using ElevenLabs AI."""
@@ -27,6 +40,90 @@ class ElevenLabsService:
             use_speaker_boost=True  # Enhance clarity
         )
 
+    @staticmethod
+    def _convert_to_file(convert, output_path: str, **kwargs) -> None:
+        """
+        Call a (synchronous) ElevenLabs convert endpoint and stream the audio to disk.
+
+        Callers run this in a thread so the request doesn't block the event loop.
+
+        Args:
+            convert: SDK convert method, e.g. client.text_to_speech.convert
+            output_path: Path to save the audio file
+            **kwargs: Arguments for the convert call
+        """
+        audio = convert(**kwargs)
+        with open(output_path, 'wb') as f:
+            # audio is an iterator of audio chunks
+            for chunk in audio:
+                if chunk:
+                    f.write(chunk)
+
+    async def text_to_speech_file(
+        self,
+        text: str,
+        output_path: str,
+        voice_id: str,
+        model_id: str,
+        stream: bool = False,
+        **options
+    ) -> bool:
+        """
+        Synthesize speech to a file, reusing an identical earlier synthesis if cached.
+
+        The cache is content-addressed (text, voice, model and options), so
+        every script that voices the same script with the same settings
+        shares one entry. Disabled unless TTS_CACHE_ENABLED=true.
+
+        Args:
+            text: Text to speak
+            output_path: Path to save the audio file
+            voice_id: ElevenLabs voice ID
+            model_id: ElevenLabs model ID
+            stream: Use the streaming endpoint (audio is written as it arrives)
+            **options: Further arguments for the endpoint (voice_settings,
+                output_format, optimize_streaming_latency, ...)
+
+        Returns:
+            True if the audio came from the cache
+        """
+        cache_path = None
+        if settings.tts_cache_enabled:
+            key_options = {
+                name: value.model_dump() if hasattr(value, "model_dump") else value
+                for name, value in options.items()
+            }
+            raw = json.dumps(
+                {"text": text, "voice_id": voice_id, "model_id": model_id, "options": key_options},
+                sort_keys=True, ensure_ascii=False, default=str
+            )
+            suffix = Path(output_path).suffix
+            cache_path = TTS_CACHE_DIR / f"{hashlib.sha256(raw.encode('utf-8')).hexdigest()}{suffix}"
+            if cache_path.exists():
+                logger.info(f"Reusing cached voiceover {cache_path.name}")
+                await asyncio.to_thread(shutil.copyfile, cache_path, output_path)
+                return True
+
+        endpoint = self.client.text_to_speech.stream if stream else self.client.text_to_speech.convert
+        async with api_limiters["elevenlabs"]:
+            await asyncio.to_thread(
+                self._convert_to_file,
+                endpoint,
+                output_path,
+                text=text,
+                voice_id=voice_id,
+                model_id=model_id,
+                **options
+            )
+
+        if cache_path is not None:
+            # Atomic, so a crash never leaves a truncated entry behind
+            TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            partial = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.part")
+            await asyncio.to_thread(shutil.copyfile, output_path, partial)
+            os.replace(partial, cache_path)
+        return False
+
     async def generate_voiceover(
         self,
         script: str,
@@ -56,22 +153,15 @@ class ElevenLabsService:
             logger.info(f"Generating voiceover for script ({len(script)} chars)...")
             logger.info(f"Using voice ID: {voice_id}")
 
-            # Generate audio using text-to-speech
-            audio = self.client.text_to_speech.convert(
+            # Generate audio using text-to-speech and save it to file
+            await self.text_to_speech_file(
+                script,
+                output_path,
                 voice_id=voice_id,
-                text=script,
                 model_id="eleven_multilingual_v2",  # Latest model with best quality
                 voice_settings=voice_settings or self.default_voice_settings
             )
 
-            # Save audio to file
-            logger.info(f"Saving voiceover to {output_path}")
-            with open(output_path, 'wb') as f:
-                # audio is an iterator of audio chunks
-                for chunk in audio:
-                    if chunk:
-                        f.write(chunk)
-
             logger.info(f"Voiceover generated successfully: {output_path}")
 
             return {
@@ -171,7 +261,7 @@ Return ONLY the script text (no stage directions, no explanations, just the word
     async def generate_background_music(
         self,
         prompt: str,
-        duration: int,
+        duration: float,
         output_path: str
     ) -> Dict[str, Any]:
         """
@@ -179,31 +269,38 @@ Return ONLY the script text (no stage directions, no explanations, just the word
 
         Args:
             prompt: Description of the desired music/sound
-            duration: Duration in seconds
+            duration: Duration in seconds (capped at MAX_SOUND_EFFECT_SECONDS)
             output_path: Path to save the audio file
 
         Returns:
-            Dict with success status and audio file path
+            Dict with success status, audio file path, the track's actual
+            duration and the requested_duration (larger when capped, in which
+            case the mix loops the track)
         """
+        requested_duration = duration
         try:
+            if duration > MAX_SOUND_EFFECT_SECONDS:
+                logger.warning(
+                    f"Requested {duration:.1f}s of music, capping at {MAX_SOUND_EFFECT_SECONDS:g}s"
+                )
+                duration = MAX_SOUND_EFFECT_SECONDS
+            duration = round(float(duration), 1)
+
             logger.info(f"Generating background music with ElevenLabs...")
             logger.info(f"Prompt: {prompt}")
             logger.info(f"Duration: {duration} seconds")
 
             # Use ElevenLabs sound effects generation for background music
             # This is their text-to-sound feature
-            audio = self.client.text_to_sound_effects.convert(
-                text=prompt,
-                duration_seconds=duration,
-                prompt_influence=0.5  # Balance between prompt and musicality
-            )
-
-            # Save audio to file
-            logger.info(f"Saving background music to {output_path}")
-            with open(output_path, 'wb') as f:
-                for chunk in audio:
-                    if chunk:
-                        f.write(chunk)
+            async with api_limiters["elevenlabs"]:
+                await asyncio.to_thread(
+                    self._convert_to_file,
+                    self.client.text_to_sound_effects.convert,
+                    output_path,
+                    text=prompt,
+                    duration_seconds=duration,
+                    prompt_influence=0.5  # Balance between prompt and musicality
+                )
 
             logger.info(f"Background music generated successfully: {output_path}")
 
@@ -212,6 +309,7 @@ Return ONLY the script text (no stage directions, no explanations, just the word
                 "audio_path": output_path,
                 "prompt": prompt,
                 "duration": duration,
+                "requested_duration": requested_duration,
                 "message": "Background music generated successfully"
             }
 
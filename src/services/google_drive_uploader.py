@@ -4,12 +4,50 @@ Uploads generated videos to a specific Google Drive folder.
 """
 
 from typing import Optional, Dict, Any
+import asyncio
 import logging
+import shutil
 from pathlib import Path
 import subprocess
 
 logger = logging.getLogger(__name__)
 
+# Copy granularity for uploads into the Drive sync folder
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def copy_resumable(src: Path, dst: Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> None:
+    """
+    Copy a file in chunks via a .part file, resuming an interrupted copy.
+
+    The Drive sync client only ever sees the finished file (the .part is
+    renamed into place), so it never starts uploading a half-written video.
+    A .part left by an earlier attempt is continued from where it stopped,
+    unless the source has been rewritten since.
+
+    Args:
+        src: File to copy
+        dst: Destination path
+        chunk_size: Bytes per read/write
+    """
+    partial = dst.with_name(dst.name + ".part")
+    offset = 0
+    if partial.exists():
+        part_stat, src_stat = partial.stat(), src.stat()
+        if part_stat.st_mtime >= src_stat.st_mtime and part_stat.st_size <= src_stat.st_size:
+            offset = part_stat.st_size
+            logger.info(f"Resuming upload of {dst.name} at {offset / 1024 / 1024:.1f} MB")
+
+    with open(src, "rb") as fin, open(partial, "r+b" if offset else "wb") as fout:
+        fin.seek(offset)
+        fout.seek(offset)
+        while chunk := fin.read(chunk_size):
+            fout.write(chunk)
+        fout.truncate()
+
+    shutil.copystat(src, partial)
+    partial.replace(dst)
+
 
 class GoogleDriveUploader:
     """Service for uploading videos to Google Drive."""
@@ -64,7 +102,6 @@ class GoogleDriveUploader:
             if not drive_path:
                 logger.warning("Google Drive folder not found locally - saving to /tmp")
                 # Fallback: just copy to a local folder
-                import shutil
                 output_dir = Path("/tmp/ai_generated_videos")
                 output_dir.mkdir(exist_ok=True)
 
@@ -72,7 +109,7 @@ class GoogleDriveUploader:
                 safe_filename = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
                 output_path = output_dir / f"{safe_filename}.mp4"
 
-                shutil.copy(video_path, output_path)
+                await asyncio.to_thread(shutil.copy, video_path, output_path)
 
                 return {
                     "success": True,
@@ -99,17 +136,15 @@ class GoogleDriveUploader:
             safe_filename = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
             output_path = target_folder / f"{safe_filename}.mp4"
 
-            # Copy video to Google Drive folder
-            import shutil
-            shutil.copy(video_path, output_path)
-
-            logger.info(f"Video uploaded to Google Drive: {output_path}")
-
-            # Write description to a text file if provided
+            # Copy video to Google Drive folder and write the description
+            # (if provided) alongside it, off the event loop and concurrently
+            copies = [asyncio.to_thread(copy_resumable, Path(video_path), output_path)]
             if description:
                 desc_path = target_folder / f"{safe_filename}_description.txt"
-                with open(desc_path, 'w') as f:
-                    f.write(description)
+                copies.append(asyncio.to_thread(desc_path.write_text, description))
+            await asyncio.gather(*copies)
+
+            logger.info(f"Video uploaded to Google Drive: {output_path}")
 
             return {
                 "success": True,
@@ -128,6 +163,27 @@ class GoogleDriveUploader:
                 "message": f"Google Drive upload failed: {str(e)}"
             }
 
+    @staticmethod
+    async def write_description(uploaded_path: str, description: str) -> str:
+        """
+        Write a description next to an already uploaded video.
+
+        Lets a caller start the (slow) video copy before its description is
+        ready, and attach the description once it is.
+
+        Args:
+            uploaded_path: The "path" returned by upload_video
+            description: Description text
+
+        Returns:
+            Path of the description file
+        """
+        video = Path(uploaded_path)
+        desc_path = video.with_name(f"{video.stem}_description.txt")
+        await asyncio.to_thread(desc_path.write_text, description)
+        logger.info(f"Description written: {desc_path}")
+        return str(desc_path)
+
 
 # Global instance
 google_drive_uploader = GoogleDriveUploader()
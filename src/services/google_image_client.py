@@ -8,6 +8,8 @@ import logging
 import base64
 import httpx
 from ..config import settings
+from ..utils.rate_limit import api_limiters
+from .llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,20 @@ class GoogleImageService:
         self.region = settings.google_region
         self.base_url = f"https://{self.region}-aiplatform.googleapis.com/v1"
 
+    @staticmethod
+    def _image_result(image_bytes: bytes, output_path: Optional[str]) -> dict:
+        """Save generated image bytes (if a path is given) and build the success result."""
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(image_bytes)
+            logger.info(f"Saved generated image to {output_path}")
+
+        return {
+            "success": True,
+            "image_data": image_bytes,
+            "output_path": output_path
+        }
+
     async def generate_image(
         self,
         prompt: str,
@@ -41,7 +57,8 @@ class GoogleImageService:
             logger.info(f"Generating image with Google Imagen 4: {prompt[:100]}...")
 
             # Use Google Generative AI API with correct endpoint
-            endpoint = "https://generativelanguage.googleapis.com/v1beta/models/imagen-4.0-generate-001:predict"
+            model = "imagen-4.0-generate-001"
+            endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:predict"
 
             headers = {
                 "Content-Type": "application/json",
@@ -62,8 +79,17 @@ class GoogleImageService:
                 }
             }
 
+            cache_key = None
+            if settings.llm_cache_enabled:
+                cache_key = llm_cache.make_key(model=model, prompt=prompt, parameters=payload["parameters"])
+                cached = llm_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Using cached Imagen image")
+                    return self._image_result(base64.b64decode(cached), output_path)
+
             async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(endpoint, json=payload, headers=headers)
+                async with api_limiters["google"]:
+                    response = await client.post(endpoint, json=payload, headers=headers)
 
                 # Log response for debugging
                 logger.info(f"Google Imagen API response status: {response.status_code}")
@@ -80,34 +106,12 @@ class GoogleImageService:
             if "predictions" in result and len(result["predictions"]) > 0:
                 prediction = result["predictions"][0]
 
-                # Image is returned as base64
-                if "bytesBase64Encoded" in prediction:
-                    image_bytes = base64.b64decode(prediction["bytesBase64Encoded"])
-
-                    if output_path:
-                        with open(output_path, "wb") as f:
-                            f.write(image_bytes)
-                        logger.info(f"Saved generated image to {output_path}")
-
-                    return {
-                        "success": True,
-                        "image_data": image_bytes,
-                        "output_path": output_path
-                    }
-                elif "image" in prediction:
-                    # Alternative response format
-                    image_bytes = base64.b64decode(prediction["image"])
-
-                    if output_path:
-                        with open(output_path, "wb") as f:
-                            f.write(image_bytes)
-                        logger.info(f"Saved generated image to {output_path}")
-
-                    return {
-                        "success": True,
-                        "image_data": image_bytes,
-                        "output_path": output_path
-                    }
+                # Image is returned as base64 (field name depends on the response format)
+                encoded = prediction.get("bytesBase64Encoded") or prediction.get("image")
+                if encoded:
+                    if cache_key:
+                        llm_cache.set(cache_key, encoded)
+                    return self._image_result(base64.b64decode(encoded), output_path)
 
             raise Exception("No image data in response")
 
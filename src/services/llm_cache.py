@@ -0,0 +1,129 @@
+"""
+On-disk cache for Claude responses.
+Lets development scripts re-run with identical prompts without paying for
+(or waiting on) the same completion again. Disabled unless LLM_CACHE_ENABLED=true.
+Recent entries are also kept in an in-process LRU, so repeated prompts within
+one process don't touch SQLite at all.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path.home() / ".lenilani" / "llm_cache.db"
+
+
+class LLMCache:
+    """SQLite-backed response cache keyed by a SHA-256 of the request, with an in-memory LRU in front."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, ttl_days: int = 7, memory_entries: int = 1024):
+        """
+        Initialize the cache (the database is opened on first use).
+
+        Args:
+            db_path: SQLite database file
+            ttl_days: Entries older than this are ignored
+            memory_entries: Size of the in-memory LRU
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 86400
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "hash TEXT PRIMARY KEY, response TEXT, created_at INTEGER)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """
+        Hash everything that determines a completion.
+
+        Args:
+            **request: Request fields (model, prompts, temperature, ...)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        raw = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached response text, or None on a miss
+        """
+        expired_before = time.time() - self.ttl_seconds
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, response = entry
+            if created_at >= expired_before:
+                self._memory.move_to_end(key)
+                return response
+            del self._memory[key]
+
+        try:
+            row = self._connect().execute(
+                "SELECT response, created_at FROM cache WHERE hash = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+        if row is None or row[1] < expired_before:
+            return None
+        self._remember(key, row[1], row[0])
+        return row[0]
+
+    def _remember(self, key: str, created_at: int, response: str) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Key from make_key
+            value: Response text
+        """
+        created_at = int(time.time())
+        self._remember(key, created_at, value)
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (hash, response, created_at) VALUES (?, ?, ?)",
+                (key, value, created_at)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+
+# Global instance
+llm_cache = LLMCache(ttl_days=settings.llm_cache_ttl_days)
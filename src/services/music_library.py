@@ -9,6 +9,8 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, List
 
+from ..utils.ffmpeg_runner import run_ff
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,20 +72,18 @@ class MusicLibraryService:
             logger.error(f"Error getting audio duration: {e}")
             return 0.0
 
-    def select_random_segment(
-        self,
-        output_path: str = "/tmp/music_segment.mp3",
-        segment_duration: int = 30
-    ) -> Dict[str, Any]:
+    def select_random_start(self, segment_duration: int = 30) -> Dict[str, Any]:
         """
-        Randomly select a music file and extract a random 30-second segment.
+        Randomly select a music file and a random start time, without extracting anything.
+
+        Lets a caller seek into the source file directly (input-side -ss) in
+        its own ffmpeg run instead of paying for an intermediate segment file.
 
         Args:
-            output_path: Where to save the extracted segment
             segment_duration: Length of segment in seconds (default 30)
 
         Returns:
-            Dict with success status, file path, and metadata
+            Dict with success status, source path, and metadata
         """
         try:
             # Get all available music files
@@ -108,34 +108,72 @@ class MusicLibraryService:
             max_start = max(0, duration - segment_duration)
             start_time = random.uniform(0, max_start)
 
+            return {
+                "success": True,
+                "path": str(selected_file),
+                "source_file": selected_file.name,
+                "start_time": start_time,
+                "duration": segment_duration,
+                "source_duration": duration
+            }
+
+        except Exception as e:
+            logger.error(f"Error selecting music segment: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def select_random_segment(
+        self,
+        output_path: str = "/tmp/music_segment.mp3",
+        segment_duration: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Randomly select a music file and extract a random 30-second segment.
+
+        Args:
+            output_path: Where to save the extracted segment
+            segment_duration: Length of segment in seconds (default 30)
+
+        Returns:
+            Dict with success status, file path, and metadata
+        """
+        selection = self.select_random_start(segment_duration)
+        if not selection["success"]:
+            return selection
+
+        try:
+            start_time = selection["start_time"]
             logger.info(f"Extracting {segment_duration}s segment starting at {start_time:.2f}s")
 
-            # Extract segment using ffmpeg
-            subprocess.run(
+            # Seek on the input side, so nothing before the segment is decoded.
+            # MP3 into MP3 is a stream copy (cut at the nearest ~26ms frame);
+            # only WAV sources need encoding
+            if Path(selection["path"]).suffix.lower() == Path(output_path).suffix.lower() == '.mp3':
+                codec_args = ['-c:a', 'copy', '-avoid_negative_ts', 'make_zero']
+            else:
+                codec_args = [
+                    '-c:a', 'libmp3lame',  # Convert to MP3
+                    '-b:a', '192k'  # High quality audio
+                ]
+
+            # Extract segment using ffmpeg (quiet; stderr is only kept for errors)
+            run_ff(
                 [
                     'ffmpeg',
-                    '-i', str(selected_file),
-                    '-ss', str(start_time),
+                    '-ss', f"{start_time:.3f}",
+                    '-i', selection["path"],
                     '-t', str(segment_duration),
-                    '-c:a', 'libmp3lame',  # Convert to MP3
-                    '-b:a', '192k',  # High quality audio
+                    *codec_args,
                     '-y',
                     output_path
-                ],
-                capture_output=True,
-                check=True
+                ]
             )
 
             logger.info(f"Music segment saved to {output_path}")
 
-            return {
-                "success": True,
-                "path": output_path,
-                "source_file": selected_file.name,
-                "start_time": start_time,
-                "duration": segment_duration,
-                "source_duration": duration
-            }
+            return {**selection, "path": output_path}
 
         except Exception as e:
             logger.error(f"Error selecting music segment: {e}", exc_info=True)
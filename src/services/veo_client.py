@@ -3,7 +3,7 @@ Google Veo 3 video generation client service.
 Handles AI video generation using Google's Veo 3 via Gemini API.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Awaitable, List
 import logging
 import asyncio
 import time
@@ -11,6 +11,7 @@ import os
 from pathlib import Path
 from google import genai
 from ..config import settings
+from ..utils.rate_limit import api_limiters, rate_limit_info
 
 logger = logging.getLogger(__name__)
 
@@ -66,10 +67,14 @@ class Veo3Service:
                 format_desc = "widescreen landscape format" if aspect_ratio == "16:9" else "vertical portrait format"
                 enhanced_prompt = f"{prompt}\n\nIMPORTANT: Generate in {aspect_ratio} aspect ratio ({format_desc}). High quality, cinematic production value."
 
-                operation = self.client.models.generate_videos(
-                    model="veo-3.0-generate-preview",
-                    prompt=enhanced_prompt
-                )
+                # The SDK call is synchronous; run it in a thread so starting a
+                # clip doesn't stall the event loop (e.g. a streaming Claude reply)
+                async with api_limiters["google"]:
+                    operation = await asyncio.to_thread(
+                        self.client.models.generate_videos,
+                        model="veo-3.0-generate-preview",
+                        prompt=enhanced_prompt
+                    )
 
                 logger.info(f"Video generation operation started: {operation.name}")
 
@@ -163,6 +168,17 @@ class Veo3Service:
                         raise Exception("No video in operation response")
 
             except Exception as e:
+                rate_limit = rate_limit_info(e)
+                if rate_limit:
+                    # Quota errors won't clear within this method's short
+                    # backoff; hand them to the caller's rate-limit pacing
+                    logger.warning(f"Veo rate limited: {e}")
+                    return {
+                        "success": False,
+                        "error": str(e),
+                        "rate_limit": rate_limit,
+                        "message": "Video generation rate limited"
+                    }
                 if attempt < max_retries - 1:
                     logger.warning(f"Error on attempt {attempt + 1}: {e}")
                     last_error = e
@@ -198,21 +214,37 @@ class Veo3Service:
         Returns:
             Dict with list of clip paths and success status
         """
-        try:
-            logger.info(f"Generating {len(clip_prompts)} video clips in parallel...")
-
-            tasks = []
-            for i, prompt in enumerate(clip_prompts):
-                output_path = f"{output_dir}/clip_{i+1}.mp4"
-                task = self.generate_video_clip(
-                    prompt=prompt,
-                    duration=settings.clip_duration,
-                    output_path=output_path
-                )
-                tasks.append(task)
+        logger.info(f"Generating {len(clip_prompts)} video clips in parallel...")
+
+        tasks = []
+        for i, prompt in enumerate(clip_prompts):
+            output_path = f"{output_dir}/clip_{i+1}.mp4"
+            task = self.generate_video_clip(
+                prompt=prompt,
+                duration=settings.clip_duration,
+                output_path=output_path
+            )
+            tasks.append(task)
+
+        return await self.gather_clips(tasks)
+
+    async def gather_clips(self, clip_jobs: List[Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Wait for clips started with generate_video_clip and combine their results.
+
+        Lets a caller start each clip as soon as its prompt is known (e.g.
+        while Claude is still writing the others) and still get
+        generate_multi_clip_video's result.
+
+        Args:
+            clip_jobs: generate_video_clip coroutines or tasks, in clip order
 
+        Returns:
+            Dict with list of clip paths and success status
+        """
+        try:
             # Generate all clips in parallel
-            results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*clip_jobs)
 
             # Check if all succeeded
             clip_paths = []
@@ -224,6 +256,7 @@ class Veo3Service:
                     return {
                         "success": False,
                         "error": f"Clip {i+1} generation failed",
+                        "rate_limit": result.get("rate_limit"),
                         "message": result.get("message")
                     }
 
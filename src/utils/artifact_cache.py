@@ -0,0 +1,91 @@
+"""
+Per-topic store of generated artifacts (prompts, clips, audio, title card).
+Lets a retried workflow reuse everything an earlier attempt already paid for
+instead of regenerating it. With no root directory every lookup misses and
+nothing is stored, so callers don't need to special-case "caching off".
+"""
+
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the workflow's prompts/output change so old artifacts are not reused
+ARTIFACT_VERSION = "v1"
+
+
+class ArtifactCache:
+    """Directory of named artifacts for one (topic, category) pair."""
+
+    def __init__(self, root: Optional[str], *key_parts: Optional[str]):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache root directory (None disables caching)
+            *key_parts: Values identifying the run, e.g. topic and category
+        """
+        self.dir: Optional[Path] = None
+        if root:
+            raw = "|".join([*(part or "" for part in key_parts), ARTIFACT_VERSION])
+            self.dir = Path(root) / hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+            self.dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Look up a cached file.
+
+        Args:
+            name: Artifact name, e.g. "voiceover.mp3"
+
+        Returns:
+            Path of the cached file, or None on a miss
+        """
+        if self.dir is None:
+            return None
+        path = self.dir / name
+        if path.exists():
+            logger.info(f"Reusing cached {name}")
+            return str(path)
+        return None
+
+    async def put(self, src_path: str, name: str) -> str:
+        """
+        Store a generated file (copied atomically, so a crash never leaves a partial artifact).
+
+        Args:
+            src_path: Generated file
+            name: Artifact name
+
+        Returns:
+            Path to use from now on (the cached copy, or src_path if caching is off)
+        """
+        if self.dir is None:
+            return src_path
+        path = self.dir / name
+        partial = path.with_name(f"{name}.part")
+        await asyncio.to_thread(shutil.copyfile, src_path, partial)
+        os.replace(partial, path)
+        return str(path)
+
+    def get_json(self, name: str) -> Optional[Any]:
+        """Load a cached JSON artifact, or None on a miss."""
+        path = self.get(name)
+        if path is None:
+            return None
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+
+    def put_json(self, name: str, value: Any) -> None:
+        """Store a JSON-serializable artifact."""
+        if self.dir is None:
+            return
+        path = self.dir / name
+        partial = path.with_name(f"{name}.part")
+        partial.write_text(json.dumps(value), encoding="utf-8")
+        os.replace(partial, path)
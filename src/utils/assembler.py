@@ -0,0 +1,400 @@
+"""
+Single-pass portrait video assembly.
+Describes an intro card + text-overlaid clips + outro card + audio mix as
+dataclasses and renders them with ONE ffmpeg filter graph.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import hashlib
+import logging
+import tempfile
+import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .ffmpeg_runner import h264_encoder_args, run_ff_async
+
+logger = logging.getLogger(__name__)
+
+IMPACT = "/System/Library/Fonts/Supplemental/Impact.ttf"
+ARIAL_BOLD = "/System/Library/Fonts/Supplemental/Arial Bold.ttf"
+ARIAL = "/System/Library/Fonts/Supplemental/Arial.ttf"
+
+PORTRAIT_SIZE = "1080x1920"
+FPS = 30
+
+# Scale/crop any input to fill the portrait frame (a no-op for 1080x1920 inputs)
+FILL_PORTRAIT = "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920"
+
+# Rendered card stills, shared by every assembly that uses the same card
+CARD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "lenilani_cards")
+
+# Raw .pcm audio is ElevenLabs' pcm_48000 output: headerless 16-bit mono at 48 kHz
+PCM_INPUT_ARGS = ["-f", "s16le", "-ar", "48000", "-ac", "1"]
+
+# drawtext text files, named by content hash (tiny, never pruned)
+TEXT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "lenilani_text")
+
+
+def missing_fonts() -> List[str]:
+    """
+    List the drawtext font files that don't exist on this machine.
+
+    The font paths are macOS system fonts; checking them up front lets a
+    script fail before it spends API budget on a render that cannot succeed.
+
+    Returns:
+        Paths of the missing fonts (empty if all are present)
+    """
+    return [font for font in (IMPACT, ARIAL_BOLD, ARIAL) if not os.path.exists(font)]
+
+
+@lru_cache(maxsize=None)
+def latest_tmp_file(prefix: str, suffix: str = ".mp3") -> Optional[str]:
+    """
+    Find the most recently written /tmp file with a given prefix.
+
+    Memoized, so presets built in the same process share one directory scan
+    per prefix and agree on the file they pick.
+
+    Args:
+        prefix: File name prefix, e.g. "voiceover_"
+        suffix: File name suffix
+
+    Returns:
+        Path of the newest match, or None if there is none
+    """
+    matches = list(Path("/tmp").glob(f"{prefix}*{suffix}"))
+    if not matches:
+        return None
+    return str(max(matches, key=lambda p: p.stat().st_mtime))
+
+
+@dataclass
+class TextLayer:
+    """One centered drawtext line."""
+    text: str
+    y: int
+    color: str = "white"
+    size: int = 90
+    font: str = IMPACT
+    border: int = 0
+    box: bool = False
+
+    def textfile(self) -> str:
+        """
+        Write the text to a file named by its content hash (once) and return the path.
+
+        drawtext reads it with expansion=none, so apostrophes, colons, percent
+        signs and backslashes in generated copy need no filter escaping.
+        """
+        digest = hashlib.sha1(self.text.encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(TEXT_CACHE_DIR, f"text_{digest}.txt")
+        if not os.path.exists(path):
+            os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+            fd, partial_path = tempfile.mkstemp(suffix=".txt", dir=TEXT_CACHE_DIR)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.text)
+            os.replace(partial_path, path)
+        return path
+
+    def render_filter(self) -> str:
+        """Render this layer as a drawtext filter."""
+        drawtext = (
+            f"drawtext=fontfile={self.font}:textfile={self.textfile()}:expansion=none:"
+            f"fontcolor={self.color}:fontsize={self.size}:x=(w-text_w)/2:y={self.y}"
+        )
+        if self.border:
+            drawtext += f":borderw={self.border}:bordercolor=black"
+        if self.box:
+            drawtext += ":box=1:boxcolor=black@0.6:boxborderw=20"
+        return drawtext
+
+
+@dataclass
+class BoxLayer:
+    """A filled rectangle (gradient band, accent line) drawn on a card."""
+    x: int
+    y: int
+    w: int
+    h: int
+    color: str
+
+    def render_filter(self) -> str:
+        """Render this layer as a drawbox filter."""
+        return f"drawbox=x={self.x}:y={self.y}:w={self.w}:h={self.h}:color={self.color}:t=fill"
+
+
+@dataclass
+class ClipSpec:
+    """A video clip with an Instagram-style two-line headline."""
+    path: str
+    lines: List[Tuple[str, str]]  # (text, color) per line
+    duration: float = 8.0
+
+    def render_filter(self) -> str:
+        """Render the headline as a drawtext chain."""
+        return ",".join(
+            TextLayer(text=text, y=200 + i * 120, color=color, border=5, box=True).render_filter()
+            for i, (text, color) in enumerate(self.lines)
+        )
+
+
+@dataclass
+class CardSpec:
+    """An intro/outro card: a pre-rendered video, or a solid color with box/text layers."""
+    duration: float
+    path: Optional[str] = None
+    color: str = "#0077BE"
+    layers: List[Union[BoxLayer, TextLayer]] = field(default_factory=list)
+
+    def still_path(self) -> str:
+        """Cache path of this card rendered as a single PNG, keyed by its content."""
+        content = "|".join([self.color, *(layer.render_filter() for layer in self.layers)])
+        return f"{CARD_CACHE_DIR}/card_{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}.png"
+
+    def input_args(self) -> List[str]:
+        """FFmpeg input arguments for this card."""
+        if self.path:
+            return ["-i", self.path]
+        # A single image; source_filter repeats it (see there)
+        return ["-i", self.still_path()]
+
+    def source_filter(self, hold: float = 0.0) -> str:
+        """
+        Filter that turns a color card's still into `duration` seconds of video.
+
+        The PNG is decoded once and its frame repeated in the graph, instead of
+        re-running the color source and layers (or, with -loop 1, re-decoding
+        the PNG) for every frame.
+
+        Args:
+            hold: Extra seconds to show the card for (e.g. to cover trailing audio)
+        """
+        if self.path:
+            return ""
+        frames = max(1, round((self.duration + hold) * FPS))
+        return f"loop=loop={frames - 1}:size=1:start=0,setpts=N/{FPS}/TB"
+
+    def render_filter(self) -> str:
+        """Render the text layers of a pre-rendered video card as a drawtext chain."""
+        if not self.path:
+            return ""  # Already baked into the still
+        return ",".join(layer.render_filter() for layer in self.layers)
+
+
+async def render_card_still(card: CardSpec) -> None:
+    """
+    Render a color card to its cached PNG (once per distinct card).
+
+    Args:
+        card: Card to render; cards backed by a video file are skipped
+    """
+    if card.path:
+        return
+
+    still_path = card.still_path()
+    if os.path.exists(still_path):
+        return
+
+    os.makedirs(CARD_CACHE_DIR, exist_ok=True)
+    # Unique per call, so concurrent renders (even of the same card) never share a partial file
+    fd, partial_path = tempfile.mkstemp(suffix=".png", prefix=f"{Path(still_path).stem}.", dir=CARD_CACHE_DIR)
+    os.close(fd)
+    cmd = ["ffmpeg", "-f", "lavfi", "-i", f"color=c={card.color}:s={PORTRAIT_SIZE}:d=1"]
+    if card.layers:
+        cmd += ["-vf", ",".join(layer.render_filter() for layer in card.layers)]
+    cmd += ["-frames:v", "1", "-y", partial_path]
+
+    await run_ff_async(cmd)
+    # Atomic, so a concurrent run never reads a half-written PNG
+    os.replace(partial_path, still_path)
+    prune_card_cache()
+
+
+def prune_card_cache(max_entries: int = 100) -> None:
+    """
+    Evict the least recently used files from the card cache.
+
+    Args:
+        max_entries: Number of cached cards to keep
+    """
+    try:
+        entries = sorted(Path(CARD_CACHE_DIR).iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return
+
+    for stale in entries[max_entries:]:
+        stale.unlink(missing_ok=True)
+
+
+@dataclass
+class AudioSpec:
+    """Voiceover + background music mix."""
+    voiceover_path: str  # Any audio file, or raw pcm_48000 if it ends in .pcm
+    music_path: str
+    voiceover_volume: float = 1.5
+    music_volume: float = 0.2
+    music_start: float = 0.0  # Seek into the music file (input-side, so nothing before it is decoded)
+    normalize: bool = True  # False sums the two tracks at their set volumes
+    loop_music: bool = False
+    fade_out: bool = False
+
+
+@dataclass
+class AssembleSpec:
+    """Everything needed to render one finished video."""
+    intro: CardSpec
+    clips: List[ClipSpec]
+    outro: CardSpec
+    output_path: str
+    audio: Optional[AudioSpec] = None
+    duration: Optional[float] = None  # Defaults to the length of all parts
+    fade_out_s: float = 3.0
+    hw_encode: bool = True  # Use VideoToolbox/NVENC/QSV when available
+    hw_bitrate: str = "6M"  # Target bitrate for a hardware encoder
+
+    @property
+    def content_duration(self) -> float:
+        """Length of intro + clips + outro."""
+        return self.intro.duration + sum(clip.duration for clip in self.clips) + self.outro.duration
+
+
+def build_command(spec: AssembleSpec) -> List[str]:
+    """
+    Build the single ffmpeg command for an assembly spec.
+
+    Text overlays, cards, concat, fade-out and the audio mix all live in one
+    filter graph, so each clip is decoded and encoded exactly once.
+
+    Args:
+        spec: Assembly description
+
+    Returns:
+        FFmpeg argument list
+    """
+    total = spec.duration or spec.content_duration
+    # Hold the outro's last frame if the audio runs past the video parts
+    outro_pad = max(0.0, total - spec.content_duration)
+
+    inputs = spec.intro.input_args()
+    for clip in spec.clips:
+        inputs += ["-i", clip.path]
+    inputs += spec.outro.input_args()
+
+    filter_parts = []
+    segment_labels = []
+
+    def add_segment(index: int, label: str, drawtext: str, extra: str = "", source: str = ""):
+        # A card's source (frame repeat) goes after the scale/crop, so a still is scaled once
+        chain = f"[{index}:v]{FILL_PORTRAIT},{source + ',' if source else ''}fps={FPS},setsar=1"
+        if drawtext:
+            # Rasterize the text ONCE onto a single transparent frame and
+            # overlay it for the whole segment (eof_action=repeat), instead
+            # of re-running drawtext/FreeType on every frame
+            filter_parts.append(
+                f"color=c=black@0.0:s={PORTRAIT_SIZE}:r=1:d=1,format=rgba,{drawtext}[{label}_text]"
+            )
+            filter_parts.append(f"{chain}[{label}_base]")
+            chain = f"[{label}_base][{label}_text]overlay=eof_action=repeat"
+        if extra:
+            chain += f",{extra}"
+        filter_parts.append(f"{chain}[{label}]")
+        segment_labels.append(f"[{label}]")
+
+    add_segment(0, "intro", spec.intro.render_filter(), source=spec.intro.source_filter())
+    for i, clip in enumerate(spec.clips, start=1):
+        add_segment(i, f"c{i}", clip.render_filter())
+
+    # The fade-out sits inside the outro, so only that segment is faded. A
+    # still card is simply repeated for longer; a video card holds its last frame
+    outro_length = spec.outro.duration + outro_pad
+    outro_extra = []
+    if outro_pad and spec.outro.path:
+        outro_extra.append(f"tpad=stop_mode=clone:stop_duration={outro_pad:g}")
+    outro_extra.append(f"fade=t=out:st={max(0.0, outro_length - spec.fade_out_s):g}:d={spec.fade_out_s:g}")
+    outro_index = len(spec.clips) + 1
+    add_segment(outro_index, "outro", spec.outro.render_filter(), ",".join(outro_extra),
+                source=spec.outro.source_filter(hold=outro_pad))
+
+    filter_parts.append(f"{''.join(segment_labels)}concat=n={len(segment_labels)}:v=1:a=0[vout]")
+
+    maps = ["-map", "[vout]"]
+    audio_args = []
+    if spec.audio:
+        vo_index = outro_index + 1
+        if spec.audio.voiceover_path.endswith(".pcm"):
+            inputs += PCM_INPUT_ARGS
+        inputs += ["-i", spec.audio.voiceover_path]
+        if spec.audio.loop_music:
+            inputs += ["-stream_loop", "-1"]
+        if spec.audio.music_start:
+            inputs += ["-ss", f"{spec.audio.music_start:.3f}"]
+        inputs += ["-i", spec.audio.music_path]
+
+        mix = "amix=inputs=2:duration=longest"
+        if not spec.audio.normalize:
+            mix += ":normalize=0"
+        if spec.audio.fade_out:
+            mix += f",afade=t=out:st={total - spec.fade_out_s:g}:d={spec.fade_out_s:g}"
+
+        filter_parts.append(
+            f"[{vo_index}:a]volume={spec.audio.voiceover_volume}[vo];"
+            f"[{vo_index + 1}:a]volume={spec.audio.music_volume}[music];"
+            f"[vo][music]{mix}[aout]"
+        )
+        maps += ["-map", "[aout]"]
+        audio_args = ["-c:a", "aac", "-b:a", "256k", "-ar", "48000"]
+
+    return [
+        "ffmpeg", *inputs,
+        "-filter_complex", ";".join(filter_parts),
+        *maps,
+        "-t", f"{total:g}",
+        *h264_encoder_args(hw_bitrate=spec.hw_bitrate, allow_hw=spec.hw_encode), "-pix_fmt", "yuv420p",
+        *audio_args,
+        "-y", spec.output_path
+    ]
+
+
+async def assemble(spec: AssembleSpec) -> str:
+    """
+    Render an assembly spec to its output file.
+
+    Args:
+        spec: Assembly description
+
+    Returns:
+        Path of the rendered video
+
+    Raises:
+        FFmpegError: If ffmpeg fails
+    """
+    logger.info(f"Assembling {len(spec.clips)} clips into {spec.output_path}")
+    await asyncio.gather(render_card_still(spec.intro), render_card_still(spec.outro))
+    await run_ff_async(build_command(spec), duration=spec.duration or spec.content_duration)
+    return spec.output_path
+
+
+def print_specs(path: str) -> None:
+    """Print a rendered video's dimensions and duration (spawns ffprobe)."""
+    probe = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries",
+         "stream=width,height:format=duration", "-of", "json", path],
+        capture_output=True, text=True
+    )
+    info = json.loads(probe.stdout or "{}")
+    stream = (info.get("streams") or [{}])[0]
+    duration = info.get("format", {}).get("duration", "?")
+    print(f"\n📊 Specs: {stream.get('width', '?')}x{stream.get('height', '?')}, {duration}s")
+
+
+def open_preview(path: str) -> None:
+    """Open a rendered video in the default player (macOS only, non-blocking)."""
+    if sys.platform == "darwin":
+        subprocess.Popen(["open", path])
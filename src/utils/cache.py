@@ -0,0 +1,112 @@
+"""
+TTL cache for expensive upstream lookups (Claude research, full workflow results).
+Uses Redis when REDIS_URL is configured so entries survive across serverless
+invocations; otherwise falls back to an in-process dictionary.
+"""
+
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Redis is optional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Async key/value cache with per-entry TTL."""
+
+    def __init__(self, redis_url: Optional[str] = None, prefix: str = "vg"):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL (in-memory cache if None)
+            prefix: Namespace prepended to every key
+        """
+        self.prefix = prefix
+        self._memory: Dict[str, Tuple[float, str]] = {}
+        self._redis = None
+
+        if redis_url:
+            if redis_asyncio is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed - using in-memory cache")
+            else:
+                self._redis = redis_asyncio.from_url(redis_url, decode_responses=True)
+
+    def make_key(self, *parts: Optional[str]) -> str:
+        """
+        Build a namespaced cache key from free-form parts.
+
+        Args:
+            *parts: Key components (None is treated as empty)
+
+        Returns:
+            Key of the form "<prefix>:<sha1 of parts>"
+        """
+        raw = "|".join((part or "").strip().lower() for part in parts)
+        return f"{self.prefix}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+                return json.loads(raw) if raw is not None else None
+            except Exception as e:
+                logger.warning(f"Redis GET failed for {key}: {e}")
+                return None
+
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+
+        expires_at, raw = entry
+        if expires_at < time.monotonic():
+            del self._memory[key]
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+        """
+        raw = json.dumps(value)
+
+        if self._redis is not None:
+            try:
+                await self._redis.setex(key, ttl, raw)
+            except Exception as e:
+                logger.warning(f"Redis SETEX failed for {key}: {e}")
+            return
+
+        now = time.monotonic()
+        # Drop expired entries that were never read again, so a long-lived
+        # (warm) process doesn't grow without bound
+        for stale in [k for k, (expires_at, _) in self._memory.items() if expires_at < now]:
+            del self._memory[stale]
+        self._memory[key] = (now + ttl, raw)
+
+
+# Global instance
+response_cache = ResponseCache(redis_url=settings.redis_url)
@@ -0,0 +1,107 @@
+"""
+Console output shared by the command-line scripts.
+Banners are built once at import, and summaries are rendered to a single
+string so each is written to stdout in one call.
+"""
+
+import textwrap
+from typing import Any, Dict, List
+
+BAR = "=" * 80
+
+# What every finished video gets, listed in the end-of-run summaries
+FEATURES = (
+    "Cinematic video generation (Veo 3)",
+    "AI-generated voiceover (ElevenLabs)",
+    "Custom background music (ElevenLabs)",
+    "Audio ducking (music lowers during speech)",
+    "Two-pass loudness normalization (-16 LUFS)",
+    "Music fade in/out",
+    "Peak limiting (broadcast-safe)",
+    "256kbps AAC @ 48kHz",
+)
+
+FEATURES_BANNER = "\n✨ Professional Features Applied:\n" + "\n".join(f"  ✅ {feature}" for feature in FEATURES)
+
+
+def intro_banner(title: str, steps: List[str], topic: str = "") -> str:
+    """
+    Render a script's start-of-run banner.
+
+    Args:
+        title: Banner heading
+        steps: Workflow steps, listed in order
+        topic: Optional topic line
+
+    Returns:
+        Banner text, ready for one sys.stdout.write
+    """
+    topic_line = f"Topic: {topic}\n\n" if topic else ""
+    step_lines = "\n".join(f"{i}. {step}" for i, step in enumerate(steps, start=1))
+    return textwrap.dedent("""
+        {bar}
+        {title}
+        {bar}
+
+        {topic_line}This will:
+        {steps}
+
+        {bar}
+
+    """).format(bar=BAR, title=title, topic_line=topic_line, steps=step_lines)
+
+
+def format_summary(result: Dict[str, Any], duration: float) -> str:
+    """
+    Render the end-of-run summary of a generate_and_publish result.
+
+    Args:
+        result: Workflow result dict
+        duration: Wall-clock generation time in seconds
+
+    Returns:
+        Summary text, ready for one sys.stdout.write
+    """
+    lines = ["", BAR]
+    if result.get("success"):
+        lines += [
+            "✅ VIDEO GENERATION COMPLETE!",
+            BAR,
+            f"\nTopic: {result.get('topic')}",
+            f"Service Focus: {result.get('service_focus')}",
+            f"\nGeneration Time: {duration:.1f} seconds ({duration/60:.1f} minutes)",
+            f"\nFinal Video: {result.get('final_video_path')}",
+        ]
+
+        if result.get('google_drive_url'):
+            lines.append(f"Google Drive: {result.get('google_drive_url')}")
+
+        lines += [
+            f"\nClips Generated: {len(result.get('clip_paths', []))}",
+            f"Title Card: {result.get('title_card_path')}",
+        ]
+
+        if result.get('captions'):
+            lines.append("\n--- Social Media Captions ---")
+            captions = result['captions']
+            if captions.get('instagram'):
+                lines.append(f"\nInstagram:\n{captions['instagram'][:150]}...")
+            if captions.get('tiktok'):
+                lines.append(f"\nTikTok:\n{captions['tiktok'][:150]}...")
+
+        if result.get('errors'):
+            lines.append(f"\n⚠️  Warnings: {len(result['errors'])}")
+            lines += [f"  - {error}" for error in result['errors']]
+
+        lines += [FEATURES_BANNER, ""]
+
+    else:
+        lines += [
+            "❌ VIDEO GENERATION FAILED",
+            BAR,
+            f"\nErrors: {result.get('errors', [])}",
+            f"Message: {result.get('message')}",
+        ]
+
+    lines += ["", BAR, "", ""]
+    return "\n".join(lines)
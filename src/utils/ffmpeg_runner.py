@@ -0,0 +1,319 @@
+"""
+Helpers for running ffmpeg as a subprocess.
+Keeps ffmpeg quiet on success and surfaces its error output on failure.
+"""
+
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import logging
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only real errors reach stderr, so the pipe never fills with progress lines
+QUIET_ARGS = ["-nostats", "-hide_banner", "-loglevel", "error"]
+
+# Let drawtext/scale/overlay chains use every core (encoder threads already
+# default to auto); ffmpeg's filter defaults can leave cores idle
+_CPU_COUNT = str(os.cpu_count() or 1)
+FILTER_THREAD_ARGS = ["-filter_threads", _CPU_COUNT, "-filter_complex_threads", _CPU_COUNT]
+
+_OUT_TIME_RE = re.compile(rb"^out_time_ms=(\d+)")
+_PROGRESS_KEY_RE = re.compile(rb"^[a-z_0-9]+=\S*\s*$")
+
+# Hardware H.264 encoders that accept ordinary yuv420p frames, in order of preference
+HW_H264_ENCODERS = ["h264_videotoolbox", "h264_nvenc", "h264_qsv"]
+
+# Hardware decoder (-hwaccel) that lives on the same device as each encoder
+HW_DECODE_ACCELS = {"h264_videotoolbox": "videotoolbox", "h264_nvenc": "cuda"}
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Set by a caller (e.g. an API job) to receive progress from every
+# run_ff_async call made within its context
+progress_callback: ContextVar[Optional[ProgressCallback]] = ContextVar(
+    "ffmpeg_progress_callback", default=None
+)
+
+
+class FFmpegError(RuntimeError):
+    """Raised when an ffmpeg invocation exits with a non-zero status."""
+
+    def __init__(self, cmd: List[str], returncode: int, stderr: str):
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"ffmpeg exited with status {returncode}: {stderr[-4096:]}")
+
+
+def quiet(cmd: List[str]) -> List[str]:
+    """
+    Insert the quiet and threading global options right after the ffmpeg binary.
+
+    Args:
+        cmd: FFmpeg argument list starting with the binary
+
+    Returns:
+        New argument list with QUIET_ARGS and FILTER_THREAD_ARGS applied
+    """
+    return [cmd[0], *QUIET_ARGS, *FILTER_THREAD_ARGS, *cmd[1:]]
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder() -> Optional[str]:
+    """
+    Find a usable hardware H.264 encoder (checked once per process).
+
+    An encoder listed by `ffmpeg -encoders` may still lack the hardware it
+    needs, so each candidate is confirmed with a tiny test encode.
+
+    Returns:
+        Encoder name, or None if only software encoding is available
+    """
+    try:
+        listing = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    for encoder in HW_H264_ENCODERS:
+        if encoder not in listing:
+            continue
+        try:
+            probe = subprocess.run(
+                ["ffmpeg", *QUIET_ARGS, "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+                 "-c:v", encoder, "-f", "null", "-"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15
+            )
+        except subprocess.TimeoutExpired:
+            continue
+        if probe.returncode == 0:
+            logger.info(f"Using hardware H.264 encoder: {encoder}")
+            return encoder
+
+    return None
+
+
+def h264_encoder_args(
+    preset: str = "medium",
+    crf: int = 23,
+    tune: Optional[str] = None,
+    hw_bitrate: str = "6M",
+    allow_hw: bool = True
+) -> List[str]:
+    """
+    Video codec arguments for an H.264 encode.
+
+    Uses a hardware encoder when one is available; hardware encoders don't
+    support CRF, so they get a fixed bitrate instead.
+
+    Args:
+        preset: libx264 preset for the software fallback
+        crf: libx264 CRF for the software fallback
+        tune: Optional libx264 tune (e.g. "stillimage" for static cards)
+        hw_bitrate: Target bitrate for a hardware encoder
+        allow_hw: Set False to force libx264
+
+    Returns:
+        FFmpeg argument list starting with -c:v
+    """
+    encoder = detect_hw_encoder() if allow_hw else None
+    if encoder:
+        args = ["-c:v", encoder, "-b:v", hw_bitrate]
+        if encoder == "h264_nvenc":
+            args += ["-preset", "p5"]  # Slower/better of NVENC's presets, still far faster than x264
+        return args
+
+    args = ["-c:v", "libx264", "-preset", preset, "-crf", str(crf)]
+    if tune:
+        args += ["-tune", tune]
+    return args
+
+
+def hw_decode_args() -> List[str]:
+    """
+    Input options that decode a video on the hardware detect_hw_encoder found.
+
+    Place them before an input's -i. Decoded frames are downloaded to system
+    memory, so they still go through ordinary software filters, and ffmpeg
+    falls back to software decoding when the hwaccel can't handle a stream.
+
+    Returns:
+        ["-hwaccel", name], or an empty list when there is no matching hwaccel
+    """
+    accel = HW_DECODE_ACCELS.get(detect_hw_encoder())
+    return ["-hwaccel", accel] if accel else []
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """
+    Read a media file's duration with ffprobe.
+
+    Args:
+        path: Audio or video file
+
+    Returns:
+        Duration in seconds, or None if it can't be read
+    """
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", path],
+            capture_output=True, text=True, timeout=10
+        )
+        return float(result.stdout.strip())
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Could not read duration of {path}: {e}")
+        return None
+
+
+def run_ff(cmd: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg command, raising FFmpegError if it fails.
+
+    Args:
+        cmd: FFmpeg argument list starting with the binary
+        timeout: Optional timeout in seconds
+
+    Returns:
+        The completed process
+    """
+    cmd = quiet(cmd)
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=timeout
+    )
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        logger.error(f"FFmpeg error: {stderr}")
+        raise FFmpegError(cmd, result.returncode, stderr)
+
+    return result
+
+
+async def _read_stderr(
+    stream: asyncio.StreamReader,
+    callback: Optional[ProgressCallback],
+    output: str,
+    duration: Optional[float]
+) -> str:
+    """
+    Consume ffmpeg's stderr, forwarding -progress updates and keeping error lines.
+
+    Args:
+        stream: The process stderr
+        callback: Progress callback (None if progress is not being reported)
+        output: Output file name, passed through to the callback
+        duration: Expected output duration in seconds, for a percentage
+
+    Returns:
+        The non-progress stderr text
+    """
+    error_lines = deque(maxlen=200)
+
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+
+        if callback is not None:
+            match = _OUT_TIME_RE.match(line)
+            if match:
+                # Despite its name, out_time_ms is reported in microseconds
+                out_time_s = int(match.group(1)) / 1_000_000
+                percent = min(100.0, out_time_s / duration * 100) if duration else None
+                callback({"output": output, "out_time_s": round(out_time_s, 2), "percent": percent})
+                continue
+            if _PROGRESS_KEY_RE.match(line):
+                continue
+
+        error_lines.append(line.decode(errors="replace"))
+
+    return "".join(error_lines)
+
+
+async def _stop(process: asyncio.subprocess.Process, graceful: bool) -> None:
+    """Stop ffmpeg, letting it finalize the output first when graceful."""
+    if process.returncode is not None:
+        return
+
+    if graceful:
+        process.send_signal(signal.SIGINT)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+    process.kill()
+    await process.wait()
+
+
+async def run_ff_async(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    duration: Optional[float] = None
+) -> int:
+    """
+    Run an ffmpeg command without blocking the event loop.
+
+    If a progress callback is set in the current context (see
+    progress_callback), ffmpeg is run with -progress pipe:2 and each update
+    is forwarded to it.
+
+    Args:
+        cmd: FFmpeg argument list starting with the binary
+        timeout: Optional timeout in seconds
+        duration: Expected output duration in seconds (enables percentages)
+
+    Returns:
+        The process return code (always 0)
+
+    Raises:
+        FFmpegError: If ffmpeg exits with a non-zero status
+        subprocess.TimeoutExpired: If the timeout elapses (ffmpeg is killed)
+    """
+    callback = progress_callback.get()
+    output = Path(cmd[-1]).name
+    if callback is not None:
+        cmd = [cmd[0], "-progress", "pipe:2", *cmd[1:]]
+    cmd = quiet(cmd)
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    async def drive() -> str:
+        stderr = await _read_stderr(process.stderr, callback, output, duration)
+        await process.wait()
+        return stderr
+
+    try:
+        stderr = await asyncio.wait_for(drive(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await _stop(process, graceful=False)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except asyncio.CancelledError:
+        # SIGINT lets ffmpeg flush and close the output cleanly
+        await _stop(process, graceful=True)
+        raise
+
+    if process.returncode != 0:
+        logger.error(f"FFmpeg error: {stderr}")
+        raise FFmpegError(cmd, process.returncode, stderr)
+
+    return process.returncode
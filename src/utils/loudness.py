@@ -0,0 +1,106 @@
+"""
+Two-pass EBU R128 loudness normalization.
+A measurement pass runs the audio graph once with loudnorm in analysis mode;
+the real render then applies the measured values with linear=true, which is
+sample-accurate and needs no compressor afterwards.
+"""
+
+import re
+import json
+import asyncio
+import logging
+import subprocess
+from typing import Dict, List, Optional
+
+from .ffmpeg_runner import FILTER_THREAD_ARGS, FFmpegError
+
+logger = logging.getLogger(__name__)
+
+# Broadcast/social target used across the pipeline
+LOUDNORM_TARGET = "I=-16:TP=-1.5:LRA=11"
+
+_JSON_BLOCK_RE = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.DOTALL)
+
+
+def measure_loudness(
+    input_args: List[str],
+    filter_complex: str,
+    timeout: Optional[float] = 300
+) -> Dict[str, str]:
+    """
+    Run an audio graph through loudnorm's analysis pass.
+
+    Only the audio is decoded - video inputs are demuxed but never mapped.
+
+    Args:
+        input_args: FFmpeg input arguments (-i ..., -stream_loop ..., etc.)
+        filter_complex: Graph whose final output pad is the mix to measure
+            (no trailing label; loudnorm is appended)
+        timeout: Optional timeout in seconds
+
+    Returns:
+        loudnorm's measurement dict (input_i, input_tp, input_lra,
+        input_thresh, target_offset, ...)
+
+    Raises:
+        FFmpegError: If ffmpeg fails or prints no measurement
+    """
+    cmd = [
+        "ffmpeg", "-nostats", "-hide_banner", *FILTER_THREAD_ARGS,
+        *input_args,
+        "-filter_complex", f"{filter_complex},loudnorm={LOUDNORM_TARGET}:print_format=json[measured]",
+        "-map", "[measured]",
+        "-f", "null", "-"
+    ]
+    # loudnorm prints its report at info level, so this can't use quiet()
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise FFmpegError(cmd, result.returncode, result.stderr[-2000:])
+
+    matches = _JSON_BLOCK_RE.findall(result.stderr)
+    if not matches:
+        raise FFmpegError(cmd, result.returncode, "loudnorm printed no measurement")
+    return json.loads(matches[-1])
+
+
+def loudnorm_filter(measured: Dict[str, str]) -> str:
+    """
+    Build the second-pass loudnorm filter from a measurement.
+
+    Args:
+        measured: Output of measure_loudness
+
+    Returns:
+        loudnorm filter string in linear mode
+    """
+    return (
+        f"loudnorm={LOUDNORM_TARGET}:"
+        f"measured_I={measured['input_i']}:measured_TP={measured['input_tp']}:"
+        f"measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}:"
+        f"offset={measured['target_offset']}:linear=true"
+    )
+
+
+async def two_pass_loudnorm(input_args: List[str], filter_complex: str) -> str:
+    """
+    Measure an audio graph and return the loudnorm filter to apply to it.
+
+    Falls back to one-pass (dynamic) loudnorm if the measurement fails, so a
+    render never fails just because analysis did.
+
+    Args:
+        input_args: FFmpeg input arguments
+        filter_complex: Graph ending in the mix to normalize (see measure_loudness)
+
+    Returns:
+        loudnorm filter string
+    """
+    try:
+        measured = await asyncio.to_thread(measure_loudness, input_args, filter_complex)
+        second_pass = loudnorm_filter(measured)
+    except (FFmpegError, subprocess.TimeoutExpired, ValueError, KeyError) as e:
+        logger.warning(f"Loudness measurement failed, using one-pass loudnorm: {e}")
+        return f"loudnorm={LOUDNORM_TARGET}"
+
+    logger.info(f"Measured loudness: {measured['input_i']} LUFS, {measured['input_tp']} dBTP")
+    return second_pass
@@ -0,0 +1,195 @@
+"""
+Rate-limit detection, retry pacing and request throttling.
+Pulls structured rate-limit details (status code, Retry-After, remaining quota)
+out of Anthropic / ElevenLabs / Google SDK errors, turns them into retry
+delays with capped, jittered exponential backoff instead of a fixed sleep, and
+throttles outgoing requests per provider so we stay under their limits.
+"""
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Mapping, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_STATUSES = {"RESOURCE_EXHAUSTED", "RATE_LIMIT_EXCEEDED"}
+
+# Anthropic and OpenAI-style request quota headers
+REMAINING_HEADERS = {"anthropic-ratelimit-requests-remaining", "x-ratelimit-remaining-requests"}
+RESET_HEADERS = {"anthropic-ratelimit-requests-reset", "x-ratelimit-reset-requests"}
+
+
+def _seconds_until(value: str) -> Optional[float]:
+    """Parse a Retry-After / reset header (seconds, HTTP date or ISO 8601) into seconds from now."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    for parse in (parsedate_to_datetime, lambda v: datetime.fromisoformat(v.replace("Z", "+00:00"))):
+        try:
+            when = parse(value)
+        except (TypeError, ValueError):
+            continue
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, when.timestamp() - time.time())
+    return None
+
+
+def _headers_of(error: BaseException) -> Mapping[str, str]:
+    """Find the HTTP response headers on an SDK error, if it carries any."""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+    return headers or {}
+
+
+def rate_limit_info(error: BaseException) -> Optional[Dict[str, Any]]:
+    """
+    Extract rate-limit details from an API error.
+
+    Works by duck typing across the SDKs: Anthropic and ElevenLabs errors carry
+    status_code (and headers), google-genai errors carry code/status.
+
+    Args:
+        error: Exception raised by an API client
+
+    Returns:
+        Dict with status_code, retry_after (seconds or None) and remaining
+        (requests left, or None), or None if this is not a rate-limit error
+    """
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    status = str(getattr(error, "status", "") or "").upper()
+    if status_code != 429 and status not in RATE_LIMIT_STATUSES:
+        return None
+
+    headers = {key.lower(): value for key, value in _headers_of(error).items()}
+
+    retry_after = None
+    if "retry-after" in headers:
+        retry_after = _seconds_until(headers["retry-after"])
+
+    remaining = None
+    for key in REMAINING_HEADERS & headers.keys():
+        try:
+            remaining = int(headers[key])
+        except ValueError:
+            pass
+
+    if retry_after is None:
+        for key in RESET_HEADERS & headers.keys():
+            retry_after = _seconds_until(headers[key])
+
+    return {"status_code": 429, "retry_after": retry_after, "remaining": remaining}
+
+
+class ExponentialBackoff:
+    """
+    Capped exponential backoff with full jitter.
+
+    Each attempt's ceiling doubles (base * 2**attempt, capped) and the actual
+    delay is drawn uniformly below it, so concurrent workers don't retry in
+    lockstep. A provider's Retry-After is a floor: we never retry sooner.
+    """
+
+    def __init__(self, base: float = 30, cap: float = 3600):
+        """
+        Initialize the backoff.
+
+        Args:
+            base: Ceiling for the first retry, in seconds
+            cap: Largest ceiling, in seconds
+        """
+        self.base = base
+        self.cap = cap
+
+    def next_delay(self, attempt: int, rate_limit: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 for the first failure)
+            rate_limit: rate_limit_info of the failure, if it was rate limited
+
+        Returns:
+            Seconds to wait
+        """
+        ceiling = min(self.cap, self.base * 2 ** min(attempt - 1, 10))
+        delay = random.uniform(0, ceiling)
+        if rate_limit and rate_limit.get("retry_after") is not None:
+            delay = max(delay, rate_limit["retry_after"])
+        return delay
+
+
+class SlidingWindowLimiter:
+    """
+    Proactive request throttle: at most `limit` requests started in any
+    `window` seconds, and optionally at most `max_concurrency` in flight.
+
+    Used as an async context manager around each API call:
+
+        async with api_limiters["anthropic"]:
+            response = await client.messages.create(...)
+    """
+
+    def __init__(self, limit: int, window: float = 60.0, max_concurrency: Optional[int] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Requests allowed per window
+            window: Window length in seconds
+            max_concurrency: Requests allowed in flight at once (None for no cap)
+        """
+        self.limit = limit
+        self.window = window
+        self._started: Deque[float] = deque()
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _wait_for_slot(self) -> None:
+        """Wait until starting one more request keeps us within the window."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._started and now - self._started[0] >= self.window:
+                    self._started.popleft()
+                if len(self._started) < self.limit:
+                    self._started.append(now)
+                    return
+                wait = self._started[0] + self.window - now
+                logger.info(f"Throttling: {self.limit} requests per {self.window:g}s reached, waiting {wait:.1f}s")
+                await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> "SlidingWindowLimiter":
+        if self._in_flight:
+            await self._in_flight.acquire()
+        try:
+            await self._wait_for_slot()
+        except BaseException:
+            if self._in_flight:
+                self._in_flight.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._in_flight:
+            self._in_flight.release()
+
+
+# Global instances, one per provider (shared by every client of that provider)
+api_limiters: Dict[str, SlidingWindowLimiter] = {
+    "anthropic": SlidingWindowLimiter(settings.anthropic_rpm),
+    "elevenlabs": SlidingWindowLimiter(settings.elevenlabs_rpm, max_concurrency=settings.elevenlabs_max_concurrency),
+    "google": SlidingWindowLimiter(settings.google_rpm),
+}
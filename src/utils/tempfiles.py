@@ -0,0 +1,81 @@
+"""
+Scratch space for intermediate media files.
+Every intermediate of one run lives in a private temp directory that is
+removed on exit, so warm serverless instances don't accumulate files in /tmp.
+FilePool is the counterpart for local scripts: fixed-name slots that each run
+overwrites, so repeated runs never pile up timestamped files.
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TempFiles:
+    """Context manager handing out paths inside a per-run temp directory."""
+
+    def __init__(self, prefix: str = "lenilani_"):
+        """
+        Initialize the manager.
+
+        Args:
+            prefix: Prefix for the temp directory name
+        """
+        self.prefix = prefix
+        self.dir: Optional[str] = None
+
+    def __enter__(self) -> "TempFiles":
+        self.dir = tempfile.mkdtemp(prefix=self.prefix)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.dir:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            logger.debug(f"Removed temp directory {self.dir}")
+            self.dir = None
+
+    def path(self, name: str) -> str:
+        """
+        Get the path for an intermediate file.
+
+        Args:
+            name: File name, e.g. "clip_1_text.mp4"
+
+        Returns:
+            Absolute path inside the temp directory
+        """
+        if self.dir is None:
+            raise RuntimeError("TempFiles must be used as a context manager")
+        return f"{self.dir}/{name}"
+
+
+class FilePool:
+    """Fixed-name file slots reused (overwritten) by every run."""
+
+    def __init__(self, root: str = os.path.join(tempfile.gettempdir(), "lenilani_pool")):
+        """
+        Initialize the pool.
+
+        Args:
+            root: Directory holding the slots
+        """
+        self.root = root
+
+    def acquire(self, name: str) -> str:
+        """
+        Get the path of a slot.
+
+        Not safe for two concurrent runs - they would share the same slots.
+
+        Args:
+            name: Slot name, e.g. "voiceover.mp3"
+
+        Returns:
+            Absolute path of the slot (any previous content is overwritten by the caller)
+        """
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, name)
@@ -0,0 +1,80 @@
+"""
+Branded title card rendered locally with FFmpeg.
+Same gradient + typography as the modern intro card, with the video's topic
+as the headline - no generative image call needed.
+"""
+
+import os
+import logging
+import tempfile
+import textwrap
+from typing import List
+
+from .assembler import ARIAL, ARIAL_BOLD, IMPACT
+from .ffmpeg_runner import run_ff
+
+logger = logging.getLogger(__name__)
+
+HEADLINE_WIDTH = 16  # Characters per line at fontsize 110 on a 1080px card
+SUBTITLE_WIDTH = 30
+
+
+def _write_textfile(text: str) -> str:
+    """Write drawtext content to a temp file (no quoting/escaping needed)."""
+    fd, path = tempfile.mkstemp(suffix=".txt", prefix="title_card_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def render_title_card(topic: str, service_focus: str, output_path: str) -> str:
+    """
+    Render a 1080x1920 title card PNG.
+
+    Args:
+        topic: Video topic, used as the (wrapped) headline
+        service_focus: Service line shown under the headline
+        output_path: Where to write the PNG
+
+    Returns:
+        output_path
+
+    Raises:
+        FFmpegError: If ffmpeg fails
+    """
+    headline_lines = textwrap.wrap(topic.upper(), width=HEADLINE_WIDTH)[:5]
+    subtitle = "\n".join(textwrap.wrap(service_focus, width=SUBTITLE_WIDTH))
+
+    # Center the headline block around y=760
+    headline_y = 760 - len(headline_lines) * 65
+
+    textfiles: List[str] = [_write_textfile("\n".join(headline_lines)), _write_textfile(subtitle)]
+    try:
+        vf = (
+            # Gradient background
+            "drawbox=x=0:y=0:w=1080:h=640:color=#0A2E4D@1.0:t=fill,"
+            "drawbox=x=0:y=640:w=1080:h=640:color=#1B5E8C@0.9:t=fill,"
+            "drawbox=x=0:y=1280:w=1080:h=640:color=#2A9D8F@0.8:t=fill,"
+            # Headline
+            f"drawtext=fontfile={IMPACT}:textfile={textfiles[0]}:expansion=none:"
+            f"fontcolor=white:fontsize=110:line_spacing=20:x=(w-text_w)/2:y={headline_y},"
+            # Accent line
+            "drawbox=x=90:y=1100:w=900:h=8:color=white@0.8:t=fill,"
+            # Service focus
+            f"drawtext=fontfile={ARIAL_BOLD}:textfile={textfiles[1]}:expansion=none:"
+            "fontcolor=#FFD700:fontsize=56:line_spacing=12:x=(w-text_w)/2:y=1160,"
+            # Branding
+            f"drawtext=fontfile={ARIAL}:text='LeniLani Consulting':"
+            "fontcolor=white@0.9:fontsize=48:x=(w-text_w)/2:y=1700"
+        )
+        run_ff([
+            "ffmpeg", "-f", "lavfi", "-i", "color=c=#0A2E4D:s=1080x1920:d=1",
+            "-vf", vf,
+            "-frames:v", "1", "-y", output_path
+        ])
+    finally:
+        for path in textfiles:
+            os.remove(path)
+
+    logger.info(f"Title card rendered: {output_path}")
+    return output_path
@@ -3,11 +3,14 @@ Video composition utility using FFmpeg.
 Handles merging video clips, adding title cards, and creating the final video.
 """
 
+import asyncio
 import subprocess
 import logging
-from typing import List, Optional
+from typing import Awaitable, List, Optional, Tuple
 from pathlib import Path
 from ..config import settings
+from .ffmpeg_runner import FFmpegError, h264_encoder_args, probe_duration, quiet, run_ff_async
+from .loudness import two_pass_loudnorm
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,80 @@ logger = logging.getLogger(__name__)
 class VideoComposer:
     """Utility for composing final videos from clips and images."""
 
+    @staticmethod
+    async def _paths_exist(*paths: Optional[str]) -> List[bool]:
+        """Check which paths exist (None counts as missing), off the event loop."""
+        async def exists(path: Optional[str]) -> bool:
+            return bool(path) and await asyncio.to_thread(Path(path).exists)
+
+        return list(await asyncio.gather(*(exists(path) for path in paths)))
+
+    @staticmethod
+    def _concat_via_ts_pipe(clip_paths: List[str], output_path: str) -> None:
+        """
+        Concatenate clips by piping MPEG-TS remuxes into a single concat process.
+
+        Args:
+            clip_paths: List of paths to video clips (in order)
+            output_path: Path for the output video
+
+        Raises:
+            FFmpegError: If a remux or the concat fails
+            subprocess.TimeoutExpired: If a stage takes too long
+        """
+        # Concat process reads one MPEG-TS byte stream from stdin
+        cmd = quiet([
+            "ffmpeg",
+            "-f", "mpegts",
+            "-i", "pipe:0",
+            "-c", "copy",
+            "-bsf:a", "aac_adtstoasc",
+            "-y",  # Overwrite output file if exists
+            output_path
+        ])
+        concat_process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+        try:
+            # Remux each clip to MPEG-TS (stream copy, no re-encode) straight
+            # into the concat process. TS segments can be joined byte-for-byte,
+            # so nothing is written to disk between the two stages.
+            for clip_path in clip_paths:
+                remux_cmd = quiet([
+                    "ffmpeg",
+                    "-i", clip_path,
+                    "-c", "copy",
+                    "-bsf:v", "h264_mp4toannexb",
+                    "-f", "mpegts",
+                    "pipe:1"
+                ])
+                result = subprocess.run(
+                    remux_cmd,
+                    stdout=concat_process.stdin,
+                    stderr=subprocess.PIPE,
+                    timeout=120
+                )
+                if result.returncode != 0:
+                    stderr = result.stderr.decode(errors="replace")
+                    logger.error(f"FFmpeg error remuxing {clip_path}: {stderr}")
+                    raise FFmpegError(remux_cmd, result.returncode, stderr)
+
+            concat_process.stdin.close()
+            _, concat_stderr = concat_process.communicate(timeout=300)  # 5 minute timeout
+        except BaseException:
+            concat_process.kill()
+            concat_process.wait()
+            raise
+
+        if concat_process.returncode != 0:
+            stderr = concat_stderr.decode(errors="replace")
+            logger.error(f"FFmpeg error: {stderr}")
+            raise FFmpegError(cmd, concat_process.returncode, stderr)
+
     @staticmethod
     async def merge_clips(
         clip_paths: List[str],
@@ -40,50 +117,14 @@ class VideoComposer:
                 if not Path(clip_path).exists():
                     raise FileNotFoundError(f"Clip not found: {clip_path}")
 
-            # Create a concat file for FFmpeg
-            concat_file = "/tmp/concat_list.txt"
-            with open(concat_file, "w") as f:
-                for clip_path in clip_paths:
-                    f.write(f"file '{clip_path}'\n")
-
-            # FFmpeg command to concatenate videos
-            if include_transitions:
-                # With crossfade transitions (more complex)
-                # For now, use simple concatenation - transitions can be added later
-                cmd = [
-                    "ffmpeg",
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", concat_file,
-                    "-c", "copy",
-                    "-y",  # Overwrite output file if exists
-                    output_path
-                ]
-            else:
-                # Simple concatenation
-                cmd = [
-                    "ffmpeg",
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", concat_file,
-                    "-c", "copy",
-                    "-y",
-                    output_path
-                ]
-
-            # Run FFmpeg
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
+            # Transitions (include_transitions) are not implemented yet - simple concatenation.
+            # The pipe plumbing is blocking, so it runs in a worker thread.
+            try:
+                await asyncio.to_thread(VideoComposer._concat_via_ts_pipe, clip_paths, output_path)
+            except FFmpegError as e:
                 return {
                     "success": False,
-                    "error": f"FFmpeg failed: {result.stderr}",
+                    "error": f"FFmpeg failed: {e.stderr}",
                     "message": "Video merge failed"
                 }
 
@@ -148,32 +189,31 @@ class VideoComposer:
             if not Path(image_path).exists():
                 raise FileNotFoundError(f"Image not found: {image_path}")
 
-            # FFmpeg command to create video from image
+            # FFmpeg command to create video from image. The image is decoded
+            # and scaled ONCE; the loop filter repeats that frame for the
+            # whole duration (-loop 1 would re-decode and re-scale every frame)
+            frames = max(1, round(duration * 30))
             cmd = [
                 "ffmpeg",
-                "-loop", "1",  # Loop the image
                 "-i", image_path,
                 "-c:v", "libx264",  # H.264 codec
+                "-preset", "ultrafast",
+                "-tune", "stillimage",  # Static image: skip motion search
                 "-t", str(duration),  # Duration
                 "-pix_fmt", "yuv420p",
-                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+                       f"loop=loop={frames - 1}:size=1:start=0,setpts=N/30/TB",
                 "-r", "30",  # 30 fps
                 "-y",
                 output_path
             ]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
+            try:
+                await run_ff_async(cmd, timeout=60, duration=duration)
+            except FFmpegError as e:
                 return {
                     "success": False,
-                    "error": f"FFmpeg failed: {result.stderr}",
+                    "error": f"FFmpeg failed: {e.stderr}",
                     "message": "Image to video conversion failed"
                 }
 
@@ -253,18 +293,12 @@ class VideoComposer:
                 output_path
             ]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
+            try:
+                await run_ff_async(cmd, timeout=120)
+            except FFmpegError as e:
                 return {
                     "success": False,
-                    "error": f"FFmpeg failed: {result.stderr}",
+                    "error": f"FFmpeg failed: {e.stderr}",
                     "message": "Text overlay failed"
                 }
 
@@ -314,6 +348,25 @@ class VideoComposer:
             logger.warning(f"Could not check audio stream: {e}")
             return False
 
+    @staticmethod
+    def _probe_size(video_path: str) -> Optional[Tuple[int, int]]:
+        """Read a video's (width, height), or None if ffprobe can't."""
+        try:
+            cmd = [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=width,height",
+                "-of", "csv=p=0",
+                video_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            width, height = result.stdout.strip().split(",")[:2]
+            return int(width), int(height)
+        except Exception as e:
+            logger.warning(f"Could not read video size: {e}")
+            return None
+
     @staticmethod
     async def add_audio_to_video(
         video_path: str,
@@ -346,7 +399,7 @@ class VideoComposer:
         """
         try:
             # Check if video has audio
-            video_has_audio = VideoComposer._check_has_audio(video_path)
+            video_has_audio = await asyncio.to_thread(VideoComposer._check_has_audio, video_path)
 
             if not video_has_audio:
                 logger.info("Video has no audio stream (video-only), skipping video audio in mix")
@@ -394,10 +447,7 @@ class VideoComposer:
                         "[vo2][video_raw]sidechaincompress=threshold=0.04:ratio=3:attack=20:release=250:level_sc=1[video_ducked];"
 
                         # Mix all three audio streams (using vo3 for mix)
-                        "[vo3][music_ducked][video_ducked]amix=inputs=3:duration=first:dropout_transition=2:normalize=0[mixed];"
-
-                        # Final polish with loudnorm, compression, and limiting
-                        "[mixed]loudnorm=I=-16:TP=-1.5:LRA=11,acompressor=threshold=-20dB:ratio=3:attack=5:release=50:makeup=2dB,alimiter=limit=0.95:attack=5:release=50[out]"
+                        "[vo3][music_ducked][video_ducked]amix=inputs=3:duration=first:dropout_transition=2:normalize=0"
                     )
                 else:
                     # PROFESSIONAL 2-WAY MIX WITH DUCKING (voiceover + music only, no video audio)
@@ -414,60 +464,34 @@ class VideoComposer:
                         "[vo1][music_raw]sidechaincompress=threshold=0.03:ratio=4:attack=20:release=250:level_sc=1[music_ducked];"
 
                         # Mix voiceover and ducked music (using vo2 for mix)
-                        "[vo2][music_ducked]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[mixed];"
-
-                        # Final polish with loudnorm, compression, and limiting
-                        "[mixed]loudnorm=I=-16:TP=-1.5:LRA=11,acompressor=threshold=-20dB:ratio=3:attack=5:release=50:makeup=2dB,alimiter=limit=0.95:attack=5:release=50[out]"
+                        "[vo2][music_ducked]amix=inputs=2:duration=first:dropout_transition=2:normalize=0"
                     )
 
-                cmd = [
-                    "ffmpeg",
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-i", music_path,
-                    "-filter_complex", filter_complex,
-                    "-map", "0:v",      # Video from first input
-                    "-map", "[out]",    # Audio from filter
-                    "-c:v", "copy",     # Copy video without re-encoding
-                    "-c:a", "aac",      # High-quality AAC audio
-                    "-b:a", "256k",     # Higher bitrate for professional quality
-                    "-ar", "48000",     # 48kHz sample rate (broadcast standard)
-                    "-y",
-                    output_path
-                ]
+                # Music is looped, in case the track is shorter than the voiceover
+                # (ElevenLabs caps it); the voiceover/video decides where the mix ends
+                input_args = ["-i", video_path, "-i", audio_path, "-stream_loop", "-1", "-i", music_path]
+                end_args = []
             elif music_path and Path(music_path).exists():
                 # 3-way or 2-way mix without ducking (fallback)
                 if video_has_audio:
                     filter_complex = (
                         f"[0:a]volume={video_volume}[a1];"
-                        f"[1:a]volume={audio_volume},loudnorm=I=-16:TP=-1.5:LRA=11[a2];"
+                        f"[1:a]volume={audio_volume}[a2];"
                         f"[2:a]afade=t=in:st=0:d=1,afade=t=out:st=27:d=3,volume={music_volume}[a3];"
-                        "[a1][a2][a3]amix=inputs=3:duration=first:dropout_transition=2,alimiter=limit=0.95[out]"
+                        "[a1][a2][a3]amix=inputs=3:duration=first:dropout_transition=2"
                     )
                 else:
                     # 2-way mix without ducking (voiceover + music, no video audio)
                     filter_complex = (
-                        f"[1:a]volume={audio_volume},loudnorm=I=-16:TP=-1.5:LRA=11[a1];"
+                        f"[1:a]volume={audio_volume}[a1];"
                         f"[2:a]afade=t=in:st=0:d=1,afade=t=out:st=17:d=3,volume={music_volume}[a2];"
-                        "[a1][a2]amix=inputs=2:duration=first:dropout_transition=2,alimiter=limit=0.95[out]"
+                        "[a1][a2]amix=inputs=2:duration=first:dropout_transition=2"
                     )
 
-                cmd = [
-                    "ffmpeg",
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-i", music_path,
-                    "-filter_complex", filter_complex,
-                    "-map", "0:v",
-                    "-map", "[out]",
-                    "-c:v", "copy",
-                    "-c:a", "aac",
-                    "-b:a", "256k",
-                    "-ar", "48000",
-                    "-shortest",
-                    "-y",
-                    output_path
-                ]
+                # Music is looped, in case the track is shorter than the voiceover
+                # (ElevenLabs caps it); the voiceover/video decides where the mix ends
+                input_args = ["-i", video_path, "-i", audio_path, "-stream_loop", "-1", "-i", music_path]
+                end_args = ["-shortest"]
             elif enable_ducking and video_has_audio:
                 # 2-way mix with ducking (video audio ducked by voiceover)
                 # Use asplit to create two copies of voiceover for sidechain and mix
@@ -476,81 +500,55 @@ class VideoComposer:
                     "[vo_raw]asplit=2[vo1][vo2];"
                     f"[0:a]volume={video_volume}[video_raw];"
                     "[vo1][video_raw]sidechaincompress=threshold=0.04:ratio=3:attack=20:release=250:level_sc=1[video_ducked];"
-                    "[vo2][video_ducked]amix=inputs=2:duration=first:dropout_transition=2[mixed];"
-                    "[mixed]loudnorm=I=-16:TP=-1.5:LRA=11,alimiter=limit=0.95[out]"
+                    "[vo2][video_ducked]amix=inputs=2:duration=first:dropout_transition=2"
                 )
 
-                cmd = [
-                    "ffmpeg",
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-filter_complex", filter_complex,
-                    "-map", "0:v",
-                    "-map", "[out]",
-                    "-c:v", "copy",
-                    "-c:a", "aac",
-                    "-b:a", "256k",
-                    "-ar", "48000",
-                    "-shortest",
-                    "-y",
-                    output_path
-                ]
+                input_args = ["-i", video_path, "-i", audio_path]
+                end_args = ["-shortest"]
+            elif video_has_audio:
+                # Simple 2-way mix without ducking (fallback)
+                filter_complex = (
+                    f"[0:a]volume={video_volume}[a1];"
+                    f"[1:a]volume={audio_volume}[a2];"
+                    "[a1][a2]amix=inputs=2:duration=first:dropout_transition=2"
+                )
+
+                input_args = ["-i", video_path, "-i", audio_path]
+                end_args = ["-shortest"]
             else:
-                # Simple 2-way mix without ducking or voiceover-only (fallback)
-                if video_has_audio:
-                    filter_complex = (
-                        f"[0:a]volume={video_volume}[a1];"
-                        f"[1:a]volume={audio_volume},loudnorm=I=-16:TP=-1.5:LRA=11[a2];"
-                        "[a1][a2]amix=inputs=2:duration=first:dropout_transition=2,alimiter=limit=0.95[out]"
-                    )
+                # Voiceover-only (no video audio, no music)
+                filter_complex = f"[1:a]volume={audio_volume}"
 
-                    cmd = [
-                        "ffmpeg",
-                        "-i", video_path,
-                        "-i", audio_path,
-                        "-filter_complex", filter_complex,
-                        "-map", "0:v",
-                        "-map", "[out]",
-                        "-c:v", "copy",
-                        "-c:a", "aac",
-                        "-b:a", "256k",
-                        "-ar", "48000",
-                        "-shortest",
-                        "-y",
-                        output_path
-                    ]
-                else:
-                    # Voiceover-only (no video audio, no music)
-                    filter_complex = f"[1:a]volume={audio_volume},loudnorm=I=-16:TP=-1.5:LRA=11,alimiter=limit=0.95[out]"
-
-                    cmd = [
-                        "ffmpeg",
-                        "-i", video_path,
-                        "-i", audio_path,
-                        "-filter_complex", filter_complex,
-                        "-map", "0:v",
-                        "-map", "[out]",
-                        "-c:v", "copy",
-                        "-c:a", "aac",
-                        "-b:a", "256k",
-                        "-ar", "48000",
-                        "-shortest",
-                        "-y",
-                        output_path
-                    ]
+                input_args = ["-i", video_path, "-i", audio_path]
+                end_args = ["-shortest"]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            # Final polish for every mix: two-pass loudnorm measured on this
+            # exact mix and applied as one static (linear) gain - no dynamic
+            # loudnorm look-ahead and no compressor - then a safety limiter
+            loudnorm = await two_pass_loudnorm(input_args, filter_complex)
+            filter_complex += f",{loudnorm},alimiter=limit=0.95:attack=5:release=50[out]"
+
+            cmd = [
+                "ffmpeg",
+                *input_args,
+                "-filter_complex", filter_complex,
+                "-map", "0:v",      # Video from first input
+                "-map", "[out]",    # Audio from filter
+                "-c:v", "copy",     # Copy video without re-encoding
+                "-c:a", "aac",      # High-quality AAC audio
+                "-b:a", "256k",     # Higher bitrate for professional quality
+                "-ar", "48000",     # 48kHz sample rate (broadcast standard)
+                *end_args,
+                "-y",
+                output_path
+            ]
 
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
+            try:
+                await run_ff_async(cmd, timeout=300)
+            except FFmpegError as e:
                 return {
                     "success": False,
-                    "error": f"FFmpeg failed: {result.stderr}",
+                    "error": f"FFmpeg failed: {e.stderr}",
                     "message": "Audio mixing failed"
                 }
 
@@ -583,109 +581,259 @@ class VideoComposer:
             }
 
     @staticmethod
-    async def compose_final_video(
+    async def compose_single_pass(
         clip_paths: List[str],
         title_card_image_path: Optional[str],
         output_path: str,
         title_card_duration: float = 3.0,
         voiceover_audio_path: Optional[str] = None,
-        music_audio_path: Optional[str] = None
+        music_audio_path: Optional[str] = None,
+        audio_volume: float = 1.0,
+        video_volume: float = 0.3,
+        music_volume: float = 0.4,
+        size: Optional[Tuple[int, int]] = None
     ) -> dict:
         """
-        Compose the final video from clips and title card, optionally with voiceover and music.
+        Compose the final video with ONE ffmpeg run.
+
+        Clips of any size are scaled/cropped to fill the output frame, the
+        title card image is letterboxed in front of them, and the ducked
+        voiceover/music mix is rendered in the same filter graph, so each clip
+        is decoded once and the output encoded once (no intermediate files).
 
         Args:
-            clip_paths: List of video clip paths
+            clip_paths: List of video clip paths (any resolution)
             title_card_image_path: Optional path to title card image
             output_path: Path for final output video
             title_card_duration: Duration of title card in seconds
             voiceover_audio_path: Optional path to voiceover audio file
             music_audio_path: Optional path to background music file
+            audio_volume: Voiceover volume
+            video_volume: Volume of the clips' own audio (ducked under the voiceover)
+            music_volume: Background music volume (ducked under the voiceover)
+            size: Output (width, height), e.g. (1080, 1920) for 9:16
+                (default: settings.video_width x settings.video_height)
 
         Returns:
             Dict with success status and output path
         """
         try:
-            logger.info("Composing final video...")
-
-            all_clips = []
-
-            # If we have a title card, convert it to video first
-            if title_card_image_path and Path(title_card_image_path).exists():
-                logger.info("Converting title card to video...")
-                title_card_video = "/tmp/title_card_video.mp4"
-                title_result = await VideoComposer.image_to_video(
-                    image_path=title_card_image_path,
-                    output_path=title_card_video,
-                    duration=title_card_duration
+            *clips_exist, has_title, has_voiceover, music_exists = await VideoComposer._paths_exist(
+                *clip_paths, title_card_image_path, voiceover_audio_path, music_audio_path
+            )
+            for path, exists in zip(clip_paths, clips_exist):
+                if not exists:
+                    raise FileNotFoundError(f"Clip not found: {path}")
+            has_music = has_voiceover and music_exists
+
+            width, height = size or (settings.video_width, settings.video_height)
+            fill = (
+                f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+                f"crop={width}:{height},setsar=1,fps=30,format=yuv420p"
+            )
+            letterbox = (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps=30,format=yuv420p"
+            )
+
+            # Clip audio is only mixed in if every clip has some
+            clips_have_audio = all(await asyncio.gather(
+                *(asyncio.to_thread(VideoComposer._check_has_audio, path) for path in clip_paths)
+            ))
+
+            inputs: List[str] = []
+            video_parts: List[str] = []
+            audio_parts: List[str] = []
+            video_labels: List[str] = []
+            audio_labels: List[str] = []
+
+            if has_title:
+                # Decoded and letterboxed once, then the frame is repeated
+                title_frames = max(1, round(title_card_duration * 30))
+                inputs += ["-i", title_card_image_path]
+                video_parts.append(
+                    f"[0:v]{letterbox},loop=loop={title_frames - 1}:size=1:start=0,setpts=N/30/TB[v0]"
                 )
+                video_labels.append("[v0]")
+                if clips_have_audio:
+                    audio_parts.append(
+                        f"anullsrc=r=48000:cl=stereo,atrim=duration={title_card_duration:g}[a0]"
+                    )
+                    audio_labels.append("[a0]")
+
+            for path in clip_paths:
+                index = len(video_labels)
+                inputs += ["-i", path]
+                video_parts.append(f"[{index}:v]{fill}[v{index}]")
+                video_labels.append(f"[v{index}]")
+                if clips_have_audio:
+                    audio_parts.append(f"[{index}:a]aresample=48000,aformat=channel_layouts=stereo[a{index}]")
+                    audio_labels.append(f"[a{index}]")
+
+            n = len(video_labels)
+            video_parts.append(f"{''.join(video_labels)}concat=n={n}:v=1:a=0[vout]")
+            maps = ["-map", "[vout]"]
+
+            # Audio graph, ending in an unlabeled mix (loudnorm is appended after measuring)
+            mix_graph = None
+            if has_voiceover:
+                vo_index = n
+                inputs += ["-i", voiceover_audio_path]
+                mix_inputs = 1 + int(has_music) + int(clips_have_audio)
+                mix_graph_parts = [
+                    f"[{vo_index}:a]volume={audio_volume},asplit={mix_inputs}"
+                    + "".join(f"[vo{i}]" for i in range(mix_inputs))
+                ]
+                mix_labels = ["[vo0]"]
+                sidechain = 1
+
+                if has_music:
+                    # The mix lasts as long as the voiceover; fade the music out with it
+                    voiceover_duration = await asyncio.to_thread(probe_duration, voiceover_audio_path)
+                    fade_out = f",afade=t=out:st={max(0.0, voiceover_duration - 3):g}:d=3" if voiceover_duration else ""
+                    # Looped: the track may be shorter than the voiceover (ElevenLabs caps it)
+                    inputs += ["-stream_loop", "-1", "-i", music_audio_path]
+                    mix_graph_parts += [
+                        f"[{vo_index + 1}:a]afade=t=in:st=0:d=1{fade_out},volume={music_volume}[music_raw]",
+                        f"[vo{sidechain}][music_raw]sidechaincompress=threshold=0.03:ratio=4:attack=20:release=250:level_sc=1[music_ducked]",
+                    ]
+                    mix_labels.append("[music_ducked]")
+                    sidechain += 1
+
+                if clips_have_audio:
+                    mix_graph_parts += audio_parts
+                    mix_graph_parts += [
+                        f"{''.join(audio_labels)}concat=n={len(audio_labels)}:v=0:a=1,volume={video_volume}[video_raw]",
+                        f"[vo{sidechain}][video_raw]sidechaincompress=threshold=0.04:ratio=3:attack=20:release=250:level_sc=1[video_ducked]",
+                    ]
+                    mix_labels.append("[video_ducked]")
 
-                if title_result.get("success"):
-                    all_clips.append(title_card_video)
+                mix_graph = ";".join(mix_graph_parts)
+                if len(mix_labels) > 1:
+                    mix_graph += f";{''.join(mix_labels)}amix=inputs={len(mix_labels)}:duration=first:dropout_transition=2:normalize=0"
                 else:
-                    logger.warning("Title card conversion failed, skipping...")
-
-            # Add all video clips
-            all_clips.extend(clip_paths)
+                    mix_graph += ";[vo0]anull"
+
+            filter_parts = list(video_parts)
+            if mix_graph:
+                loudnorm = await two_pass_loudnorm(inputs, mix_graph)
+                filter_parts.append(f"{mix_graph},{loudnorm},alimiter=limit=0.95:attack=5:release=50[aout]")
+                maps += ["-map", "[aout]"]
+            elif clips_have_audio:
+                filter_parts += audio_parts
+                filter_parts.append(f"{''.join(audio_labels)}concat=n={len(audio_labels)}:v=0:a=1[aout]")
+                maps += ["-map", "[aout]"]
 
-            if len(all_clips) == 0:
-                raise ValueError("No clips available for composition")
+            cmd = [
+                "ffmpeg", *inputs,
+                "-filter_complex", ";".join(filter_parts),
+                *maps,
+                *h264_encoder_args(),
+                "-pix_fmt", "yuv420p",
+                "-c:a", "aac",
+                "-b:a", "256k",
+                "-ar", "48000",
+                "-y",
+                output_path
+            ]
 
-            # Determine output path (temp if we need to add audio)
-            video_only_path = output_path if not voiceover_audio_path else "/tmp/video_no_audio.mp4"
-
-            # If only one clip, just copy it
-            if len(all_clips) == 1:
-                logger.info("Only one clip, copying directly...")
-                import shutil
-                shutil.copy(all_clips[0], video_only_path)
-                merge_result = {
-                    "success": True,
-                    "output_path": video_only_path,
-                    "num_clips": 1
+            # Expected length, so progress callbacks get a percentage
+            clip_durations = await asyncio.gather(
+                *(asyncio.to_thread(probe_duration, path) for path in clip_paths)
+            )
+            duration = None
+            if all(clip_durations):
+                duration = sum(clip_durations) + (title_card_duration if has_title else 0)
+
+            logger.info(f"Composing {len(clip_paths)} clips in a single ffmpeg pass...")
+            try:
+                await run_ff_async(cmd, timeout=600, duration=duration)
+            except FFmpegError as e:
+                return {
+                    "success": False,
+                    "error": f"FFmpeg failed: {e.stderr}",
+                    "message": "Single-pass composition failed"
                 }
-            else:
-                # Merge all clips
-                logger.info(f"Merging {len(all_clips)} total segments...")
-                merge_result = await VideoComposer.merge_clips(
-                    clip_paths=all_clips,
-                    output_path=video_only_path,
-                    include_transitions=False  # Simple concat for now
-                )
-
-            if not merge_result.get("success"):
-                return merge_result
-
-            # If we have voiceover audio, mix it with the video (and optional music)
-            if voiceover_audio_path and Path(voiceover_audio_path).exists():
-                logger.info("Adding professional audio mix with ducking...")
-                audio_result = await VideoComposer.add_audio_to_video(
-                    video_path=video_only_path,
-                    audio_path=voiceover_audio_path,
-                    output_path=output_path,
-                    audio_volume=1.0,    # Full voiceover volume
-                    video_volume=0.3,    # Video audio at 30%
-                    music_path=music_audio_path,
-                    music_volume=0.4,    # Music at 40% for better audibility
-                    enable_ducking=True  # Enable professional audio ducking
-                )
-
-                if audio_result.get("success"):
-                    logger.info(f"Final video with voiceover composed successfully: {output_path}")
-                    return audio_result
-                else:
-                    logger.warning("Voiceover mixing failed, using video without voiceover")
-                    # Copy video-only version to final output
-                    import shutil
-                    shutil.copy(video_only_path, output_path)
 
             logger.info(f"Final video composed successfully: {output_path}")
             return {
                 "success": True,
                 "output_path": output_path,
-                "num_clips": len(all_clips)
+                "num_clips": len(clip_paths)
+            }
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Input file not found"
+            }
+        except subprocess.TimeoutExpired:
+            logger.error("FFmpeg timeout - composition took too long")
+            return {
+                "success": False,
+                "error": "Operation timeout",
+                "message": "Composition timed out"
+            }
+        except Exception as e:
+            logger.error(f"Error composing final video: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Final composition failed: {str(e)}"
             }
 
+    @staticmethod
+    async def compose_final_video(
+        clip_paths: List[str],
+        title_card_image_path: Optional[str],
+        output_path: str,
+        title_card_duration: float = 3.0,
+        voiceover_audio_path: Optional[str] = None,
+        music_audio_path: Optional[str] = None,
+        pending_audio: Optional[Awaitable[Tuple[Optional[str], Optional[str]]]] = None
+    ) -> dict:
+        """
+        Compose the final video from clips and title card, optionally with voiceover and music.
+
+        Args:
+            clip_paths: List of video clip paths
+            title_card_image_path: Optional path to title card image
+            output_path: Path for final output video
+            title_card_duration: Duration of title card in seconds
+            voiceover_audio_path: Optional path to voiceover audio file
+            music_audio_path: Optional path to background music file
+            pending_audio: Optional awaitable resolving to (voiceover path, music path),
+                used instead of the two path arguments
+
+        Returns:
+            Dict with success status and output path
+        """
+        try:
+            if not clip_paths:
+                raise ValueError("No clips available for composition")
+
+            if pending_audio is not None:
+                logger.info("Waiting for audio...")
+                voiceover_audio_path, music_audio_path = await pending_audio
+
+            # Everything goes through compose_single_pass's filter graph at the
+            # clips' own size: the title card is encoded with the clips' frame
+            # size, rate and format (plus a silent track when they have audio),
+            # which stream-copy concatenating a separately encoded card can't
+            # guarantee
+            size = await asyncio.to_thread(VideoComposer._probe_size, clip_paths[0])
+            return await VideoComposer.compose_single_pass(
+                clip_paths=clip_paths,
+                title_card_image_path=title_card_image_path,
+                output_path=output_path,
+                title_card_duration=title_card_duration,
+                voiceover_audio_path=voiceover_audio_path,
+                music_audio_path=music_audio_path,
+                size=size
+            )
+
         except Exception as e:
             logger.error(f"Error composing final video: {e}", exc_info=True)
             return {
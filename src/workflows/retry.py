@@ -0,0 +1,190 @@
+"""
+Retry driver for the video generation workflow.
+Re-runs generate_and_publish until it succeeds, backing off between attempts
+(longer when a provider rate limits us) and giving up after a bounded number
+of attempts or amount of wall-clock time - or straight away when repeated
+non-rate-limit errors suggest a permanent problem (bad key, missing folder, bug).
+"""
+
+import re
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .video_generator import video_generator
+from ..utils.rate_limit import ExponentialBackoff, rate_limit_info
+
+logger = logging.getLogger(__name__)
+
+# Give up after this many attempts or this much wall-clock time
+MAX_ATTEMPTS = 20
+DEADLINE_SECONDS = 24 * 3600
+
+# Consecutive non-rate-limit failures, without progress, that open the circuit
+CIRCUIT_BREAKER_THRESHOLD = 3
+
+# Result fields that show how far an attempt got through the workflow
+PROGRESS_FIELDS = ("clip_paths", "title_card_path", "voiceover_path", "music_path")
+
+# Fallback for failures that only surface as text (no structured rate_limit)
+RATE_LIMIT_RE = re.compile(r"429|resource_exhausted|quota|rate.?limit|too many requests", re.IGNORECASE)
+
+
+def _fmt(ts: Optional[float] = None) -> str:
+    """Format an epoch timestamp (default: now) as local time, without building a datetime."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def _progress(result: Dict[str, Any]) -> int:
+    """Count how many workflow stages an attempt produced output for."""
+    return sum(1 for field in PROGRESS_FIELDS if result.get(field))
+
+
+def get_rate_limit(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the rate-limit details of a failed attempt.
+
+    Args:
+        result: Result dict of the failed attempt
+
+    Returns:
+        The structured rate_limit dict if the workflow surfaced one, a bare
+        dict if only the error messages mention a rate limit, or None
+    """
+    if result.get("rate_limit"):
+        return result["rate_limit"]
+
+    if result.get("status_code") == 429:
+        return {"status_code": 429, "retry_after": None, "remaining": None}
+
+    # Only the error fields are scanned, never the whole result dict
+    messages = [result.get("error") or "", *(result.get("errors") or [])]
+    if any(RATE_LIMIT_RE.search(str(message)) for message in messages):
+        return {"status_code": 429, "retry_after": None, "remaining": None}
+    return None
+
+
+async def attempt_video_generation(
+    topic: Optional[str],
+    category: Optional[str],
+    cache_dir: Optional[str] = None
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Run the workflow once.
+
+    Args:
+        topic: Specific topic (None researches one)
+        category: Category focus, e.g. "AI"
+        cache_dir: Artifact cache directory, so a retry only redoes what failed
+
+    Returns:
+        Tuple of (success, result dict)
+    """
+    try:
+        logger.info(f"Attempting video generation for topic: {topic}")
+        result = await video_generator.generate_and_publish(
+            topic=topic,
+            category=category,
+            publish_immediately=True,
+            cache_dir=cache_dir
+        )
+        return result.get("success", False), result
+
+    except Exception as e:
+        logger.error(f"Video generation attempt failed: {e}", exc_info=True)
+        return False, {"success": False, "error": str(e), "rate_limit": rate_limit_info(e)}
+
+
+async def retry_until_success(
+    topic: Optional[str],
+    category: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    max_attempts: int = MAX_ATTEMPTS,
+    deadline_seconds: float = DEADLINE_SECONDS,
+    backoff: Optional[ExponentialBackoff] = None,
+    circuit_breaker_threshold: int = CIRCUIT_BREAKER_THRESHOLD
+) -> Dict[str, Any]:
+    """
+    Keep trying to generate a video with jittered exponential backoff.
+
+    Args:
+        topic: Specific topic (None researches one on every attempt)
+        category: Category focus, e.g. "AI"
+        cache_dir: Root of the artifact cache shared by the attempts. The
+            call works in its own directory under it and removes that
+            directory when it returns, so a later run makes a fresh video
+        max_attempts: Attempts before giving up
+        deadline_seconds: Wall-clock budget before giving up
+        backoff: Delay policy (default: up to 30s, doubling to 1 hour)
+        circuit_breaker_threshold: Consecutive non-rate-limit failures that
+            stop retrying (an attempt that gets further than any before it
+            resets the count)
+
+    Returns:
+        The successful result, or the last failed one once the attempts or
+        the deadline are exhausted
+
+    Raises:
+        RuntimeError: If the circuit breaker opens
+    """
+    backoff = backoff or ExponentialBackoff(base=30, cap=3600)
+    deadline = time.monotonic() + deadline_seconds
+    attempt = 0
+    consecutive_errors = 0
+    best_progress = 0
+
+    run_cache_dir = None
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        run_cache_dir = tempfile.mkdtemp(prefix="run_", dir=cache_dir)
+
+    try:
+        while True:
+            attempt += 1
+            logger.info(f"ATTEMPT #{attempt} - {_fmt()}")
+
+            success, result = await attempt_video_generation(topic, category, run_cache_dir)
+            if success:
+                logger.info(f"Video generation successful on attempt #{attempt}: {result.get('google_drive_url')}")
+                return result
+
+            rate_limit = get_rate_limit(result)
+            retry_interval = backoff.next_delay(attempt, rate_limit)
+
+            if attempt >= max_attempts or time.monotonic() + retry_interval > deadline:
+                logger.error(
+                    f"Giving up after {attempt} attempts. "
+                    f"Last error: {result.get('error') or result.get('errors')}"
+                )
+                return result
+
+            progress = _progress(result)
+            if progress > best_progress:
+                best_progress = progress
+                consecutive_errors = 0
+
+            if rate_limit:
+                consecutive_errors = 0
+                logger.warning(f"Attempt #{attempt} failed due to rate limit: {rate_limit}")
+            else:
+                consecutive_errors += 1
+                logger.error(
+                    f"Attempt #{attempt} failed with non-rate-limit error: "
+                    f"{result.get('error') or result.get('errors')}"
+                )
+                if consecutive_errors >= circuit_breaker_threshold:
+                    raise RuntimeError(
+                        f"Circuit open: {consecutive_errors} consecutive non-rate-limit failures "
+                        f"without progress, likely not transient. "
+                        f"Last error: {result.get('error') or result.get('errors')}"
+                    )
+
+            logger.info(f"Retrying in {retry_interval:.0f}s (at {_fmt(time.time() + retry_interval)})")
+            await asyncio.sleep(retry_interval)
+    finally:
+        if run_cache_dir:
+            shutil.rmtree(run_cache_dir, ignore_errors=True)
@@ -4,6 +4,7 @@ Coordinates the entire process from topic research to video generation and socia
 """
 
 from typing import Optional, Dict, Any, List
+import asyncio
 import logging
 from datetime import datetime
 from ..services.claude_client import claude_service
@@ -13,6 +14,10 @@ from ..services.google_drive_uploader import google_drive_uploader
 from ..services.elevenlabs_client import elevenlabs_service
 from ..services.hubspot_client import hubspot_service
 from ..utils.video_composer import video_composer
+from ..utils.ffmpeg_runner import FFmpegError, probe_duration
+from ..utils.title_card import render_title_card
+from ..utils.rate_limit import rate_limit_info
+from ..utils.artifact_cache import ArtifactCache
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -38,7 +43,8 @@ class VideoGenerator:
         self,
         topic: Optional[str] = None,
         category: Optional[str] = None,
-        publish_immediately: bool = True
+        publish_immediately: bool = True,
+        cache_dir: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Complete workflow: research → generate → compose → publish.
@@ -47,6 +53,9 @@ class VideoGenerator:
             topic: Optional specific topic (if None, will research trending topics)
             category: Optional category focus (e.g., "AI", "automation")
             publish_immediately: Whether to publish to social media right away
+            cache_dir: Optional directory for reusing generated artifacts
+                (prompts, clips, title card, voiceover, music) across the
+                retry attempts of one run (see retry_until_success)
 
         Returns:
             Dict with success status, video paths, URLs, and metadata
@@ -87,15 +96,74 @@ class VideoGenerator:
             logger.info(f"Service Focus: {service_focus}")
             logger.info(f"Storytelling Approach: {storytelling_approach}")
 
-            # Step 2: Generate Cinematic Video Prompts
-            logger.info("Generating cinematic video prompts...")
-            video_prompts = await claude_service.generate_video_prompts(
-                topic=selected_topic,
-                service_focus=service_focus,
-                storytelling_approach=storytelling_approach,
-                emotional_beats=emotional_beats if isinstance(emotional_beats, list) else [emotional_beats],
-                cta=cta
-            )
+            artifacts = ArtifactCache(cache_dir, selected_topic, category)
+
+            # Step 2: Generate Cinematic Video Prompts. They are streamed, so
+            # each Veo clip (Step 3) starts as soon as Claude has written its prompt
+            timestamp = int(datetime.utcnow().timestamp())
+            output_dir = "/tmp"
+
+            clip_keys = ["clip_1_prompt", "clip_2_prompt", "clip_3_prompt"]
+            clip_names = [f"clip_{i}.mp4" for i in range(1, len(clip_keys) + 1)]
+            cached_clips = [artifacts.get(name) for name in clip_names]
+            title_card_path = artifacts.get("title_card.png")
+            video_prompts = artifacts.get_json("video_prompts.json")
+
+            clip_jobs: Dict[str, asyncio.Task] = {}
+
+            async def generate_clip(index: int, prompt: str) -> Dict[str, Any]:
+                """Generate one clip with Veo and cache it on its own, so a retry only redoes the clips that failed."""
+                result = await veo3_service.generate_video_clip(
+                    prompt=prompt,
+                    duration=settings.clip_duration,
+                    output_path=f"{output_dir}/{clip_names[index]}"
+                )
+                if result.get("success"):
+                    result["output_path"] = await artifacts.put(result["output_path"], clip_names[index])
+                return result
+
+            async def reuse_clip(path: str) -> Dict[str, Any]:
+                """Result of a clip an earlier attempt already generated."""
+                return {"success": True, "output_path": path}
+
+            def start_clip(key: str, prompt: str) -> None:
+                """Start the Veo job for one clip (once, and only if it isn't cached)."""
+                index = clip_keys.index(key)
+                if cached_clips[index] or key in clip_jobs:
+                    return
+                logger.info(f"{key} ready, starting its Veo clip")
+                clip_jobs[key] = asyncio.create_task(generate_clip(index, prompt))
+
+            # The title card prompt (Imagen cards only) needs just the topic and
+            # CTA, so Claude writes it alongside the video prompts
+            title_card_prompt_task = None
+            if not title_card_path and settings.use_generative_title_card:
+                title_card_prompt_task = asyncio.create_task(
+                    claude_service.generate_title_card_prompt(topic=selected_topic, cta=cta)
+                )
+
+            try:
+                if video_prompts is None:
+                    logger.info("Generating cinematic video prompts...")
+                    video_prompts = {}
+                    async for key, value in claude_service.generate_video_prompts_streaming(
+                        topic=selected_topic,
+                        service_focus=service_focus,
+                        storytelling_approach=storytelling_approach,
+                        emotional_beats=emotional_beats if isinstance(emotional_beats, list) else [emotional_beats],
+                        cta=cta
+                    ):
+                        video_prompts[key] = value
+                        if key in clip_keys:
+                            start_clip(key, value)
+                    artifacts.put_json("video_prompts.json", video_prompts)
+
+                title_card_prompt = await title_card_prompt_task if title_card_prompt_task else None
+            except Exception:
+                for task in [*clip_jobs.values(), title_card_prompt_task]:
+                    if task:
+                        task.cancel()
+                raise
 
             clip_1_prompt = video_prompts.get("clip_1_prompt")
             clip_2_prompt = video_prompts.get("clip_2_prompt")
@@ -108,16 +176,17 @@ class VideoGenerator:
             logger.info(f"Clip 2 prompt length: {len(clip_2_prompt)} chars")
             logger.info(f"Clip 3 prompt length: {len(clip_3_prompt)} chars")
 
-            # Step 3: Generate 3 Video Clips in Parallel
+            # Step 3: Generate 3 Video Clips in Parallel (most are already
+            # running by now; any not started while streaming start here).
+            # Clips cached by an earlier attempt are reused one by one
             logger.info("Generating 3 video clips in parallel with Veo 3...")
-            timestamp = int(datetime.utcnow().timestamp())
-            output_dir = "/tmp"
-
             clip_prompts = [clip_1_prompt, clip_2_prompt, clip_3_prompt]
-            clips_result = await veo3_service.generate_multi_clip_video(
-                clip_prompts=clip_prompts,
-                output_dir=output_dir
-            )
+            for key, prompt in zip(clip_keys, clip_prompts):
+                start_clip(key, prompt)
+            clips_result = await veo3_service.gather_clips([
+                clip_jobs[key] if key in clip_jobs else reuse_clip(cached)
+                for key, cached in zip(clip_keys, cached_clips)
+            ])
 
             if not clips_result.get("success"):
                 error_msg = clips_result.get("error", "Unknown error generating clips")
@@ -126,24 +195,35 @@ class VideoGenerator:
                 return {
                     "success": False,
                     "errors": errors,
+                    "rate_limit": clips_result.get("rate_limit"),
                     "message": "Video generation failed"
                 }
 
             clip_paths = clips_result.get("clip_paths", [])
             logger.info(f"Successfully generated {len(clip_paths)} video clips")
 
-            # Step 4: Generate Title Card with Imagen 4
-            logger.info("Generating title card image...")
-            title_card_prompt = await claude_service.generate_title_card_prompt(
-                topic=selected_topic,
-                cta=cta
-            )
-
-            title_card_path = f"{output_dir}/title_card_{timestamp}.png"
-            title_card_result = await google_image_service.generate_image(
-                prompt=title_card_prompt,
-                output_path=title_card_path
-            )
+            # Step 4: Title Card - rendered locally with FFmpeg (near-instant, no
+            # API credits), or with Imagen 4 when USE_GENERATIVE_TITLE_CARD is set
+            if title_card_path:
+                title_card_result = {"success": True, "output_path": title_card_path}
+            else:
+                logger.info("Generating title card image...")
+                title_card_path = f"{output_dir}/title_card_{timestamp}.png"
+                if settings.use_generative_title_card:
+                    title_card_result = await google_image_service.generate_image(
+                        prompt=title_card_prompt,
+                        output_path=title_card_path
+                    )
+                else:
+                    try:
+                        await asyncio.to_thread(render_title_card, selected_topic, service_focus, title_card_path)
+                        title_card_result = {"success": True, "output_path": title_card_path}
+                    except FFmpegError as e:
+                        title_card_result = {"success": False, "error": f"FFmpeg failed: {e.stderr}"}
+                if title_card_result.get("success"):
+                    title_card_result["output_path"] = await artifacts.put(
+                        title_card_result["output_path"], "title_card.png"
+                    )
 
             if not title_card_result.get("success"):
                 error_msg = title_card_result.get("error", "Unknown error generating title card")
@@ -162,24 +242,35 @@ class VideoGenerator:
                 f"Clip 3: {clip_3_prompt[:100]}..."
             ]
 
-            voiceover_script = await elevenlabs_service.generate_voiceover_script(
-                topic=selected_topic,
-                clip_descriptions=clip_descriptions,
-                duration=settings.video_duration,
-                cta=cta
-            )
+            voiceover_script = artifacts.get_json("voiceover_script.json")
+            if voiceover_script is None:
+                voiceover_script = await elevenlabs_service.generate_voiceover_script(
+                    topic=selected_topic,
+                    clip_descriptions=clip_descriptions,
+                    duration=settings.video_duration,
+                    cta=cta
+                )
+                artifacts.put_json("voiceover_script.json", voiceover_script)
 
             logger.info(f"Voiceover script generated: {len(voiceover_script)} chars")
             logger.info(f"Script: {voiceover_script[:200]}...")
 
             # Generate voiceover audio
-            logger.info("Generating voiceover audio with ElevenLabs...")
-            voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
+            voiceover_path = artifacts.get("voiceover.mp3")
+            if voiceover_path:
+                voiceover_result = {"success": True, "audio_path": voiceover_path}
+            else:
+                logger.info("Generating voiceover audio with ElevenLabs...")
+                voiceover_path = f"{output_dir}/voiceover_{timestamp}.mp3"
 
-            voiceover_result = await elevenlabs_service.generate_voiceover(
-                script=voiceover_script,
-                output_path=voiceover_path
-            )
+                voiceover_result = await elevenlabs_service.generate_voiceover(
+                    script=voiceover_script,
+                    output_path=voiceover_path
+                )
+                if voiceover_result.get("success"):
+                    voiceover_result["audio_path"] = await artifacts.put(
+                        voiceover_result["audio_path"], "voiceover.mp3"
+                    )
 
             if not voiceover_result.get("success"):
                 error_msg = voiceover_result.get("error", "Unknown error generating voiceover")
@@ -191,30 +282,44 @@ class VideoGenerator:
                 logger.info(f"Voiceover audio generated: {voiceover_path}")
 
             # Step 6: Generate Background Music
-            logger.info("Generating background music with ElevenLabs...")
-
-            # Determine mood based on emotional beats
-            if isinstance(emotional_beats, list) and len(emotional_beats) > 0:
-                primary_mood = emotional_beats[0] if emotional_beats[0] in ["uplifting", "dramatic", "inspirational", "exciting"] else "uplifting"
+            music_path = artifacts.get("music.mp3")
+            if music_path:
+                music_result = {"success": True, "audio_path": music_path}
             else:
-                primary_mood = "uplifting"
+                logger.info("Generating background music with ElevenLabs...")
 
-            # Generate music prompt
-            music_prompt_text = await elevenlabs_service.generate_music_prompt(
-                topic=selected_topic,
-                mood=primary_mood,
-                style="corporate tech"  # Default style, can be customized
-            )
+                # Determine mood based on emotional beats
+                if isinstance(emotional_beats, list) and len(emotional_beats) > 0:
+                    primary_mood = emotional_beats[0] if emotional_beats[0] in ["uplifting", "dramatic", "inspirational", "exciting"] else "uplifting"
+                else:
+                    primary_mood = "uplifting"
 
-            logger.info(f"Music prompt: {music_prompt_text}")
+                # Generate music prompt
+                music_prompt_text = await elevenlabs_service.generate_music_prompt(
+                    topic=selected_topic,
+                    mood=primary_mood,
+                    style="corporate tech"  # Default style, can be customized
+                )
 
-            # Generate background music
-            music_path = f"{output_dir}/music_{timestamp}.mp3"
-            music_result = await elevenlabs_service.generate_background_music(
-                prompt=music_prompt_text,
-                duration=settings.video_duration,
-                output_path=music_path
-            )
+                logger.info(f"Music prompt: {music_prompt_text}")
+
+                # Generate background music long enough to cover the voiceover
+                # (plus a short tail). ElevenLabs caps the length; a shorter
+                # track is looped in the mix
+                music_duration = float(settings.video_duration)
+                if voiceover_path:
+                    voiceover_duration = await asyncio.to_thread(probe_duration, voiceover_path)
+                    if voiceover_duration:
+                        music_duration = voiceover_duration + 2
+
+                music_path = f"{output_dir}/music_{timestamp}.mp3"
+                music_result = await elevenlabs_service.generate_background_music(
+                    prompt=music_prompt_text,
+                    duration=music_duration,
+                    output_path=music_path
+                )
+                if music_result.get("success"):
+                    music_result["audio_path"] = await artifacts.put(music_result["audio_path"], "music.mp3")
 
             if not music_result.get("success"):
                 error_msg = music_result.get("error", "Unknown error generating music")
@@ -224,6 +329,11 @@ class VideoGenerator:
             else:
                 music_path = music_result.get("audio_path")
                 logger.info(f"Background music generated: {music_path}")
+                if music_result.get("duration", 0) < music_result.get("requested_duration", 0):
+                    logger.info(
+                        f"Music track is {music_result['duration']:g}s of the "
+                        f"{music_result['requested_duration']:.1f}s needed; it will be looped"
+                    )
 
             # Step 7: Compose Final Video (clips + title card + voiceover + music)
             logger.info("Composing final video with voiceover and music...")
@@ -253,12 +363,20 @@ class VideoGenerator:
                         return {
                             "success": False,
                             "errors": errors,
+                            "clip_paths": clip_paths,
+                            "title_card_path": title_card_path,
+                            "voiceover_path": voiceover_path,
+                            "music_path": music_path,
                             "message": "Video composition failed"
                         }
                 else:
                     return {
                         "success": False,
                         "errors": errors,
+                        "clip_paths": clip_paths,
+                        "title_card_path": title_card_path,
+                        "voiceover_path": voiceover_path,
+                        "music_path": music_path,
                         "message": "Video composition failed and no fallback available"
                     }
 
@@ -368,6 +486,7 @@ Follow us for more AI-powered business solutions for Hawaii!
             return {
                 "success": False,
                 "errors": errors,
+                "rate_limit": rate_limit_info(e),
                 "message": f"Workflow failed: {str(e)}"
             }
 
@@ -1,5 +1,4 @@
 """Upload the final complete video to Google Drive."""
-import asyncio
 from datetime import datetime
 
 async def main():
@@ -56,4 +55,5 @@ Generated: {timestamp}
         print(f"❌ Upload failed: {upload_result.get('error', 'Unknown error')}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    from src.utils import event_loop
+    event_loop.run(main())